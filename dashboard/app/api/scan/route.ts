@@ -11,7 +11,7 @@ import { enrichScan } from "@/lib/enrichment";
 export async function POST(request: Request) {
   try {
     const body = await request.json();
-    const { url, cookies, quick_scan, skip_modules } = body;
+    const { url, cookies, quick_scan, skip_modules, max_rps, max_in_flight, adaptive } = body;
 
     if (!url || typeof url !== "string") {
       return NextResponse.json({ error: "URL is required" }, { status: 400 });
@@ -50,7 +50,12 @@ export async function POST(request: Request) {
       cookies,
       quick_scan === true,
       typeof skip_modules === "string" ? skip_modules : undefined,
-      id
+      id,
+      {
+        maxRps: typeof max_rps === "number" && max_rps > 0 ? max_rps : undefined,
+        maxInFlight: typeof max_in_flight === "number" && max_in_flight > 0 ? Math.floor(max_in_flight) : undefined,
+        adaptive: adaptive !== false,
+      }
     );
 
     return NextResponse.json({ id: record.id, status: "running" });
@@ -17,6 +17,10 @@ export function ScanForm() {
   const [error, setError] = useState("");
   const [authOpen, setAuthOpen] = useState(false);
   const [quickScan, setQuickScan] = useState(false);
+  const [rateOpen, setRateOpen] = useState(false);
+  const [maxRps, setMaxRps] = useState("");
+  const [maxInFlight, setMaxInFlight] = useState("");
+  const [adaptive, setAdaptive] = useState(true);
   const router = useRouter();
   const { t } = useI18n();
 
@@ -43,7 +47,14 @@ export function ScanForm() {
       const res = await fetch("/api/scan", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ url: targetUrl, cookies: cookies.trim() || undefined, quick_scan: quickScan }),
+        body: JSON.stringify({
+          url: targetUrl,
+          cookies: cookies.trim() || undefined,
+          quick_scan: quickScan,
+          max_rps: Number(maxRps) || undefined,
+          max_in_flight: Number(maxInFlight) || undefined,
+          adaptive,
+        }),
       });
       const data = await res.json();
       if (!res.ok) {
@@ -124,6 +135,49 @@ export function ScanForm() {
         </CollapsibleContent>
       </Collapsible>
 
+      <Collapsible open={rateOpen} onOpenChange={setRateOpen}>
+        <CollapsibleTrigger asChild>
+          <Button variant="ghost" size="sm" type="button" className="text-muted-foreground w-fit">
+            <ChevronDown className={`h-4 w-4 mr-1.5 transition-transform ${rateOpen ? "rotate-180" : ""}`} />
+            {t("scan.rateLimit")}
+          </Button>
+        </CollapsibleTrigger>
+        <CollapsibleContent className="mt-2 flex flex-col gap-2">
+          <div className="flex gap-2">
+            <Input
+              type="number"
+              min={0}
+              placeholder={t("scan.maxRpsPlaceholder")}
+              value={maxRps}
+              onChange={(e) => setMaxRps(e.target.value)}
+              className="font-mono text-sm"
+              disabled={loading}
+            />
+            <Input
+              type="number"
+              min={1}
+              placeholder={t("scan.maxInFlightPlaceholder")}
+              value={maxInFlight}
+              onChange={(e) => setMaxInFlight(e.target.value)}
+              className="font-mono text-sm"
+              disabled={loading}
+            />
+          </div>
+          <label className="flex items-center gap-2 text-xs text-muted-foreground">
+            <input
+              type="checkbox"
+              checked={adaptive}
+              onChange={(e) => setAdaptive(e.target.checked)}
+              disabled={loading}
+            />
+            {t("scan.adaptiveRate")}
+          </label>
+          <p className="text-xs text-muted-foreground">
+            {t("scan.rateLimitDesc")}
+          </p>
+        </CollapsibleContent>
+      </Collapsible>
+
       {error && <p className="text-sm text-red-400">{error}</p>}
     </form>
   );
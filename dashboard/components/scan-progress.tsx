@@ -90,6 +90,7 @@ export function ScanProgress({ scanId, onComplete }: ScanProgressProps) {
           {progress && !done && !error && (
             <p className="text-xs text-muted-foreground">
               {t("scanProgress.step", { step: progress.step, total: progress.total })} &mdash; {progress.phase}
+              {progress.findings ? <> &middot; {t("scanProgress.findings", { count: progress.findings })}</> : null}
             </p>
           )}
           {isRunning && (
@@ -215,7 +215,7 @@ export async function completeScan(id: string, report: ScanReport, riskScore: nu
       low_count = $7,
       info_count = $8,
       risk_score = $9
-    WHERE id = $10`,
+    WHERE id = $10 AND status = 'running'`,
     [
       now,
       JSON.stringify(report),
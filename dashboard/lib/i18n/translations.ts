@@ -29,6 +29,11 @@ export const translations = {
     "scan.auth": "Authentication (Optional)",
     "scan.authDesc": "Cookie header value to send with all requests",
     "scan.cookiePlaceholder": "session=abc123; token=xyz789",
+    "scan.rateLimit": "Request Rate (Optional)",
+    "scan.maxRpsPlaceholder": "Max requests/sec per host",
+    "scan.maxInFlightPlaceholder": "Max concurrent per host (32)",
+    "scan.adaptiveRate": "Back off automatically on 429/503 and slow responses",
+    "scan.rateLimitDesc": "Lower these for fragile production systems",
 
     // Scan report page
     "scan.title": "Security Report",
@@ -43,6 +48,7 @@ export const translations = {
     "scanProgress.failed": "Scan failed",
     "scanProgress.starting": "Starting scan...",
     "scanProgress.step": "Step {step} of {total}",
+    "scanProgress.findings": "{count} findings so far",
     "scanProgress.cancel": "Cancel",
     "scanProgress.cancelling": "Cancelling...",
     "scanProgress.cancelled": "Scan cancelled",
@@ -324,6 +330,11 @@ export const translations = {
     "scan.auth": "Autenticación (Opcional)",
     "scan.authDesc": "Valor del header Cookie para enviar con todas las solicitudes",
     "scan.cookiePlaceholder": "session=abc123; token=xyz789",
+    "scan.rateLimit": "Velocidad de Solicitudes (Opcional)",
+    "scan.maxRpsPlaceholder": "Máx. solicitudes/seg por host",
+    "scan.maxInFlightPlaceholder": "Máx. concurrentes por host (32)",
+    "scan.adaptiveRate": "Reducir la velocidad automáticamente ante 429/503 y respuestas lentas",
+    "scan.rateLimitDesc": "Bajá estos valores para sistemas de producción frágiles",
 
     // Scan report page
     "scan.title": "Informe de Seguridad",
@@ -338,6 +349,7 @@ export const translations = {
     "scanProgress.failed": "Escaneo fallido",
     "scanProgress.starting": "Iniciando escaneo...",
     "scanProgress.step": "Paso {step} de {total}",
+    "scanProgress.findings": "{count} hallazgos hasta ahora",
     "scanProgress.cancel": "Cancelar",
     "scanProgress.cancelling": "Cancelando...",
     "scanProgress.cancelled": "Escaneo cancelado",
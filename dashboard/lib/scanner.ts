@@ -1,6 +1,6 @@
 import { spawn, type ChildProcess } from "child_process";
 import path from "path";
-import type { ScanProgress, ScanReport } from "./types";
+import type { Finding, ScanEvent, ScanProgress, ScanReport, ScanThrottle, Severity, SubdomainEntry } from "./types";
 
 const PROJECT_ROOT = path.resolve(process.cwd(), "..");
 // In Docker the venv is at /app/venv; locally it's one level up from dashboard/
@@ -13,10 +13,20 @@ type CompleteCallback = (report: ScanReport) => void;
 type ErrorCallback = (error: string) => void;
 
 const activeProcesses = new Map<string, ChildProcess>();
+// Scans stopped by killScan: the scanner still exits 0 with a partial summary
+const cancelledScans = new Set<string>();
+
+// Same order as the scanner's report_data(); findings stream in arrival order
+const SEVERITY_RANK: Record<Severity, number> = { CRITICAL: 0, HIGH: 1, MEDIUM: 2, LOW: 3, INFO: 4 };
+
+function bySeverity(findings: Finding[]): Finding[] {
+  return [...findings].sort((a, b) => (SEVERITY_RANK[a.severity] ?? 5) - (SEVERITY_RANK[b.severity] ?? 5));
+}
 
 export function killScan(scanId: string): boolean {
   const proc = activeProcesses.get(scanId);
   if (!proc) return false;
+  cancelledScans.add(scanId);
   proc.kill("SIGTERM");
   activeProcesses.delete(scanId);
   return true;
@@ -30,9 +40,10 @@ export function runScan(
   cookies?: string,
   quickScan?: boolean,
   skipModules?: string,
-  scanId?: string
+  scanId?: string,
+  throttle?: ScanThrottle
 ): ChildProcess {
-  const args = [SCANNER_PATH, url, "--json-stdout", "--progress", "--quiet"];
+  const args = [SCANNER_PATH, url, "--ndjson", "--progress", "--quiet"];
   if (cookies) {
     args.push("--cookies", cookies);
   }
@@ -42,6 +53,15 @@ export function runScan(
   if (skipModules) {
     args.push("--skip-modules", skipModules);
   }
+  if (throttle?.maxRps) {
+    args.push("--max-rps", String(throttle.maxRps));
+  }
+  if (throttle?.maxInFlight) {
+    args.push("--max-in-flight", String(throttle.maxInFlight));
+  }
+  if (throttle?.adaptive === false) {
+    args.push("--no-adaptive");
+  }
 
   const proc = spawn(PYTHON_BIN, args, {
     cwd: PROJECT_ROOT,
@@ -50,22 +70,44 @@ export function runScan(
 
   if (scanId) activeProcesses.set(scanId, proc);
 
-  let stdout = "";
+  // --ndjson streams one event per line; the report is assembled as events arrive
+  const findings: Finding[] = [];
+  const discoveredUrls: string[] = [];
+  const subdomains: SubdomainEntry[] = [];
+  let report: ScanReport | null = null;
+  let pending = "";
   let stderr = "";
 
+  const handleEvent = (event: ScanEvent) => {
+    switch (event.type) {
+      case "progress":
+        onProgress({ ...event.data, findings: findings.length });
+        break;
+      case "finding":
+        findings.push(event.data);
+        break;
+      case "url":
+        discoveredUrls.push(event.data.url);
+        break;
+      case "subdomain":
+        subdomains.push(event.data);
+        break;
+      case "summary":
+        report = { ...event.data, findings: bySeverity(findings), discovered_urls: discoveredUrls, subdomains };
+        break;
+    }
+  };
+
   proc.stdout?.on("data", (data: Buffer) => {
-    const text = data.toString();
-    const lines = text.split("\n");
+    pending += data.toString();
+    const lines = pending.split("\n");
+    pending = lines.pop() ?? "";
     for (const line of lines) {
-      if (line.startsWith("PROGRESS:")) {
-        try {
-          const progress = JSON.parse(line.slice(9)) as ScanProgress;
-          onProgress(progress);
-        } catch {
-          // ignore malformed progress lines
-        }
-      } else if (line.trim()) {
-        stdout += line;
+      if (!line.trim()) continue;
+      try {
+        handleEvent(JSON.parse(line) as ScanEvent);
+      } catch {
+        // ignore malformed lines
       }
     }
   });
@@ -76,13 +118,11 @@ export function runScan(
 
   proc.on("close", (code) => {
     if (scanId) activeProcesses.delete(scanId);
-    if (code === 0 && stdout) {
-      try {
-        const report = JSON.parse(stdout) as ScanReport;
-        onComplete(report);
-      } catch {
-        onError(`Failed to parse scanner output: ${stdout.slice(0, 200)}`);
-      }
+    if (scanId && cancelledScans.delete(scanId)) return; // already marked failed by the cancel route
+    if (code === 0 && report) {
+      onComplete(report);
+    } else if (code === 0) {
+      onError("Scanner exited without a summary event");
     } else {
       onError(stderr || `Scanner exited with code ${code}`);
     }
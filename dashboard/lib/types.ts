@@ -7,6 +7,7 @@ export interface Finding {
   detail: string;
   recommendation: string;
   timestamp: string;
+  page?: string;
 }
 
 export interface DnsRecord {
@@ -46,6 +47,92 @@ export interface ScanReport {
   cve_data?: CveRecord[];
   subdomains?: SubdomainEntry[];
   fuzz_results?: FuzzResult[];
+  cache_stats?: CacheStats;
+  lookup_cache_stats?: LookupCacheStats;
+  rate_governor?: RateGovernorStats;
+  circuit_breaker?: CircuitBreakerStats;
+  /** Per-host response-time distribution, in milliseconds. */
+  latency_ms?: Record<string, { samples: number; p50: number; p90: number; p99: number; max: number }>;
+  /** Phases carried over from a --resume checkpoint instead of being re-run. */
+  resumed_phases?: string[];
+  discovered_forms?: { action: string; method: string; fields: Record<string, unknown>; url: string }[];
+  /** ETag, Last-Modified and body hash per crawled page, used by --baseline. */
+  page_validators?: Record<string, { etag: string | null; last_modified: string | null; sha1: string }>;
+  baseline?: { unchanged_pages: number; changed_pages: number; carried_findings: number } | null;
+  /** True when the scan stopped early (time budget, signal) or some module did not complete. */
+  partial?: boolean;
+  stop_reason?: string | null;
+  modules?: Record<string, ModuleStatus>;
+  /** Estimates from --plan, --quick, --max-requests or --time-budget; null otherwise. */
+  plan?: ScanPlan | null;
+}
+
+export interface ScanPlan {
+  latency_ms: number;
+  discovery: { requests: number; seconds: number };
+  budget: { requests: number | null; seconds: number | null };
+  /** Payloads tried per injection point; null = all of them. */
+  payload_depth: number | null;
+  selected: string[];
+  estimated_requests: number;
+  estimated_seconds: number;
+  modules: Record<string, {
+    requests: number;
+    seconds: number;
+    method: "dry-run" | "static";
+    payload_waves: number;
+    selected: boolean;
+    error?: string;
+  }>;
+}
+
+export type ModuleStatus = "running" | "completed" | "failed" | "partial" | "skipped" | "resumed";
+
+export interface CacheStats {
+  hits: number;
+  misses: number;
+  hit_rate: number;
+  evictions: number;
+  entries: number;
+  bytes: number;
+}
+
+export interface LookupCacheStats {
+  enabled: boolean;
+  hits: number;
+  misses: number;
+  hit_rate: number;
+  sources: Record<string, { hits: number; misses: number; hit_rate: number }>;
+}
+
+export interface RateGovernorStats {
+  adaptive: boolean;
+  max_rps: number;
+  max_in_flight: number;
+  hosts: Record<string, {
+    rps: number | null;
+    max_in_flight: number;
+    requests: number;
+    throttled: number;
+    errors: number;
+    backoffs: number;
+    latency_ms: number | null;
+  }>;
+}
+
+export interface CircuitBreakerStats {
+  threshold: number;
+  rejected: number;
+  hosts: Record<string, { state: "closed" | "open" | "half_open"; trips: number; rejected: number }>;
+  /** Phase id → requests failed fast while that phase was running. */
+  short_circuited: Record<string, number>;
+}
+
+/** Per-host request limits passed to the scanner (--max-rps / --max-in-flight / --no-adaptive). */
+export interface ScanThrottle {
+  maxRps?: number;
+  maxInFlight?: number;
+  adaptive?: boolean;
 }
 
 export interface ScanRecord {
@@ -69,8 +156,30 @@ export interface ScanProgress {
   step: number;
   total: number;
   message?: string;
+  status?: "started" | "running" | "finished";
+  pages?: number;
+  pages_per_sec?: number;
+  /** Findings streamed so far (set by runScan, not the scanner). */
+  findings?: number;
 }
 
+export interface PhaseResult {
+  phase: string;
+  status: "completed" | "failed" | "partial";
+  elapsed: number;
+  error?: string;
+}
+
+/** One line of the scanner's --ndjson output. */
+export type ScanEvent =
+  | { type: "progress"; data: ScanProgress }
+  | { type: "finding"; data: Finding }
+  | { type: "url"; data: { url: string } }
+  | { type: "subdomain"; data: SubdomainEntry }
+  | { type: "phase"; data: PhaseResult }
+  | { type: "plan"; data: ScanPlan }
+  | { type: "summary"; data: Omit<ScanReport, "findings" | "discovered_urls" | "subdomains"> };
+
 export interface BatchRecord {
   id: string;
   status: "running" | "completed" | "failed";
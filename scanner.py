@@ -12,12 +12,27 @@ import json
 import ssl
 import socket
 import time
+import asyncio
+import threading
 import urllib.parse
-from datetime import datetime
-from collections import defaultdict
+import argparse
+import copy
+import signal
+import concurrent.futures
+import contextvars
+import codecs
+import itertools
+import math
+import statistics
+import hashlib
+import secrets
+import gzip
+import sqlite3
+from datetime import datetime, timedelta
+from collections import defaultdict, deque, OrderedDict
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, FeatureNotFound
 from colorama import init, Fore, Style
 import urllib3
 
@@ -26,6 +41,137 @@ init(autoreset=True)
 
 # ─── Configuration ────────────────────────────────────────────────────
 TIMEOUT = 15
+PHASE_WORKERS = 4  # phases allowed to run concurrently in run_full_scan
+RESPONSE_CACHE_ENTRIES = 512             # max cached GET responses per scan
+RESPONSE_CACHE_BYTES = 32 * 1024 * 1024  # max total body bytes held by the cache
+
+
+def _default_html_parser():
+    """Prefer lxml (much faster) when installed, else the stdlib parser."""
+    try:
+        import lxml  # noqa: F401
+        return "lxml"
+    except ImportError:
+        return "html.parser"
+
+
+HTML_PARSER = _default_html_parser()
+
+CRAWL_DEPTH = 2        # link levels followed from the target
+CRAWL_MAX_PAGES = 200  # pages fetched per crawl
+CRAWL_WORKERS = 8      # concurrent crawler fetches
+CRAWL_PER_HOST = 4     # concurrent fetches against a single host
+DNS_WORKERS = 50       # concurrent subdomain lookups
+DNS_LIFETIME = 3       # seconds per DNS query
+SUBDOMAIN_PROBE_WORKERS = 16  # concurrent HTTP probes of resolved subdomains
+DIR_WORKERS = 32              # concurrent directory/file probes
+DIR_MAX_BYTES = 64 * 1024     # body bytes read per probe; hits on huge dumps aren't downloaded
+DIR_BATCH = 1000              # wordlist entries pulled into memory at a time
+SOFT_404_MAX_DISTANCE = 6     # simhash bits (of 64) two pages may differ by and still be "the same"
+PORT_SCAN_CONCURRENCY = 200   # simultaneous TCP connects in the native port scanner
+PORT_TIMEOUT = 2              # seconds per connect attempt
+CVE_DB_PATH = os.environ.get(
+    "TUPISEC_CVE_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "nvd.sqlite"))
+CACHE_DIR = os.environ.get("TUPISEC_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "tupisec"))
+LOOKUP_CACHE_TTLS = {       # seconds a cached external lookup stays valid, per source
+    "nvd": 24 * 3600,
+    "whois": 7 * 24 * 3600,
+    "dns": 3600,
+}
+LOOKUP_CACHE_MAX_ENTRIES = 100000
+CVE_MIN_SCORE = 7.0          # only HIGH/CRITICAL CVEs are reported
+CVE_MAX_PER_PRODUCT = 25     # highest-scoring CVEs reported per product from the local index
+# Names seen in Server/X-Powered-By headers → NVD CPE (vendor, product); product names
+# like http_server are shared by several vendors, so the vendor is matched too
+CPE_PRODUCT_ALIASES = {
+    "apache": ("apache", "http_server"),
+    "httpd": ("apache", "http_server"),
+    "microsoft-iis": ("microsoft", "internet_information_services"),
+    "iis": ("microsoft", "internet_information_services"),
+    "node": ("nodejs", "node.js"),
+    "nodejs": ("nodejs", "node.js"),
+    "openresty": ("openresty", "openresty"),
+    "asp.net": ("microsoft", "asp.net"),
+}
+COMMON_PORTS = [21, 22, 23, 25, 53, 80, 110, 143, 443, 445, 993, 995,
+                1433, 1521, 3306, 3389, 5432, 5900, 6379, 8080, 8443, 8888, 9090, 27017]
+ASYNC_MAX_IN_FLIGHT = 100    # concurrent fetch() calls per scanner
+ASYNC_MAX_CONNECTIONS = 20   # pooled sockets per scanner (aiohttp backend)
+ASYNC_MAX_PER_HOST = 10      # pooled sockets per target host (aiohttp backend)
+ASYNC_FALLBACK_THREADS = 16  # blocking-session threads when aiohttp is missing
+GOVERNOR_MAX_RPS = 0             # per-host request rate ceiling (0 = none until the host pushes back)
+GOVERNOR_MAX_IN_FLIGHT = 32      # per-host concurrent request ceiling
+GOVERNOR_MIN_RPS = 1.0           # backoff never goes below this rate
+GOVERNOR_RPS_STEP = 5.0          # additive increase, in req/s gained per second of healthy traffic
+GOVERNOR_DECREASE_INTERVAL = 1.0  # seconds between multiplicative decreases for one host
+GOVERNOR_LATENCY_FACTOR = 4.0    # latency this many times the host's best (EWMA) counts as congestion
+GOVERNOR_LATENCY_FLOOR = 0.25    # seconds; faster responses never count as congestion
+GOVERNOR_MAX_PAUSE = 30.0        # longest Retry-After pause honored, in seconds
+GOVERNOR_POLL_INTERVAL = 0.01    # seconds between checks for a free in-flight slot
+BREAKER_THRESHOLD = 5            # consecutive connection errors/timeouts that open a host's circuit (0 = off)
+BREAKER_COOLDOWN = 30.0          # seconds an open circuit waits before letting one probe through
+BREAKER_MAX_COOLDOWN = 300.0     # cooldown doubles after each failed probe, up to this
+SERVE_MAX_JOBS = 4               # scans a --serve worker runs at once; later jobs wait
+SERVE_POOL_SIZE = 64             # pooled keep-alive connections shared by --serve jobs
+CHECKPOINT_EVERY = 500           # requests between mid-phase checkpoints (--checkpoint/--resume)
+CANCEL_GRACE = 10                # seconds in-flight work may take to drain after cancellation
+PLAN_DISCOVERY = ("headers", "tech", "forms", "crawl")  # phases run for real before the rest are estimated
+PLAN_DEFAULT_LATENCY = 0.2       # seconds per round trip assumed while the target's latency is unmeasured
+PLAN_DNS_LATENCY = 0.05          # seconds per DNS query assumed for the DNS/subdomain estimates
+PLAN_TIME_MARGIN = 0.8           # share of the remaining time budget the selected modules may fill
+QUICK_TIME_BUDGET = 60           # estimated seconds --quick fits the scan into
+TIMING_BASELINE_SAMPLES = 6      # control requests sampled (concurrently) before timing probes
+TIMING_ROUNDS = 3                # interleaved control/delayed pairs needed to confirm a delay
+TIMING_WORKERS = 8               # timing probes running in parallel
+TIMING_MIN_DELAY = 1             # seconds; the delay unit grows with the host's jitter
+TIMING_MAX_DELAY = 5
+TIMING_MIN_RATIO = 0.7           # observed extra time / requested delay required in every round
+# One-sided 99% critical values of Student's t by degrees of freedom
+T_CRITICAL_99 = {1: 31.82, 2: 6.965, 3: 4.541, 4: 3.747, 5: 3.365, 6: 3.143, 7: 2.998, 8: 2.896, 9: 2.821}
+LATENCY_WINDOW = 256             # most recent response times kept per host
+LATENCY_MIN_SAMPLES = 20         # below this, callers' fixed timeouts are used as-is
+TIMEOUT_FACTOR = 4.0             # derived timeout = percentile latency x this
+ADAPTIVE_CONNECT_MIN = 2.0       # clamps for derived (connect, read) timeouts, in seconds
+ADAPTIVE_READ_MIN = 3.0
+ADAPTIVE_TIMEOUT_MAX = 60.0
+INJECTION_REQUEST_BUDGET = 5000  # payload requests shared by all injection modules per scan
+INJECTION_MEMO_ENTRIES = 256     # identical probe responses kept for reuse across modules
+SKIP_FIELD_TYPES = ("hidden", "submit", "button", "image")
+SECRET_CHUNK_BYTES = 64 * 1024          # read size when streaming bodies through the secret scanner
+SECRET_OVERLAP_CHARS = 2048             # carried between chunks so matches aren't split (max match length)
+SECRET_CONTEXT_CHARS = 16               # already-scanned text kept before the window for rule lookbehinds
+SECRET_MAX_BYTES = 16 * 1024 * 1024     # per-resource cap for the secret scanner
+SECRET_SCAN_WORKERS = 8
+SECRET_EXTENSIONS = (".js", ".mjs", ".json", ".map")
+SECRET_CONTENT_TYPES = ("text/", "javascript", "json", "xml")
+STATIC_EXTENSIONS = (
+    ".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".webp", ".bmp",
+    ".css", ".js", ".map", ".woff", ".woff2", ".ttf", ".eot",
+    ".mp3", ".mp4", ".webm", ".pdf", ".zip", ".gz",
+)
+# Built-in subdomain labels; --subdomain-wordlist adds to them
+SUBDOMAIN_WORDS = [
+    "www", "api", "admin", "dev", "staging", "mail", "ftp", "app", "portal",
+    "vpn", "auth", "dashboard", "panel", "beta", "shop", "blog", "help",
+    "status", "cdn", "docs", "git", "jenkins", "jira", "smtp", "ns1", "ns2",
+    "db", "backup", "monitor", "metrics", "grafana", "kibana", "test", "qa",
+    "uat", "prod", "internal", "remote", "support", "demo", "login", "webmail",
+    "m", "mobile", "static", "assets", "img", "images", "media", "upload",
+    "files", "download", "secure", "dev2", "stage", "sandbox", "preview",
+    "api2", "v2", "legacy", "old", "new", "infra", "ops", "cloud",
+    "proxy", "lb", "waf", "gitlab", "wiki", "confluence", "vault",
+    "elastic", "logstash", "prom", "alerts", "logs", "search", "sso", "id",
+    "account", "accounts", "billing", "payment", "store", "forum",
+    "community", "partner", "careers",
+]
+# Most valuable first: budget-driven scans (--quick, --max-requests, --time-budget) keep modules in this order
+MODULE_PRIORITY = [
+    "headers", "ssl", "sqli", "xss", "sensitive_data", "directories", "cors", "methods",
+    "cves", "jwt", "cmd_injection", "path_traversal", "ssti", "ssrf", "open_redirect",
+    "mixed_content", "graphql", "nosql", "xxe", "crlf", "default_creds", "file_upload",
+    "prototype", "rate_limit", "param_fuzz", "ports", "dns", "smuggling", "subdomains",
+    "s3_buckets", "broken_links",
+]
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 COMMON_PATHS = [
     "admin/", "administrator/", "login.php", "admin.php", "panel/",
@@ -76,12 +222,13 @@ SECURITY_HEADERS = [
 
 class Finding:
     """Represents a security finding."""
-    def __init__(self, severity, category, title, detail, recommendation=""):
+    def __init__(self, severity, category, title, detail, recommendation="", page=None):
         self.severity = severity  # CRITICAL, HIGH, MEDIUM, LOW, INFO
         self.category = category
         self.title = title
         self.detail = detail
         self.recommendation = recommendation
+        self.page = page  # page of the injection point that produced it, if any
         self.timestamp = datetime.now().isoformat()
 
     def __str__(self):
@@ -96,7 +243,7 @@ class Finding:
         return f"{color}[{self.severity}] {self.category}: {self.title}{Style.RESET_ALL}\n  {self.detail}"
 
     def to_dict(self):
-        return {
+        d = {
             "severity": self.severity,
             "category": self.category,
             "title": self.title,
@@ -104,6 +251,1963 @@ class Finding:
             "recommendation": self.recommendation,
             "timestamp": self.timestamp,
         }
+        if self.page:
+            d["page"] = self.page
+        return d
+
+
+# Id of the scan phase the current code runs for; breaker rejections are charged to it
+SCAN_PHASE = contextvars.ContextVar("scan_phase", default=None)
+
+
+class ContextThreadPool(concurrent.futures.ThreadPoolExecutor):
+    """ThreadPoolExecutor whose tasks run in a copy of the submitter's contextvars (e.g. SCAN_PHASE)."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+class PhaseScheduler:
+    """Runs scan phases as a dependency graph on a bounded thread pool.
+
+    Each phase is a ``(phase_id, message, fn, deps)`` tuple. A phase starts as
+    soon as every dependency present in the graph has finished; dependencies
+    that are not in the graph (e.g. skipped modules) count as satisfied.
+    ``on_event(phase_id, message, status, finished, total)`` is called with
+    ``status`` set to ``"started"`` or ``"finished"``. Once ``cancelled`` (a
+    threading.Event) is set, phases not yet started are skipped.
+    """
+
+    def __init__(self, phases, workers=PHASE_WORKERS, on_event=None, cancelled=None):
+        self.phases = list(phases)
+        self.workers = max(1, int(workers))
+        self.on_event = on_event
+        self.cancelled = cancelled
+        self.results = {}
+        self.errors = {}
+        self.skipped = []
+        ids = [p[0] for p in self.phases]
+        if len(set(ids)) != len(ids):
+            raise ValueError("Duplicate phase id in scan graph")
+        known = set(ids)
+        self._deps = {pid: {d for d in deps if d in known} for pid, _, _, deps in self.phases}
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        remaining = {pid: set(deps) for pid, deps in self._deps.items()}
+        while remaining:
+            ready = [pid for pid, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Dependency cycle between phases: {', '.join(sorted(remaining))}")
+            for pid in ready:
+                del remaining[pid]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def _emit(self, phase_id, message, status, finished):
+        if self.on_event:
+            self.on_event(phase_id, message, status, finished, len(self.phases))
+
+    def run(self):
+        pending = list(self.phases)
+        done = set()
+        running = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while pending or running:
+                if self.cancelled is not None and self.cancelled.is_set():
+                    self.skipped.extend(p[0] for p in pending)
+                    pending = []
+                # Submit in declaration order so workers=1 keeps the classic sequence
+                for phase in list(pending):
+                    if len(running) >= self.workers:
+                        break
+                    phase_id, message, fn, _ = phase
+                    if self._deps[phase_id] <= done:
+                        pending.remove(phase)
+                        self._emit(phase_id, message, "started", len(done))
+                        running[pool.submit(fn)] = phase
+                if not running:
+                    break
+                completed, _ = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for fut in completed:
+                    phase_id, message, _, _ = running.pop(fut)
+                    try:
+                        self.results[phase_id] = fut.result()
+                    except Exception as e:
+                        self.errors[phase_id] = str(e)
+                    done.add(phase_id)
+                    self._emit(phase_id, message, "finished", len(done))
+        return self.results
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of idempotent GET responses, bounded by count and bytes.
+
+    Concurrent requests for the same key are coalesced: the first caller
+    fetches, the others wait for its response instead of hitting the target.
+    """
+
+    DEFAULT_PORTS = {"http": 80, "https": 443}
+
+    def __init__(self, max_entries=RESPONSE_CACHE_ENTRIES, max_bytes=RESPONSE_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (response, size)
+        self._inflight = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def make_key(cls, url, headers=None, allow_redirects=True):
+        """Normalize URL and per-request headers into a cache key."""
+        p = urllib.parse.urlsplit(url)
+        scheme = p.scheme.lower()
+        host = (p.hostname or "").lower()
+        if p.port and p.port != cls.DEFAULT_PORTS.get(scheme):
+            host = f"{host}:{p.port}"
+        query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(p.query, keep_blank_values=True)))
+        norm = urllib.parse.urlunsplit((scheme, host, p.path or "/", query, ""))
+        hdrs = tuple(sorted((k.lower(), str(v)) for k, v in (headers or {}).items()))
+        return (norm, hdrs, bool(allow_redirects))
+
+    def get_or_fetch(self, key, loader):
+        """Return the cached response for ``key`` or call ``loader()`` once to fill it."""
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                waiter = self._inflight.get(key)
+                if waiter is None:
+                    self._inflight[key] = threading.Event()
+                    self.misses += 1
+                    break
+            waiter.wait()
+            # Loop: either the owner cached the response or it failed and we retry
+
+        try:
+            resp = loader()
+            self.store(key, resp)
+            return resp
+        finally:
+            with self._lock:
+                self._inflight.pop(key).set()
+
+    def lookup(self, key):
+        """Return a cached response without fetching, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def store(self, key, resp):
+        size = len(resp.content or b"")
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]  # replaced, e.g. two phases fetched the same uncoalesced key
+            self._entries[key] = (resp, size)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, old_size) = self._entries.popitem(last=False)
+                self._bytes -= old_size
+                self.evictions += 1
+
+    def copy(self):
+        """A new cache holding the same responses, with fresh counters."""
+        clone = ResponseCache(self.max_entries, self.max_bytes)
+        with self._lock:
+            clone._entries = OrderedDict(self._entries)
+            clone._bytes = self._bytes
+        return clone
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
+class FetchResponse:
+    """Minimal ``requests.Response`` stand-in returned by the aiohttp backend."""
+
+    def __init__(self, url, status_code, headers, content, encoding=None, elapsed=0.0):
+        self.url = url
+        self.status_code = status_code
+        self.headers = requests.structures.CaseInsensitiveDict(headers)
+        self.content = content
+        self.encoding = encoding
+        self.elapsed = timedelta(seconds=elapsed)
+        self.truncated = False  # body cut at the caller's max_bytes
+        self._text = None
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = self.content.decode(self.encoding or "utf-8", errors="replace")
+        return self._text
+
+    def json(self):
+        return json.loads(self.text)
+
+
+def _retry_after(headers):
+    """Seconds from a numeric Retry-After header, or None."""
+    try:
+        return max(0.0, float(headers.get("Retry-After", "")))
+    except (TypeError, ValueError):
+        return None
+
+
+class RateGovernor:
+    """Per-host token bucket plus in-flight cap, tuned AIMD-style from responses.
+
+    Every request takes a slot (``max_in_flight`` per host) and, once the
+    host has a rate, a token from its bucket. 429/503 responses, connection
+    errors and latency climbing well above the host's best halve both limits,
+    at most once per ``GOVERNOR_DECREASE_INTERVAL``; Retry-After pauses the
+    host. Without ``max_rps`` a host is unmetered until its first backoff,
+    which sets its rate to half the throughput observed. Healthy responses
+    win capacity back additively, up to the ceilings. With ``adaptive=False``
+    the ceilings are fixed limits.
+    """
+
+    def __init__(self, max_rps=GOVERNOR_MAX_RPS, max_in_flight=GOVERNOR_MAX_IN_FLIGHT, adaptive=True):
+        self.max_rps = max_rps
+        self.max_in_flight = max_in_flight
+        self.adaptive = adaptive
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host(self, host):
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = {
+                "rps": float(self.max_rps) if self.max_rps else None,
+                "limit": float(max(1, self.max_in_flight)),
+                "tokens": max(1.0, float(self.max_rps)), "refill": time.monotonic(), "in_flight": 0,
+                "window_start": time.monotonic(), "window_count": 0, "observed_rps": 0.0,
+                "paused_until": 0.0, "last_decrease": 0.0, "latency": None, "best_latency": None,
+                "requests": 0, "throttled": 0, "errors": 0, "backoffs": 0,
+            }
+        return state
+
+    def try_acquire(self, host):
+        """Take a slot and a token for ``host``: 0 on success, else seconds to wait before retrying."""
+        now = time.monotonic()
+        with self._lock:
+            st = self._host(host)
+            if now < st["paused_until"]:
+                return st["paused_until"] - now
+            if st["in_flight"] >= int(st["limit"]):
+                return GOVERNOR_POLL_INTERVAL
+            if st["rps"]:
+                # Bucket holds at most one second of tokens, so bursts stay small
+                st["tokens"] = min(max(1.0, st["rps"]), st["tokens"] + (now - st["refill"]) * st["rps"])
+                st["refill"] = now
+                if st["tokens"] < 1:
+                    return (1 - st["tokens"]) / st["rps"]
+                st["tokens"] -= 1
+            if now - st["window_start"] >= 1.0:
+                st["observed_rps"] = st["window_count"] / (now - st["window_start"])
+                st["window_start"], st["window_count"] = now, 0
+            st["window_count"] += 1
+            st["in_flight"] += 1
+            st["requests"] += 1
+            return 0.0
+
+    def acquire(self, host):
+        """Block the calling thread until ``host`` may be sent another request."""
+        while True:
+            wait = self.try_acquire(host)
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self, host):
+        """acquire() for coroutines: waits without blocking the event loop."""
+        while True:
+            wait = self.try_acquire(host)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def release(self, host, status=None, elapsed=None, headers=None, error=False):
+        """Free ``host``'s slot and feed back the outcome of the request."""
+        now = time.monotonic()
+        with self._lock:
+            st = self._host(host)
+            st["in_flight"] = max(0, st["in_flight"] - 1)
+            if error:
+                st["errors"] += 1
+                congested = True
+            elif status is None:
+                return  # cancelled / not a network outcome: nothing to learn
+            else:
+                congested = status in (429, 503)
+                if congested:
+                    st["throttled"] += 1
+                    pause = _retry_after(headers or {})
+                    if pause:
+                        st["paused_until"] = max(st["paused_until"], now + min(pause, GOVERNOR_MAX_PAUSE))
+                if elapsed is not None:
+                    st["latency"] = elapsed if st["latency"] is None else 0.8 * st["latency"] + 0.2 * elapsed
+                    st["best_latency"] = min(st["best_latency"] or st["latency"], st["latency"])
+                    threshold = GOVERNOR_LATENCY_FACTOR * max(st["best_latency"], GOVERNOR_LATENCY_FLOOR)
+                    congested = congested or st["latency"] > threshold
+            if not self.adaptive:
+                return
+            if congested:
+                if now - st["last_decrease"] >= GOVERNOR_DECREASE_INTERVAL:
+                    st["last_decrease"] = now
+                    st["backoffs"] += 1
+                    st["limit"] = max(1.0, st["limit"] / 2)
+                    current = st["rps"] or max(st["observed_rps"],
+                                               st["window_count"] / max(now - st["window_start"], 0.1))
+                    st["rps"] = max(GOVERNOR_MIN_RPS, current / 2)
+            else:
+                # ~one slot per round of in-flight requests, ~GOVERNOR_RPS_STEP req/s per second
+                st["limit"] = min(float(max(1, self.max_in_flight)), st["limit"] + 1 / st["limit"])
+                if st["rps"]:
+                    st["rps"] += GOVERNOR_RPS_STEP / st["rps"]
+                    if self.max_rps:
+                        st["rps"] = min(float(self.max_rps), st["rps"])
+
+    def total_requests(self):
+        """Requests admitted so far, across all hosts."""
+        with self._lock:
+            return sum(st["requests"] for st in self._hosts.values())
+
+    def stats(self):
+        with self._lock:
+            hosts = {
+                host: {
+                    "rps": round(st["rps"], 1) if st["rps"] else None,
+                    "max_in_flight": int(st["limit"]),
+                    "requests": st["requests"],
+                    "throttled": st["throttled"],
+                    "errors": st["errors"],
+                    "backoffs": st["backoffs"],
+                    "latency_ms": round(st["latency"] * 1000) if st["latency"] is not None else None,
+                }
+                for host, st in self._hosts.items()
+            }
+        return {"adaptive": self.adaptive, "max_rps": self.max_rps,
+                "max_in_flight": self.max_in_flight, "hosts": hosts}
+
+
+class LatencyTracker:
+    """Rolling per-host response times, for percentiles and derived timeouts.
+
+    ``timeout()`` turns them into a ``(connect, read)`` pair: p90 and p99
+    times ``TIMEOUT_FACTOR``, clamped. Until a host has
+    ``LATENCY_MIN_SAMPLES`` responses the caller's own timeout is used.
+    """
+
+    def __init__(self, window=LATENCY_WINDOW, factor=TIMEOUT_FACTOR):
+        self.window = window
+        self.factor = factor
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, host, seconds):
+        with self._lock:
+            samples = self._samples.get(host)
+            if samples is None:
+                samples = self._samples[host] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def _sorted(self, host):
+        with self._lock:
+            return sorted(self._samples.get(host, ()))
+
+    @staticmethod
+    def _rank(ordered, q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def percentile(self, host, q):
+        """Latency below which a fraction ``q`` of ``host``'s responses fell, or None."""
+        ordered = self._sorted(host)
+        return self._rank(ordered, q) if ordered else None
+
+    def distribution(self, host):
+        """Summary detectors compare a measured delay against, or None with no samples."""
+        ordered = self._sorted(host)
+        if not ordered:
+            return None
+        return {"samples": len(ordered), "p50": self._rank(ordered, 0.5), "p90": self._rank(ordered, 0.9),
+                "p99": self._rank(ordered, 0.99), "max": ordered[-1]}
+
+    def timeout(self, host, fallback=TIMEOUT):
+        """``(connect, read)`` timeout for ``host``; ``fallback`` until enough samples exist."""
+        ordered = self._sorted(host)
+        if len(ordered) < LATENCY_MIN_SAMPLES:
+            return fallback
+        read = min(ADAPTIVE_TIMEOUT_MAX, max(ADAPTIVE_READ_MIN, self._rank(ordered, 0.99) * self.factor))
+        connect = min(read, max(ADAPTIVE_CONNECT_MIN, self._rank(ordered, 0.9) * self.factor))
+        return (round(connect, 2), round(read, 2))
+
+    def stats(self):
+        with self._lock:
+            hosts = list(self._samples)
+        out = {}
+        for host in hosts:
+            dist = self.distribution(host)
+            out[host] = {k: round(v * 1000) if k != "samples" else v for k, v in dist.items()}
+        return out
+
+
+class DelayTimeout(tuple):
+    """``(connect, read)`` timeout of a probe that asks the target to stall.
+
+    Sessions don't feed such responses to the latency tracker or the
+    governor, so deliberate delays don't inflate a host's percentiles or
+    derived timeouts.
+    """
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+
+class ScanCancelled(requests.ConnectionError):
+    """Raised instead of sending a request once the scan has been cancelled."""
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker for targets that stop answering.
+
+    ``threshold`` consecutive connection errors or timeouts open a host's
+    circuit: further requests fail at once with CircuitOpenError. After
+    ``cooldown`` seconds one probe request is let through (half-open); an
+    answer closes the circuit, another failure reopens it with the cooldown
+    doubled. Any HTTP response, whatever its status, counts as an answer.
+    ``on_change(host, state)`` is called when a circuit opens or closes, and
+    ``on_reject(host)`` for every request failed fast, in the caller's thread.
+    """
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN, on_change=None, on_reject=None):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.on_change = on_change
+        self.on_reject = on_reject
+        self.rejected = 0
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host(self, host):
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = {"state": "closed", "failures": 0, "opened_at": 0.0,
+                                         "cooldown": self.cooldown, "probing": False,
+                                         "trips": 0, "rejected": 0}
+        return state
+
+    def before(self, host):
+        """Raise CircuitOpenError if ``host`` must not be sent a request now."""
+        if not self.threshold:
+            return
+        with self._lock:
+            st = self._host(host)
+            if st["state"] == "closed":
+                return
+            if not st["probing"] and time.monotonic() - st["opened_at"] >= st["cooldown"]:
+                st["state"] = "half_open"
+                st["probing"] = True
+                return
+            st["rejected"] += 1
+            self.rejected += 1
+        if self.on_reject:
+            self.on_reject(host)
+        raise CircuitOpenError(f"Circuit open for {host}: target stopped responding")
+
+    def record_success(self, host):
+        if not self.threshold:
+            return
+        with self._lock:
+            st = self._host(host)
+            reopened = st["state"] != "closed"
+            st.update(state="closed", failures=0, probing=False, cooldown=self.cooldown)
+        if reopened and self.on_change:
+            self.on_change(host, "closed")
+
+    def record_failure(self, host):
+        if not self.threshold:
+            return
+        with self._lock:
+            st = self._host(host)
+            st["failures"] += 1
+            if st["state"] == "half_open":
+                st["cooldown"] = min(st["cooldown"] * 2, BREAKER_MAX_COOLDOWN)
+            elif st["state"] == "open" or st["failures"] < self.threshold:
+                return
+            st.update(state="open", opened_at=time.monotonic(), probing=False)
+            st["trips"] += 1
+        if self.on_change:
+            self.on_change(host, "open")
+
+    def release(self, host):
+        """The half-open probe ended without an outcome (e.g. cancelled): allow another."""
+        with self._lock:
+            st = self._hosts.get(host)
+            if st and st["state"] == "half_open":
+                st["probing"] = False
+
+    def stats(self):
+        with self._lock:
+            return {
+                "threshold": self.threshold,
+                "rejected": self.rejected,
+                "hosts": {host: {"state": st["state"], "trips": st["trips"], "rejected": st["rejected"]}
+                          for host, st in self._hosts.items() if st["trips"]},
+            }
+
+
+class GovernedSession(requests.Session):
+    """``requests.Session`` whose requests all pass through a RateGovernor and CircuitBreaker.
+
+    Response times feed a LatencyTracker. With ``adaptive_timeouts`` a plain
+    number passed as ``timeout`` is replaced by the host's derived timeout;
+    a ``(connect, read)`` tuple is always used as given.
+    """
+
+    def __init__(self, governor=None, breaker=None, latency=None):
+        super().__init__()
+        self.governor = governor if governor is not None else RateGovernor()
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.latency = latency if latency is not None else LatencyTracker()
+        self.adaptive_timeouts = True
+        self.cancelled = None  # threading.Event; once set every request raises ScanCancelled
+
+    def resolve_timeout(self, host, timeout):
+        if self.adaptive_timeouts and isinstance(timeout, (int, float)):
+            return self.latency.timeout(host, timeout)
+        return timeout
+
+    def request(self, method, url, *args, **kwargs):
+        if self.cancelled is not None and self.cancelled.is_set():
+            raise ScanCancelled("Scan cancelled")
+        host = urllib.parse.urlsplit(url).netloc
+        delayed = isinstance(kwargs.get("timeout"), DelayTimeout)
+        if "timeout" in kwargs:
+            kwargs["timeout"] = self.resolve_timeout(host, kwargs["timeout"])
+        self.breaker.before(host)
+        self.governor.acquire(host)
+        start = time.monotonic()
+        try:
+            resp = super().request(method, url, *args, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            self.governor.release(host, error=True)
+            self.breaker.record_failure(host)
+            raise
+        except requests.RequestException:
+            self.governor.release(host, error=True)
+            self.breaker.release(host)
+            raise
+        except BaseException:
+            self.governor.release(host)
+            self.breaker.release(host)
+            raise
+        elapsed = None if delayed else time.monotonic() - start
+        self.governor.release(host, resp.status_code, elapsed, resp.headers)
+        self.breaker.record_success(host)
+        if not delayed:
+            self.latency.record(host, elapsed)
+        return resp
+
+
+class AsyncHTTPEngine:
+    """Asyncio request layer shared by one or more scans on the same event loop.
+
+    Uses aiohttp when installed: many requests are multiplexed over a small
+    connection pool. Without aiohttp it falls back to the scanner's blocking
+    ``requests.Session`` on a small fixed thread pool, so callers still get
+    bounded concurrency without a thread per request. If the session is a
+    GovernedSession, both paths go through its per-host RateGovernor and
+    CircuitBreaker.
+    """
+
+    def __init__(self, session, max_in_flight=ASYNC_MAX_IN_FLIGHT,
+                 max_connections=ASYNC_MAX_CONNECTIONS, use_aiohttp=None, connector=None):
+        self.session = session
+        self.max_in_flight = max_in_flight
+        self.max_connections = max_connections
+        self.connector = connector  # shared aiohttp connector (kept open on close())
+        if use_aiohttp is None:
+            try:
+                import aiohttp  # noqa: F401
+                use_aiohttp = True
+            except ImportError:
+                use_aiohttp = False
+        self.backend = "aiohttp" if use_aiohttp else "threads"
+        self._client = None
+        self._executor = None
+        self._sem = None
+
+    async def start(self):
+        self.open()
+        return self
+
+    def open(self):
+        """Create the pool; must be called from a coroutine on the owning loop."""
+        self._sem = asyncio.Semaphore(self.max_in_flight)
+        if self.backend == "aiohttp":
+            import aiohttp
+            connector = self.connector or aiohttp.TCPConnector(limit=self.max_connections,
+                                                               limit_per_host=ASYNC_MAX_PER_HOST, ssl=False)
+            self._client = aiohttp.ClientSession(
+                connector=connector,
+                connector_owner=self.connector is None,
+                headers=dict(self.session.headers),
+                cookie_jar=aiohttp.DummyCookieJar(),
+            )
+        else:
+            self._executor = ContextThreadPool(
+                max_workers=min(ASYNC_FALLBACK_THREADS, self.max_in_flight))
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def request(self, method, url, *, params=None, data=None, json_body=None,
+                      headers=None, timeout=TIMEOUT, allow_redirects=True, max_bytes=None):
+        """Send one request. With ``max_bytes`` only that much of the body is read
+        and the response is marked ``truncated`` if there was more."""
+        async with self._sem:
+            if self.backend == "aiohttp":
+                governor = getattr(self.session, "governor", None)
+                if governor is None:
+                    return await self._aiohttp_request(method, url, params, data, json_body,
+                                                       headers, timeout, allow_redirects, max_bytes)
+                import aiohttp
+                if self.session.cancelled is not None and self.session.cancelled.is_set():
+                    raise ScanCancelled("Scan cancelled")
+                breaker = self.session.breaker
+                host = urllib.parse.urlsplit(url).netloc
+                delayed = isinstance(timeout, DelayTimeout)
+                timeout = self.session.resolve_timeout(host, timeout)
+                breaker.before(host)
+                await governor.acquire_async(host)
+                try:
+                    resp = await self._aiohttp_request(method, url, params, data, json_body,
+                                                       headers, timeout, allow_redirects, max_bytes)
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    governor.release(host, error=True)
+                    breaker.record_failure(host)
+                    raise
+                except Exception:
+                    governor.release(host, error=True)
+                    breaker.release(host)
+                    raise
+                except BaseException:  # cancelled
+                    governor.release(host)
+                    breaker.release(host)
+                    raise
+                elapsed = None if delayed else resp.elapsed.total_seconds()
+                governor.release(host, resp.status_code, elapsed, resp.headers)
+                breaker.record_success(host)
+                if not delayed:
+                    self.session.latency.record(host, elapsed)
+                return resp
+            loop = asyncio.get_running_loop()
+            if max_bytes is None:
+                return await loop.run_in_executor(self._executor, lambda: self.session.request(
+                    method, url, params=params, data=data, json=json_body, headers=headers,
+                    timeout=timeout, allow_redirects=allow_redirects))
+            return await loop.run_in_executor(self._executor, lambda: self._capped_request(
+                method, url, params, data, json_body, headers, timeout, allow_redirects, max_bytes))
+
+    def _capped_request(self, method, url, params, data, json_body, headers, timeout, allow_redirects, max_bytes):
+        start = time.monotonic()
+        with self.session.request(method, url, params=params, data=data, json=json_body, headers=headers,
+                                  timeout=timeout, allow_redirects=allow_redirects, stream=True) as resp:
+            body = b""
+            truncated = False
+            chunks = resp.iter_content(max(1, min(max_bytes, 64 * 1024)))
+            for chunk in chunks:
+                body += chunk
+                if len(body) >= max_bytes:
+                    truncated = len(body) > max_bytes or bool(next(chunks, b""))
+                    break
+            result = FetchResponse(resp.url, resp.status_code, resp.headers, body[:max_bytes],
+                                   resp.encoding, time.monotonic() - start)
+        result.truncated = truncated
+        return result
+
+    async def _aiohttp_request(self, method, url, params, data, json_body, headers, timeout, allow_redirects,
+                               max_bytes=None):
+        import aiohttp
+        # Snapshot the requests cookie jar so both layers send the same session
+        cookies = {c.name: c.value for c in self.session.cookies}
+        start = time.monotonic()
+        async with self._client.request(
+            method, url, params=params, data=data, json=json_body, headers=headers,
+            cookies=cookies, allow_redirects=allow_redirects,
+            timeout=(aiohttp.ClientTimeout(sock_connect=timeout[0], sock_read=timeout[1])
+                     if isinstance(timeout, tuple) else aiohttp.ClientTimeout(total=timeout)),
+        ) as resp:
+            if max_bytes is None:
+                body = await resp.read()
+                truncated = False
+            else:
+                body = b""
+                while len(body) <= max_bytes:  # one byte past the cap tells whether there was more
+                    chunk = await resp.content.read(max_bytes + 1 - len(body))
+                    if not chunk:
+                        break
+                    body += chunk
+                truncated = len(body) > max_bytes
+                body = body[:max_bytes]
+            result = FetchResponse(str(resp.url), resp.status, resp.headers, body,
+                                   resp.charset, time.monotonic() - start)
+            result.truncated = truncated
+            return result
+
+
+class TimingOracle:
+    """Confirms time-based blind probes statistically instead of from one slow response.
+
+    Jobs are ``(key, payload, measure)``; ``measure(payload, delay)`` sends
+    the probe asking for ``delay`` seconds of delay (0 = control) and returns
+    the response time in seconds. Control latency is sampled concurrently
+    first, to size the delay unit above the host's jitter. Every job then
+    runs in parallel, interleaving control and delayed requests over
+    ``rounds`` rounds of varying delay; it is dropped at the first round
+    without a matching delay. A job is confirmed when a one-sided t-test on
+    (extra time / requested delay) rejects "no effect" at 99%, and the
+    remaining jobs for the same key are cancelled.
+    """
+
+    def __init__(self, rounds=TIMING_ROUNDS, workers=TIMING_WORKERS, max_delay=TIMING_MAX_DELAY):
+        self.rounds = max(2, rounds)
+        self.workers = workers
+        self.max_delay = max_delay
+        self.measurements = 0
+        self.unit = None
+        self._lock = threading.Lock()
+
+    def delay_unit(self, samples):
+        """Whole seconds of delay that stand clear of the control samples' spread."""
+        spread = statistics.fmean(samples) + 4 * (statistics.stdev(samples) if len(samples) > 1 else 0.0)
+        return min(self.max_delay, max(TIMING_MIN_DELAY, math.ceil(spread)))
+
+    @staticmethod
+    def t_statistic(values):
+        """One-sample t statistic of ``values`` against 0 (inf when they don't vary)."""
+        mean = statistics.fmean(values)
+        sd = statistics.stdev(values)
+        return math.inf if sd == 0 else mean / (sd / math.sqrt(len(values)))
+
+    def _measure(self, measure, payload, delay):
+        with self._lock:
+            self.measurements += 1
+        return measure(payload, delay)
+
+    def _probe(self, key, payload, measure, confirmed):
+        delays = [self.unit * (1 + i % 2) for i in range(self.rounds)]
+        extra, ratios = [], []
+        for delay in delays:
+            if key in confirmed:
+                return None
+            try:
+                control = self._measure(measure, payload, 0)
+                delayed = self._measure(measure, payload, delay)
+            except Exception:
+                return None
+            ratio = (delayed - control) / delay
+            if ratio < TIMING_MIN_RATIO:
+                return None
+            extra.append(delayed - control)
+            ratios.append(ratio)
+        t = self.t_statistic(ratios)
+        if t < T_CRITICAL_99.get(len(ratios) - 1, 2.8):
+            return None
+        with self._lock:
+            if key in confirmed:
+                return None
+            confirmed.add(key)
+        return {"delays": delays, "extra": [round(x, 2) for x in extra], "t": t}
+
+    def run(self, jobs):
+        """Return ``[(key, payload, evidence)]`` for confirmed jobs, at most one per key."""
+        jobs = list(jobs)
+        if not jobs:
+            return []
+        confirmed = set()
+        hits = []
+        with ContextThreadPool(max_workers=self.workers) as pool:
+            baseline = [pool.submit(self._measure, measure, payload, 0)
+                        for _, payload, measure in itertools.islice(itertools.cycle(jobs), TIMING_BASELINE_SAMPLES)]
+            samples = []
+            for fut in baseline:
+                try:
+                    samples.append(fut.result())
+                except Exception:
+                    pass
+            if not samples:
+                return []
+            self.unit = self.delay_unit(samples)
+            futures = {pool.submit(self._probe, key, payload, measure, confirmed): (key, payload)
+                       for key, payload, measure in jobs}
+            for fut in concurrent.futures.as_completed(futures):
+                if fut.cancelled() or not fut.result():
+                    continue
+                key, payload = futures[fut]
+                hits.append((key, payload, fut.result()))
+                for sibling, (other, _) in futures.items():
+                    if other is key:
+                        sibling.cancel()
+        return hits
+
+
+class InjectionPoint:
+    """A single injectable parameter: a form field or a URL query parameter."""
+
+    __slots__ = ("kind", "method", "url", "param", "params", "field_type", "source")
+
+    def __init__(self, kind, method, url, param, params, field_type="text", source=""):
+        self.kind = kind              # "form" or "query"
+        self.method = method          # "GET" or "POST"
+        self.url = url                # absolute action / URL without query string
+        self.param = param            # name of the parameter under test
+        self.params = params          # baseline values for every parameter sent
+        self.field_type = field_type  # input type for form fields, "query" for URL params
+        self.source = source          # page the point was discovered on
+
+    @property
+    def key(self):
+        return (self.kind, self.method, self.url, self.param, tuple(sorted(self.params)))
+
+    @property
+    def group(self):
+        """Identifies the form / URL the point belongs to."""
+        return (self.kind, self.method, self.url, tuple(sorted(self.params)))
+
+    def derive(self, param):
+        """Same request, but inject into ``param`` (added next to the originals)."""
+        return InjectionPoint(self.kind, self.method, self.url, param, self.params, self.field_type, self.source)
+
+    def request(self, payload, encoding="form", timeout=TIMEOUT, allow_redirects=True):
+        """Build a fetch() job with ``payload`` in this point's parameter."""
+        values = dict(self.params)
+        values[self.param] = payload
+        job = {"method": self.method, "url": self.url, "timeout": timeout, "allow_redirects": allow_redirects}
+        if encoding == "json":
+            job["method"] = "POST"
+            job["json_body"] = values
+        elif self.method == "POST":
+            job["data"] = values
+        else:
+            job["params"] = values
+        return job
+
+    def __repr__(self):
+        return f"<InjectionPoint {self.kind} {self.method} {self.url} [{self.param}]>"
+
+
+def _request_key(job):
+    body = {k: job[k] for k in ("params", "data", "json_body") if k in job}
+    return (job["method"], job["url"], json.dumps(body, sort_keys=True, default=str),
+            job.get("allow_redirects", True))
+
+
+class PayloadDispatcher:
+    """Runs ``(InjectionPoint, payload, detector)`` jobs concurrently under one request budget.
+
+    Jobs are sent in waves: wave *n* holds the *n*-th payload of every point
+    still under test, so each point keeps its payload order and stops at its
+    first hit while different points run in parallel. Identical requests are
+    sent once and their responses reused, including across modules.
+    ``detector(resp, payload)`` returns evidence (truthy) or None.
+    ``max_waves`` caps how many payloads each point gets; ``wave_sent[n]``
+    counts the requests sent in wave *n* over all runs.
+    """
+
+    def __init__(self, fetch_many, budget=INJECTION_REQUEST_BUDGET, max_waves=None):
+        self.fetch_many = fetch_many
+        self.budget = budget
+        self.max_waves = max_waves
+        self.wave_sent = []
+        self.sent = 0
+        self.deduped = 0
+        self.exhausted = False
+        self._memo = ResponseCache(max_entries=INJECTION_MEMO_ENTRIES)
+        self._lock = threading.Lock()
+
+    def _reserve(self, wanted):
+        with self._lock:
+            allowed = max(0, min(wanted, self.budget - self.sent))
+            self.sent += allowed
+            if allowed < wanted:
+                self.exhausted = True
+            return allowed
+
+    def run(self, jobs, stop_on_hit=True, per_group=False, encoding="form",
+            timeout=TIMEOUT, allow_redirects=True):
+        """Dispatch jobs; returns ``[(point, payload, evidence, resp), ...]`` for every hit.
+
+        With ``per_group`` a hit also stops the other fields of the same form / URL.
+        """
+        groups = OrderedDict()
+        for point, payload, detector in jobs:
+            groups.setdefault(point.key, []).append((point, payload, detector))
+
+        hits = []
+        active = list(groups)
+        wave = 0
+        while active and (self.max_waves is None or wave < self.max_waves):
+            batch = []
+            pending = {}
+            for gk in active:
+                if wave >= len(groups[gk]):
+                    continue
+                point, payload, detector = groups[gk][wave]
+                req = point.request(payload, encoding=encoding, timeout=timeout, allow_redirects=allow_redirects)
+                rk = _request_key(req)
+                batch.append((gk, point, payload, detector, rk))
+                if rk not in pending:
+                    pending[rk] = req
+            if not batch:
+                break
+
+            responses = {}
+            for rk in list(pending):
+                cached = self._memo.lookup(rk)
+                if cached is not None:
+                    responses[rk] = cached
+                    del pending[rk]
+            with self._lock:
+                self.deduped += len(batch) - len(pending)
+            keys = list(pending)[:self._reserve(len(pending))]
+            with self._lock:
+                if len(self.wave_sent) <= wave:
+                    self.wave_sent.extend([0] * (wave + 1 - len(self.wave_sent)))
+                self.wave_sent[wave] += len(keys)
+            for rk, resp in zip(keys, self.fetch_many(pending[rk] for rk in keys)):
+                if not isinstance(resp, Exception):
+                    responses[rk] = resp
+                    self._memo.store(rk, resp)
+
+            next_active = []
+            done_groups = set()
+            for gk, point, payload, detector, rk in batch:
+                if point.group in done_groups:
+                    continue
+                resp = responses.get(rk)
+                if resp is None:
+                    if not self.exhausted:
+                        next_active.append(gk)  # request failed; try the next payload
+                    continue
+                try:
+                    evidence = detector(resp, payload)
+                except Exception:
+                    evidence = None
+                if evidence:
+                    hits.append((point, payload, evidence, resp))
+                    if per_group:
+                        done_groups.add(point.group)
+                    if stop_on_hit:
+                        continue
+                next_active.append(gk)
+            if done_groups:
+                next_active = [gk for gk in next_active if groups[gk][0][0].group not in done_groups]
+            active = next_active
+            wave += 1
+        return hits
+
+    def stats(self):
+        with self._lock:
+            return {"requests": self.sent, "deduped": self.deduped,
+                    "budget": self.budget, "budget_exhausted": self.exhausted,
+                    "max_waves": self.max_waves}
+
+
+FINDING_URL_RE = re.compile(r"https?://[^\s'\"<>()]+")
+
+
+def page_validators(resp):
+    """ETag, Last-Modified and body hash of a page, for --baseline revalidation."""
+    return {"etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified"),
+            "sha1": hashlib.sha1(resp.content).hexdigest()}
+
+
+class ScanCheckpoint:
+    """On-disk snapshot of a scan in progress, for ``--resume``.
+
+    Holds the scanner state later phases build on (crawled URLs, forms,
+    fingerprints, findings), the phases that completed and per-module
+    cursors. Saved as gzipped JSON through a temp file and a rename, so a
+    scan killed mid-write keeps the previous checkpoint.
+    """
+
+    VERSION = 1
+    FIELDS = ("discovered_forms", "tech_stack", "dns_records", "whois_info", "cve_data", "subdomains",
+              "open_redirect_results", "fuzz_results", "sensitive_findings", "broken_links", "page_validators")
+
+    def __init__(self, path, every=CHECKPOINT_EVERY):
+        self.path = path
+        self.every = every
+        self.completed = set()
+        self.cursors = {}
+        self._saved_at = 0
+        self._lock = threading.Lock()
+
+    def due(self, requests_sent):
+        """True once ``every`` requests went out since the last save."""
+        return requests_sent - self._saved_at >= self.every
+
+    def save(self, scanner, requests_sent=0):
+        with scanner._lock:
+            state = {
+                "version": self.VERSION,
+                "target": scanner.target_url,
+                "completed": sorted(self.completed),
+                "cursors": dict(self.cursors),
+                "discovered_urls": sorted(scanner.discovered_urls),
+                "findings": [f.to_dict() for f in scanner.findings],
+                **{name: getattr(scanner, name) for name in self.FIELDS},
+            }
+            data = json.dumps(state, default=str, separators=(",", ":"))
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with gzip.open(tmp, "wt", encoding="utf-8") as fh:
+                fh.write(data)
+            os.replace(tmp, self.path)
+            self._saved_at = requests_sent
+
+    @classmethod
+    def load(cls, path):
+        """Parsed checkpoint state; ValueError if it is missing or unreadable."""
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as fh:
+                state = json.load(fh)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Cannot read checkpoint {path}: {e}")
+        if not isinstance(state, dict) or state.get("version") != cls.VERSION:
+            raise ValueError(f"Unsupported checkpoint format: {path}")
+        return state
+
+
+class PlanMeter:
+    """Requests a dry-run module makes, and the round trips they would take.
+
+    Blocking requests are spread over the threads that issued them; each
+    bulk ``fetch_many`` batch takes ``ceil(n / concurrency)`` round trips.
+    """
+
+    def __init__(self, concurrency):
+        self.concurrency = max(1, concurrency)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.requests = 0
+        self._blocking = 0
+        self._batch_rounds = 0
+        self._threads = set()
+
+    def blocking(self):
+        with self._lock:
+            self.requests += 1
+            self._blocking += 1
+            self._threads.add(threading.get_ident())
+
+    def batch(self, count, limit=None):
+        width = min(limit or self.concurrency, self.concurrency)
+        with self._lock:
+            self.requests += count
+            self._batch_rounds += math.ceil(count / width)
+
+    def rounds(self):
+        with self._lock:
+            return self._batch_rounds + math.ceil(self._blocking / max(1, len(self._threads)))
+
+
+class DryRunSession(requests.Session):
+    """Session that sends nothing: every request is counted and answered with an empty 404."""
+
+    def __init__(self, meter):
+        super().__init__()
+        self.meter = meter
+
+    def request(self, method, url, *args, **kwargs):
+        self.meter.blocking()
+        resp = requests.Response()
+        resp.status_code = 404
+        resp.reason = "Not Found"
+        resp.url = url
+        resp.encoding = "utf-8"
+        resp._content = b""
+        resp._content_consumed = True
+        resp.elapsed = timedelta(0)
+        return resp
+
+
+class ScanPlan:
+    """Estimated cost of the modules left after discovery, and what fits a budget (``--plan``).
+
+    ``modules`` maps a phase id to ``{"requests", "rounds", "seconds",
+    "waves", "method"}``: requests and round trips outside payload waves,
+    fixed seconds (timeouts, API rate limits) and one ``(requests, rounds)``
+    pair per payload wave the module's injection jobs reach. A module takes
+    its round trips times ``latency`` plus its fixed seconds; ``depth``
+    keeps only the first payload waves of every module.
+    """
+
+    def __init__(self, modules, deps, latency, workers=PHASE_WORKERS, max_rps=0, discovery=None):
+        self.modules = modules
+        self.deps = deps
+        self.latency = latency
+        self.workers = max(1, int(workers))
+        self.max_rps = max_rps
+        self.discovery = discovery or {"requests": 0, "seconds": 0.0}
+        self.selected = list(modules)
+        self.depth = None
+        self.budget = {"requests": None, "seconds": None}
+
+    @property
+    def max_depth(self):
+        return max((len(m["waves"]) for m in self.modules.values()), default=0)
+
+    def cost(self, phase_id, depth=None):
+        """``(requests, seconds)`` of one module with payloads limited to ``depth`` waves."""
+        m = self.modules[phase_id]
+        waves = m["waves"] if depth is None else m["waves"][:depth]
+        requests_ = m["requests"] + sum(n for n, _ in waves)
+        seconds = (m["rounds"] + sum(r for _, r in waves)) * self.latency + m["seconds"]
+        if self.max_rps:
+            seconds = max(seconds, requests_ / self.max_rps)
+        return requests_, seconds
+
+    def wall_seconds(self, selected, depth=None):
+        """Elapsed time of ``selected`` run as a dependency graph on ``workers`` threads."""
+        selected = set(selected)
+        free = [0.0] * self.workers
+        done = {}
+        pending = [pid for pid in self.modules if pid in selected]
+        while pending:
+            ready = [pid for pid in pending
+                     if all(d in done or d not in selected for d in self.deps.get(pid, ()))]
+            if not ready:
+                break
+            pid = ready[0]
+            slot = free.index(min(free))
+            start = max([free[slot]] + [done[d] for d in self.deps.get(pid, ()) if d in done])
+            done[pid] = free[slot] = start + self.cost(pid, depth)[1]
+            pending.remove(pid)
+        return max(done.values(), default=0.0)
+
+    def select(self, max_requests=None, max_seconds=None, priority=MODULE_PRIORITY):
+        """Pick the modules and payload depth (None = every wave) that fit the budgets.
+
+        Payload depth is lowered first; if even one payload per point is too
+        much, modules are taken in ``priority`` order while they still fit.
+        """
+        def fits(mods, depth):
+            if max_requests is not None and sum(self.cost(p, depth)[0] for p in mods) > max_requests:
+                return False
+            return max_seconds is None or self.wall_seconds(mods, depth) <= max_seconds
+
+        self.budget = {"requests": max_requests, "seconds": max_seconds}
+        everything = list(self.modules)
+        top = self.max_depth
+        for depth in (range(top, 0, -1) if top else [0]):
+            if fits(everything, depth):
+                self.selected, self.depth = everything, (None if depth == top else depth)
+                return self.selected, self.depth
+        depth = min(1, top)
+        rank = {pid: i for i, pid in enumerate(priority)}
+        chosen = set()
+        for pid in sorted(everything, key=lambda p: rank.get(p, len(rank))):
+            if fits(chosen | {pid}, depth):
+                chosen.add(pid)
+        self.selected, self.depth = [p for p in everything if p in chosen], (None if depth == top else depth)
+        return self.selected, self.depth
+
+    def to_dict(self):
+        modules = {}
+        for pid, m in self.modules.items():
+            requests_, seconds = self.cost(pid, self.depth)
+            modules[pid] = {"requests": requests_, "seconds": round(seconds, 2), "method": m["method"],
+                            "payload_waves": len(m["waves"]), "selected": pid in self.selected}
+            if m.get("error"):
+                modules[pid]["error"] = m["error"]
+        return {
+            "latency_ms": round(self.latency * 1000),
+            "discovery": self.discovery,
+            "budget": {k: v if v is None else round(v, 1) for k, v in self.budget.items()},
+            "payload_depth": self.depth,
+            "selected": list(self.selected),
+            "estimated_requests": sum(self.cost(p, self.depth)[0] for p in self.selected),
+            "estimated_seconds": round(self.wall_seconds(self.selected, self.depth), 1),
+            "modules": modules,
+        }
+
+    def format(self):
+        """Plain-text table for ``--plan`` and the text report."""
+        data = self.to_dict()
+        lines = [f"  {'MODULE':<16}{'REQUESTS':>10}{'EST. TIME':>12}  {'METHOD':<9}RUN"]
+        for pid, m in data["modules"].items():
+            lines.append(f"  {pid:<16}{m['requests']:>10}{m['seconds']:>11.1f}s  {m['method']:<9}"
+                         f"{'yes' if m['selected'] else 'no'}")
+        lines.append(f"  Discovery: {data['discovery']['requests']} requests in {data['discovery']['seconds']}s; "
+                     f"selected modules: ~{data['estimated_requests']} requests, "
+                     f"~{data['estimated_seconds']:g}s at {data['latency_ms']} ms per round trip")
+        if data["payload_depth"] is not None:
+            lines.append(f"  Payloads limited to the first {data['payload_depth']} per injection point")
+        return "\n".join(lines)
+
+
+class LookupCache:
+    """Persistent cache for slow external lookups (NVD, WHOIS, DNS), shared across scans.
+
+    Values are JSON in a SQLite file under ``directory``, with a TTL per
+    source and a global entry limit (expired rows go first, then the
+    oldest). WAL mode plus a busy timeout let concurrent scanner processes
+    share the file. ``directory=None`` disables caching; the hit/miss
+    counters still work so the report shape doesn't change.
+    """
+
+    EVICT_EVERY = 200  # writes between eviction passes
+
+    def __init__(self, directory=CACHE_DIR, ttls=None, max_entries=LOOKUP_CACHE_MAX_ENTRIES):
+        self.directory = directory
+        self.path = os.path.join(directory, "lookups.sqlite") if directory else None
+        self.ttls = dict(LOOKUP_CACHE_TTLS, **(ttls or {}))
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counts = defaultdict(lambda: {"hits": 0, "misses": 0})
+        self._writes = 0
+        self._broken = False
+        self._flights = {}
+
+    @property
+    def enabled(self):
+        return self.path is not None and not self._broken
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(self.directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=10000")
+            conn.execute("CREATE TABLE IF NOT EXISTS lookups (source TEXT, key TEXT, value TEXT, "
+                         "stored REAL, expires REAL, PRIMARY KEY (source, key))")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_lookups_stored ON lookups (stored)")
+            self._local.conn = conn
+        return conn
+
+    def single_flight(self, source, key):
+        """Lock for one entry: scans sharing this cache hold it around get-or-compute,
+        so concurrent scans of the same banner or apex look it up only once."""
+        with self._lock:
+            lock = self._flights.get((source, key))
+            if lock is None:
+                lock = self._flights[(source, key)] = threading.Lock()
+        return lock
+
+    def _count(self, source, hit):
+        with self._lock:
+            self._counts[source]["hits" if hit else "misses"] += 1
+
+    def get(self, source, key):
+        """Return the cached value, or None on a miss / expired entry."""
+        value = None
+        if self.enabled:
+            try:
+                row = self._conn().execute(
+                    "SELECT value FROM lookups WHERE source = ? AND key = ? AND expires > ?",
+                    (source, key, time.time())).fetchone()
+                value = json.loads(row[0]) if row else None
+            except (sqlite3.Error, OSError, ValueError):
+                self._broken = True
+        self._count(source, value is not None)
+        return value
+
+    def set(self, source, key, value, ttl=None):
+        if not self.enabled:
+            return
+        now = time.time()
+        ttl = self.ttls.get(source, 3600) if ttl is None else ttl
+        try:
+            conn = self._conn()
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO lookups VALUES (?, ?, ?, ?, ?)",
+                             (source, key, json.dumps(value), now, now + ttl))
+            with self._lock:
+                self._writes += 1
+                evict = self._writes % self.EVICT_EVERY == 0
+            if evict:
+                self.evict()
+        except (sqlite3.Error, OSError, TypeError, ValueError):
+            self._broken = True
+
+    def evict(self):
+        """Drop expired rows, then the oldest rows beyond ``max_entries``."""
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM lookups WHERE expires <= ?", (time.time(),))
+            conn.execute("DELETE FROM lookups WHERE rowid IN (SELECT rowid FROM lookups "
+                         "ORDER BY stored DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+
+    def stats(self):
+        with self._lock:
+            sources = {src: dict(c, hit_rate=round(c["hits"] / max(c["hits"] + c["misses"], 1), 3))
+                       for src, c in self._counts.items()}
+        hits = sum(c["hits"] for c in sources.values())
+        misses = sum(c["misses"] for c in sources.values())
+        return {"enabled": self.enabled, "hits": hits, "misses": misses,
+                "hit_rate": round(hits / max(hits + misses, 1), 3), "sources": sources}
+
+
+def _version_key(version):
+    return tuple(int(n) for n in re.findall(r"\d+", version))
+
+
+def _iter_cpe_matches(nodes):
+    """Flatten NVD configuration nodes (API 2.0 ``cpeMatch`` or 1.1 feed ``cpe_match``)."""
+    for node in nodes or []:
+        for match in node.get("cpeMatch", node.get("cpe_match", [])):
+            yield match
+        yield from _iter_cpe_matches(node.get("children"))
+
+
+class CVEIndex:
+    """Local CVE store in SQLite, built from NVD JSON feeds.
+
+    Accepts NVD API 2.0 dumps (``{"vulnerabilities": [...]}``) and legacy
+    1.1 feed files (``{"CVE_Items": [...]}``), optionally gzipped. Each
+    vulnerable CPE match is stored as a row keyed by product, with its
+    version or version range, so a lookup is one indexed query plus a
+    version comparison in Python.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cves (
+            id TEXT PRIMARY KEY, score REAL, description TEXT);
+        CREATE TABLE IF NOT EXISTS cpe_matches (
+            product TEXT, vendor TEXT, version TEXT,
+            start_incl TEXT, start_excl TEXT, end_incl TEXT, end_excl TEXT,
+            cve_id TEXT);
+        CREATE INDEX IF NOT EXISTS idx_cpe_product ON cpe_matches (product);
+        CREATE INDEX IF NOT EXISTS idx_cpe_cve ON cpe_matches (cve_id);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+    """
+
+    def __init__(self, path=CVE_DB_PATH):
+        self.path = path
+
+    def exists(self):
+        return os.path.isfile(self.path)
+
+    def _connect(self):
+        return sqlite3.connect(self.path)
+
+    # ── import ──
+    @staticmethod
+    def _load_feed(path):
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as fh:
+            return json.load(fh)
+
+    @staticmethod
+    def _parse_items(feed):
+        """Yield ``(cve_id, score, description, cpe_matches)`` from either feed format."""
+        for item in feed.get("vulnerabilities", []):
+            cve = item.get("cve", {})
+            metrics = cve.get("metrics", {})
+            score = None
+            for key in ("cvssMetricV31", "cvssMetricV30", "cvssMetricV2"):
+                if metrics.get(key):
+                    score = metrics[key][0].get("cvssData", {}).get("baseScore")
+                    break
+            desc = next((d["value"] for d in cve.get("descriptions", []) if d.get("lang") == "en"), "")
+            nodes = [n for conf in cve.get("configurations", []) for n in conf.get("nodes", [])]
+            matches = [(m.get("criteria", ""), m) for m in _iter_cpe_matches(nodes)]
+            yield cve.get("id", ""), score, desc, matches
+
+        for item in feed.get("CVE_Items", []):
+            cve = item.get("cve", {})
+            impact = item.get("impact", {})
+            score = (impact.get("baseMetricV3", {}).get("cvssV3", {}).get("baseScore")
+                     or impact.get("baseMetricV2", {}).get("cvssV2", {}).get("baseScore"))
+            desc = next((d["value"] for d in cve.get("description", {}).get("description_data", [])
+                         if d.get("lang") == "en"), "")
+            nodes = item.get("configurations", {}).get("nodes", [])
+            matches = [(m.get("cpe23Uri", ""), m) for m in _iter_cpe_matches(nodes)]
+            yield cve.get("CVE_data_meta", {}).get("ID", ""), score, desc, matches
+
+    def import_feeds(self, paths, log=print):
+        """Load feed files into the index (re-importing a CVE replaces it); returns totals."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        totals = {"cves": 0, "cpe_matches": 0}
+        conn = self._connect()
+        try:
+            conn.executescript(self.SCHEMA)
+            for path in paths:
+                feed = self._load_feed(path)
+                cves = matches = 0
+                for cve_id, score, desc, cpe_matches in self._parse_items(feed):
+                    if not cve_id:
+                        continue
+                    conn.execute("INSERT OR REPLACE INTO cves VALUES (?, ?, ?)",
+                                 (cve_id, float(score) if score is not None else None, desc[:1000]))
+                    conn.execute("DELETE FROM cpe_matches WHERE cve_id = ?", (cve_id,))
+                    rows = []
+                    for cpe, m in cpe_matches:
+                        parts = cpe.split(":")
+                        if len(parts) < 6 or not m.get("vulnerable", True) or parts[2] != "a":
+                            continue
+                        rows.append((parts[4].lower(), parts[3].lower(), parts[5],
+                                     m.get("versionStartIncluding"), m.get("versionStartExcluding"),
+                                     m.get("versionEndIncluding"), m.get("versionEndExcluding"), cve_id))
+                    conn.executemany("INSERT INTO cpe_matches VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                    cves += 1
+                    matches += len(rows)
+                conn.commit()
+                log(f"  {path}: {cves} CVEs, {matches} CPE matches")
+                totals["cves"] += cves
+                totals["cpe_matches"] += matches
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('imported_at', ?)", (datetime.now().isoformat(),))
+            conn.commit()
+        finally:
+            conn.close()
+        return totals
+
+    # ── lookup ──
+    @staticmethod
+    def _affects(row, version):
+        exact, start_incl, start_excl, end_incl, end_excl = row
+        v = _version_key(version)
+        if exact not in ("*", "-", ""):
+            return _version_key(exact) == v
+        if not any((start_incl, start_excl, end_incl, end_excl)):
+            return False  # "all versions" entries are too noisy to report
+        if start_incl and v < _version_key(start_incl):
+            return False
+        if start_excl and v <= _version_key(start_excl):
+            return False
+        if end_incl and v > _version_key(end_incl):
+            return False
+        if end_excl and v >= _version_key(end_excl):
+            return False
+        return True
+
+    def lookup(self, product, version, min_score=CVE_MIN_SCORE, limit=CVE_MAX_PER_PRODUCT):
+        """CVEs affecting ``product`` at ``version``, highest score first.
+
+        Aliased products are matched on vendor too; other names on the CPE product alone.
+        """
+        if not version:
+            return []
+        name = product.lower()
+        vendor, name = CPE_PRODUCT_ALIASES.get(name, (None, name))
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT m.version, m.start_incl, m.start_excl, m.end_incl, m.end_excl, "
+                "c.id, c.score, c.description FROM cpe_matches m JOIN cves c ON c.id = m.cve_id "
+                "WHERE m.product = ? AND (? IS NULL OR m.vendor = ?) AND c.score >= ?",
+                (name, vendor, vendor, min_score)).fetchall()
+        finally:
+            conn.close()
+        found = {}
+        for row in rows:
+            if row[5] not in found and self._affects(row[:5], version):
+                found[row[5]] = {"cve_id": row[5], "cvss_score": row[6], "description": row[7]}
+        return sorted(found.values(), key=lambda c: (-c["cvss_score"], c["cve_id"]))[:limit]
+
+
+def parse_ports(spec):
+    """Parse a port spec like ``"22,80,8000-8100"`` into a sorted list."""
+    ports = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        lo, _, hi = part.partition("-")
+        lo, hi = int(lo), int(hi or lo)
+        if not (1 <= lo <= hi <= 65535):
+            raise ValueError(f"invalid port range: {part}")
+        ports.update(range(lo, hi + 1))
+    if not ports:
+        raise ValueError("no ports given")
+    return sorted(ports)
+
+
+def format_ports(ports):
+    """Inverse of parse_ports: ``[22, 80, 81, 82]`` -> ``"22,80-82"`` (keeps nmap's -p argument short)."""
+    parts = []
+    for _, run in itertools.groupby(enumerate(sorted(set(ports))), lambda ip: ip[1] - ip[0]):
+        run = [p for _, p in run]
+        parts.append(str(run[0]) if len(run) == 1 else f"{run[0]}-{run[-1]}")
+    return ",".join(parts)
+
+
+async def tcp_connect_scan(host, ports, concurrency=PORT_SCAN_CONCURRENCY, timeout=PORT_TIMEOUT, on_open=None,
+                           cancelled=None):
+    """Concurrent TCP connect scan; returns open ports, calling ``on_open(port)`` as each is found.
+
+    Once the optional ``cancelled`` Event is set, ports still waiting for a
+    slot are skipped.
+    """
+    loop = asyncio.get_running_loop()
+    infos = await loop.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+    address = infos[0][4][0]  # resolve once instead of per connection
+    sem = asyncio.Semaphore(max(1, concurrency))
+    open_ports = []
+
+    async def probe(port):
+        async with sem:
+            if cancelled is not None and cancelled.is_set():
+                return
+            try:
+                _, writer = await asyncio.wait_for(asyncio.open_connection(address, port), timeout)
+            except (OSError, asyncio.TimeoutError):
+                return
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+        open_ports.append(port)
+        if on_open is not None:
+            on_open(port)
+
+    await asyncio.gather(*(probe(p) for p in ports))
+    return sorted(open_ports)
+
+
+def iter_wordlist(path):
+    """Yield entries of a wordlist file one line at a time (blanks and # comments skipped)."""
+    with open(path, encoding="utf-8", errors="ignore") as fh:
+        for line in fh:
+            word = line.strip()
+            if word and not word.startswith("#"):
+                yield word
+
+
+def read_targets(source):
+    """Target URLs from a file, or stdin for ``-``; https:// is assumed, duplicates dropped."""
+    lines = (line.strip() for line in sys.stdin) if source == "-" else iter_wordlist(source)
+    targets = []
+    for line in lines:
+        if not line or line.startswith("#"):
+            continue
+        url = line if re.match(r"^https?://", line, re.I) else f"https://{line}"
+        if url not in targets:
+            targets.append(url)
+    return targets
+
+
+class DNSResolverPool:
+    """Concurrent A/AAAA/CNAME lookups on a thread pool (requires dnspython).
+
+    Every worker thread keeps its own ``dns.resolver.Resolver``. All record
+    types for a name are looked up by the same task, and an NXDOMAIN on the
+    A query skips the rest. ``resolve_many`` pulls names lazily and keeps a
+    bounded window in flight, so it can consume a generator over a huge
+    wordlist without holding it in memory.
+    """
+
+    RECORD_TYPES = ("A", "AAAA", "CNAME")
+
+    def __init__(self, nameservers=None, workers=DNS_WORKERS, lifetime=DNS_LIFETIME, cache=None):
+        import dns.resolver
+        self._dns = dns.resolver
+        self.cache = cache
+        self.nameservers = list(nameservers or [])
+        self.workers = max(1, workers)
+        self.lifetime = lifetime
+        self._local = threading.local()
+
+    def _resolver(self):
+        resolver = getattr(self._local, "resolver", None)
+        if resolver is None:
+            resolver = self._dns.Resolver(configure=not self.nameservers)
+            if self.nameservers:
+                resolver.nameservers = self.nameservers
+            resolver.lifetime = self.lifetime
+            self._local.resolver = resolver
+        return resolver
+
+    def lookup(self, fqdn):
+        """Return ``{"A": [...], "AAAA": [...], "CNAME": target or None}``."""
+        cache_key = f"{','.join(self.nameservers)}|{fqdn}"
+        if self.cache is not None:
+            cached = self.cache.get("dns", cache_key)
+            if cached is not None:
+                return cached
+        resolver = self._resolver()
+        records = {"A": [], "AAAA": [], "CNAME": None}
+        complete = True  # only definitive answers are cached, not timeouts
+        for rtype in self.RECORD_TYPES:
+            try:
+                answers = resolver.resolve(fqdn, rtype, lifetime=self.lifetime)
+            except self._dns.NXDOMAIN:
+                break
+            except self._dns.NoAnswer:
+                continue
+            except Exception:
+                complete = False
+                continue
+            if rtype == "CNAME":
+                records["CNAME"] = str(answers[0].target).rstrip(".").lower()
+            else:
+                records[rtype] = [r.to_text() for r in answers]
+        if self.cache is not None and complete:
+            self.cache.set("dns", cache_key, records)
+        return records
+
+    def resolve_many(self, names):
+        """Yield ``(fqdn, records)`` as lookups complete."""
+        names = iter(names)
+        with ContextThreadPool(max_workers=self.workers) as pool:
+            def submit(batch):
+                return {pool.submit(lambda n=n: (n, self.lookup(n))) for n in batch}
+
+            pending = submit(itertools.islice(names, self.workers * 4))
+            while pending:
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                pending |= submit(itertools.islice(names, len(done)))
+                for fut in done:
+                    try:
+                        yield fut.result()
+                    except Exception:
+                        pass
+
+
+# (name, regex, severity) — compiled together by SecretScanner
+SECRET_RULES = [
+    ("AWS Access Key",        r"AKIA[0-9A-Z]{16}",                                                    "CRITICAL"),
+    ("Private Key",           r"-----BEGIN\s+(?:RSA\s+|EC\s+|DSA\s+|OPENSSH\s+)?PRIVATE KEY-----",   "CRITICAL"),
+    ("DB Connection String",  r"(?i:(?:mysql|postgresql|postgres|mongodb|redis):\/\/[^:]+:[^@\s]+@)", "CRITICAL"),
+    ("Google API Key",        r"AIza[0-9A-Za-z_\-]{35}",                                              "HIGH"),
+    ("Slack Token",           r"xox[baprs]-[0-9a-zA-Z\-]{10,}",                                       "HIGH"),
+    ("Bearer Token",          r"Bearer\s+[a-zA-Z0-9_\-\.]{20,}",                                      "HIGH"),
+    ("API Key in source",     r"(?i:(?:api[_\-]?key|apikey)\s*[:=]\s*['\"][a-zA-Z0-9_\-]{20,}['\"])", "HIGH"),
+    ("Hardcoded Password",    r"(?i:(?:password|passwd|pwd)\s*[:=]\s*['\"][^'\"]{6,}['\"])",           "HIGH"),
+    ("JWT Token",             r"eyJ[a-zA-Z0-9_-]+\.[a-zA-Z0-9_-]+\.[a-zA-Z0-9_-]*",                  "MEDIUM"),
+    ("Internal IP",           r"(?<!\d)(?:10\.\d{1,3}\.\d{1,3}\.\d{1,3}|172\.(?:1[6-9]|2\d|3[01])\.\d{1,3}\.\d{1,3}|192\.168\.\d{1,3}\.\d{1,3})(?!\d)", "MEDIUM"),
+    # The lookbehind anchors matches at the start of a word run, which keeps
+    # long base64 / identifier runs in minified bundles from going quadratic
+    ("Email Address",         r"(?<![a-zA-Z0-9._%+\-])[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}", "INFO"),
+]
+
+
+class SecretScanner:
+    """Single-pass secret detection over a stream of body chunks.
+
+    All rules are compiled into one alternation. Bytes are decoded
+    incrementally and only the last ``overlap`` characters are carried
+    between chunks, so memory stays at roughly one chunk plus the overlap
+    however large the resource is. A few already-scanned characters stay in
+    front of the window so lookbehinds see what preceded it (``110.0.0.1``
+    is not ``10.0.0.1``). Matches longer than ``overlap`` may be
+    truncated. A match of one rule is also checked for other rules inside
+    it (e.g. a JWT inside a Bearer header), since the alternation itself
+    never reports overlapping matches.
+    """
+
+    def __init__(self, rules=SECRET_RULES, overlap=SECRET_OVERLAP_CHARS):
+        self.rules = rules
+        self.overlap = overlap
+        self._combined = re.compile("|".join(f"(?P<r{i}>{rx})" for i, (_, rx, _) in enumerate(rules)))
+        self._each = [re.compile(rx) for _, rx, _ in rules]
+
+    def scan_text(self, text, first_only=True):
+        return list(self.scan_chunks([text], first_only=first_only))
+
+    def scan_chunks(self, chunks, encoding="utf-8", first_only=True):
+        """Yield ``(name, severity, offset, match)`` for bytes or str chunks.
+
+        Offsets are character offsets into the decoded body. With
+        ``first_only`` each rule is reported once and reading stops as
+        soon as every rule has fired.
+        """
+        try:
+            decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        seen = set()
+        buf, buf_start, consumed, pos = "", 0, 0, 0
+        chunks = iter(chunks)
+        final = False
+        while not final:
+            chunk = next(chunks, None)
+            if chunk is None:
+                final = True
+                buf += decoder.decode(b"", final=True)
+            else:
+                buf += chunk if isinstance(chunk, str) else decoder.decode(chunk)
+            # Matches starting inside the trailing overlap wait for the next chunk
+            limit = len(buf) if final else max(len(buf) - self.overlap, 0)
+            for m in self._combined.finditer(buf, pos):
+                if m.start() >= limit:
+                    break
+                if buf_start + m.start() < consumed:
+                    continue
+                consumed = max(consumed, buf_start + m.end())
+                for hit in self._hits(m, buf_start, seen, first_only):
+                    yield hit
+                if first_only and len(seen) == len(self.rules):
+                    return
+            # Keep some context before the next window: finditer(pos=) lets lookbehinds see it
+            cut = max(limit - SECRET_CONTEXT_CHARS, 0)
+            buf = buf[cut:]
+            buf_start += cut
+            pos = limit - cut
+
+    def _hits(self, m, buf_start, seen, first_only):
+        idx = int(m.lastgroup[1:])
+        span = m.group()
+        found = [(idx, buf_start + m.start(), span)]
+        for j, rx in enumerate(self._each):
+            if j != idx and not (first_only and j in seen):
+                inner = rx.search(span)
+                if inner:
+                    found.append((j, buf_start + m.start() + inner.start(), inner.group()))
+        for j, offset, text in found:
+            if first_only:
+                if j in seen:
+                    continue
+                seen.add(j)
+            name, _, severity = self.rules[j]
+            yield name, severity, offset, text
+
+
+def fold_body(resp):
+    """Lower-cased response text, computed once per response and reused by every detector."""
+    folded = getattr(resp, "_tupisec_folded", None)
+    if folded is None:
+        folded = resp.text.lower()
+        try:
+            resp._tupisec_folded = folded
+        except AttributeError:
+            pass
+    return folded
+
+
+def simhash(text):
+    """64-bit simhash over the word tokens of ``text``."""
+    weights = [0] * 64
+    for token in set(re.findall(r"\w+", text.lower())):
+        h = int.from_bytes(hashlib.md5(token.encode()).digest()[:8], "big")
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+class SoftNotFoundProfile:
+    """How a host answers paths that don't exist, learned from random probes.
+
+    Each probe is reduced to status, body length, a simhash and digest of the
+    body and the redirect target, with the random probe path removed so pages
+    that echo the requested URL still match. ``is_soft_404()`` then says
+    whether a response looks like that "not found" answer: a body must be
+    about as long *and* have a close simhash (the same digest when there are
+    no words to hash), so small real files on a host with a short error page
+    are kept.
+    """
+
+    def __init__(self, samples):
+        self.fingerprints = [self._fingerprint(resp, token) for token, resp in samples]
+
+    @staticmethod
+    def _strip(text, path):
+        if path:
+            path = path.strip("/")
+            text = text.replace(path, "").replace(urllib.parse.quote(path), "")
+        return text
+
+    @classmethod
+    def _fingerprint(cls, resp, path):
+        body = cls._strip(resp.text, path)
+        return {"status": resp.status_code, "length": len(body), "simhash": simhash(body),
+                "sha1": hashlib.sha1(body.encode()).hexdigest(),
+                "location": cls._strip(resp.headers.get("Location", ""), path)}
+
+    @property
+    def catch_all(self):
+        """True when nonexistent paths don't get a 404/410, so every probe would look like a hit."""
+        return bool(self.fingerprints) and all(fp["status"] not in (404, 410) for fp in self.fingerprints)
+
+    @property
+    def statuses(self):
+        return sorted({fp["status"] for fp in self.fingerprints})
+
+    def is_soft_404(self, resp, path=None):
+        """True if ``resp`` (for ``path``) matches the host's not-found fingerprint."""
+        status = resp.status_code
+        candidates = [fp for fp in self.fingerprints if fp["status"] == status]
+        if not candidates:
+            return False
+        if status in (404, 410):
+            return True
+        if 300 <= status < 400:
+            location = self._strip(resp.headers.get("Location", ""), path)
+            return any(fp["location"] == location for fp in candidates)
+        body = self._strip(resp.text, path)
+        digest = simhash(body)
+        for fp in candidates:
+            if abs(len(body) - fp["length"]) > max(32, fp["length"] // 50):
+                continue
+            if not digest or not fp["simhash"]:  # no words on one side: only the same body matches
+                if hashlib.sha1(body.encode()).hexdigest() == fp["sha1"]:
+                    return True
+            elif bin(digest ^ fp["simhash"]).count("1") <= SOFT_404_MAX_DISTANCE:
+                return True
+        return False
+
+
+class PatternMatcher:
+    """Finds any of a fixed set of literal indicators in a body with one regex pass.
+
+    The indicators are compiled once into a single alternation (longest first);
+    by default matching is case-insensitive against ``fold_body()``, so each
+    response is lower-cased at most once no matter how many matchers run on it.
+    Methods accept a response object or a plain string.
+    """
+
+    def __init__(self, patterns, ignore_case=True):
+        self.ignore_case = ignore_case
+        self.patterns = list(dict.fromkeys(patterns))
+        self._lookup = {(p.lower() if ignore_case else p): p for p in self.patterns}
+        needles = sorted(self._lookup, key=len, reverse=True)
+        alternation = "|".join(re.escape(n) for n in needles)
+        self._regex = re.compile(alternation)
+        # Zero-width lookahead lets find_all() report matches that overlap
+        self._overlapping = re.compile(f"(?=({alternation}))")
+        # Shorter needles hidden inside a longer one that matched at the same offset
+        self._inner = {n: [(m, n.index(m)) for m in needles if m != n and m in n] for n in needles}
+
+    def _text(self, body):
+        if isinstance(body, str):
+            return body.lower() if self.ignore_case else body
+        return fold_body(body) if self.ignore_case else body.text
+
+    def search(self, body):
+        """Return ``(pattern, offset)`` for the earliest indicator in ``body``, or None."""
+        m = self._regex.search(self._text(body))
+        return (self._lookup[m.group()], m.start()) if m else None
+
+    def find_all(self, body):
+        """Return ``{pattern: first_offset}`` for every indicator present in ``body``."""
+        found = {}
+        for m in self._overlapping.finditer(self._text(body)):
+            needle = m.group(1)
+            for n, delta in [(needle, 0)] + self._inner[needle]:
+                pattern, offset = self._lookup[n], m.start() + delta
+                found[pattern] = min(found.get(pattern, offset), offset)
+        return found
+
+    def first(self, body):
+        """Return just the earliest matching indicator, or None."""
+        hit = self.search(body)
+        return hit[0] if hit else None
+
+
+# Tag → attribute pairs checked for resources loaded over plain HTTP
+MIXED_ACTIVE_TAGS = {"script": "src", "iframe": "src", "object": "data", "embed": "src"}
+MIXED_PASSIVE_TAGS = {"img": "src", "audio": "src", "video": "src", "source": "src", "link": "href"}
+LINK_TAGS = ("a", "form", "script", "link", "img", "iframe")
+
+
+def extract_page(soup):
+    """Collect everything the modules need from a parsed page in one tree walk.
+
+    Returns a dict with raw (un-joined) ``links`` as ``(tag, ref)`` pairs,
+    ``forms`` (action, method, autocomplete, inputs and the ``fields`` schema
+    stored in ``discovered_forms``), ``scripts``, ``generator``,
+    ``mixed_content`` as ``(tag, url, "active"|"passive")`` and
+    ``inline_style_http``.
+    """
+    info = {
+        "links": [],
+        "forms": [],
+        "scripts": [],
+        "generator": None,
+        "mixed_content": [],
+        "inline_style_http": False,
+    }
+    for tag in soup.find_all(True):
+        name = tag.name
+        if name in LINK_TAGS:
+            ref = tag.get("href") or tag.get("src") or tag.get("action") or ""
+            if ref:
+                info["links"].append((name, ref))
+        if name == "script" and tag.get("src"):
+            info["scripts"].append(tag.get("src"))
+        elif name == "meta" and info["generator"] is None and (tag.get("name") or "").lower() == "generator":
+            info["generator"] = tag.get("content", "")
+        elif name == "style" and tag.string and "http://" in tag.string:
+            info["inline_style_http"] = True
+        elif name == "form":
+            info["forms"].append(_extract_form(tag))
+
+        for tags, kind in ((MIXED_ACTIVE_TAGS, "active"), (MIXED_PASSIVE_TAGS, "passive")):
+            attr = tags.get(name)
+            if attr:
+                src = tag.get(attr, "")
+                if isinstance(src, str) and src.startswith("http://"):
+                    info["mixed_content"].append((name, src, kind))
+    return info
+
+
+def _extract_form(form):
+    inputs = []
+    fields = {}
+    for inp in form.find_all(["input", "textarea", "select"]):
+        entry = {
+            "tag": inp.name,
+            "name": inp.get("name", ""),
+            "id": inp.get("id", ""),
+            "type": inp.get("type", "text"),
+            "value": inp.get("value", ""),
+            "autocomplete": inp.get("autocomplete", ""),
+        }
+        inputs.append(entry)
+        field_name = entry["name"] or entry["id"]
+        if field_name:
+            fields[field_name] = {"type": entry["type"], "value": entry["value"]}
+    return {
+        "action": form.get("action", ""),
+        "method": form.get("method", "GET").upper(),
+        "autocomplete": form.get("autocomplete", ""),
+        "inputs": inputs,
+        "fields": fields,
+    }
 
 
 class TupiSecScanner:
@@ -113,7 +2217,16 @@ class TupiSecScanner:
         self.target_url = target_url.rstrip("/")
         self.parsed = urllib.parse.urlparse(self.target_url)
         self.base_url = f"{self.parsed.scheme}://{self.parsed.netloc}"
-        self.session = requests.Session()
+        self.governor = RateGovernor()
+        self.breaker = CircuitBreaker(on_change=self._on_circuit_change, on_reject=self._on_circuit_reject)
+        self.short_circuited = {}
+        self.latency = LatencyTracker()
+        self.session = GovernedSession(self.governor, self.breaker, self.latency)
+        self.cancelled = threading.Event()
+        self.session.cancelled = self.cancelled
+        self.on_event = None  # on_event(kind, data): "progress", "finding", "url", "subdomain", "phase", "plan"
+        self._connector = None
+        self._timing_session = None
         self.session.headers.update({"User-Agent": USER_AGENT})
         self.session.verify = False
         self.findings = []
@@ -129,6 +2242,53 @@ class TupiSecScanner:
         self.fuzz_results = []
         self.sensitive_findings = []
         self.broken_links = []
+        self._workers = PHASE_WORKERS
+        self._lock = threading.RLock()
+        self.response_cache = ResponseCache()
+        self._html_parser = HTML_PARSER
+        self._crawl_depth = CRAWL_DEPTH
+        self._max_pages = CRAWL_MAX_PAGES
+        self._crawl_workers = CRAWL_WORKERS
+        self._dns_workers = DNS_WORKERS
+        self._nameservers = []
+        self._subdomain_wordlist = None
+        self._wildcard_ips = {}
+        self._ports = None
+        self._port_concurrency = PORT_SCAN_CONCURRENCY
+        self._port_thread = None
+        self._cve_db = CVE_DB_PATH
+        self._dir_wordlist = None
+        self._dir_extensions = []
+        self._dir_workers = DIR_WORKERS
+        self._dir_max_bytes = DIR_MAX_BYTES
+        self._soft_404 = {}
+        self.lookup_cache = LookupCache(CACHE_DIR)
+        self._form_keys = set()
+        self._engine = None
+        self._loop = None
+        self._injection_points = None
+        self.dispatcher = PayloadDispatcher(self.fetch_many)
+        self._emit_progress = False
+        self._progress_step = 0
+        self._progress_total = 0
+        self._progress_out = None  # file for PROGRESS: lines; None = stdout
+        self.checkpoint = None  # ScanCheckpoint when --checkpoint/--resume is used
+        self._restored_findings = set()
+        self._resumed_phases = []
+        self.page_validators = {}  # crawled page -> {"etag", "last_modified", "sha1"}
+        self._baseline = None  # previous report for --baseline delta scans
+        self._unchanged_pages = set()
+        self._baseline_stats = None
+        self._time_budget = None  # seconds; the scan is cancelled once it runs out
+        self._grace = CANCEL_GRACE
+        self.stop_reason = None
+        self.phase_status = {}  # phase id -> running/completed/failed/partial/skipped/resumed
+        self.abandoned = False  # phase threads were still running when the scan returned
+        self._quick_mode = False
+        self._skip_modules = ""
+        self._plan_only = False  # --plan: estimate the modules after discovery, then stop
+        self._max_requests = None
+        self.plan = None  # ScanPlan once modules were estimated
         if cookies:
             for pair in cookies.split(";"):
                 pair = pair.strip()
@@ -151,19 +2311,327 @@ class TupiSecScanner:
 
     def log(self, msg, color=Fore.WHITE):
         if self.verbose:
-            print(f"{color}{msg}{Style.RESET_ALL}")
+            with self._lock:
+                print(f"{color}{msg}{Style.RESET_ALL}")
+
+    def _on_circuit_change(self, host, state):
+        if state == "open":
+            self.log(f"  [!] {host} stopped responding; failing its requests fast until it recovers", Fore.RED)
+        else:
+            self.log(f"  [+] {host} is responding again", Fore.GREEN)
+
+    def _on_circuit_reject(self, host):
+        phase_id = SCAN_PHASE.get()
+        if phase_id is not None:
+            with self._lock:
+                self.short_circuited[phase_id] = self.short_circuited.get(phase_id, 0) + 1
+
+    def _track_short_circuits(self, phase_id, fn):
+        """Wrap a phase so requests the breaker fails fast on its behalf are charged to it.
+
+        The phase id travels in SCAN_PHASE, which module pools (ContextThreadPool)
+        and fetch_many() carry into their workers.
+        """
+        def run():
+            token = SCAN_PHASE.set(phase_id)
+            try:
+                return fn()
+            finally:
+                SCAN_PHASE.reset(token)
+        return run
+
+    def latency_profile(self, url=None):
+        """Response-time distribution (seconds) of ``url``'s host, default the target; None if unmeasured."""
+        return self.latency.distribution(urllib.parse.urlsplit(url or self.base_url).netloc)
+
+    def timing_session(self):
+        """Session with its own connection pool, for timing probes.
+
+        It shares the governor, breaker and latency tracker, but its requests
+        never wait behind other phases for a pooled connection, so control
+        and delayed response times stay comparable.
+        """
+        with self._lock:
+            if self._timing_session is None:
+                session = GovernedSession(self.governor, self.breaker, self.latency)
+                session.headers.update(self.session.headers)
+                session.cookies.update(self.session.cookies)
+                session.verify = self.session.verify
+                session.cancelled = self.cancelled
+                session.adaptive_timeouts = self.session.adaptive_timeouts
+                adapter = requests.adapters.HTTPAdapter(pool_maxsize=TIMING_WORKERS)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._timing_session = session
+            return self._timing_session
+
+    def request_timeout(self, url=None, extra=0.0):
+        """Explicit ``(connect, read)`` timeout for ``url``'s host with ``extra`` seconds of read time.
+
+        For probes that expect a deliberate delay; the tuple keeps the session
+        from substituting its own derived timeout. With ``extra`` it is a
+        DelayTimeout, so the stalled response isn't taken as a latency sample.
+        """
+        host = urllib.parse.urlsplit(url or self.base_url).netloc
+        timeout = self.latency.timeout(host, TIMEOUT)
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        return DelayTimeout((connect, read + extra)) if extra else (connect, read)
+
+    def cancel(self, reason="cancelled"):
+        """Stop the scan: pending phases are skipped and every further request fails at once."""
+        if not self.cancelled.is_set():
+            self.stop_reason = reason
+        self.cancelled.set()
+
+    def add_finding(self, severity, category, title, detail, recommendation="", page=None):
+        f = Finding(severity, category, title, detail, recommendation, page)
+        with self._lock:
+            if (severity, category, title, detail) in self._restored_findings:
+                return  # already in the checkpoint this scan resumed from
+            self.findings.append(f)
+            if self.verbose:
+                print(f"  {f}")
+        self.emit_event("finding", f.to_dict())
+
+    def restore_checkpoint(self, state):
+        """Load a ScanCheckpoint state so completed phases are skipped and the rest resume."""
+        if state.get("target") != self.target_url:
+            raise ValueError(f"Checkpoint is for {state.get('target')}, not {self.target_url}")
+        if self.checkpoint is None:
+            self.checkpoint = ScanCheckpoint(None)
+        self.checkpoint.completed = set(state.get("completed", []))
+        self._resumed_phases = sorted(self.checkpoint.completed)
+        self.checkpoint.cursors = dict(state.get("cursors", {}))
+        for name in ScanCheckpoint.FIELDS:
+            if name in state:
+                setattr(self, name, state[name])
+        self.discovered_urls = set(state.get("discovered_urls", []))
+        self._form_keys = {(urllib.parse.urljoin(f["url"], f["action"] or f["url"]), f["method"],
+                            tuple(sorted(f["fields"]))) for f in self.discovered_forms}
+        for d in state.get("findings", []):
+            f = Finding(d["severity"], d["category"], d["title"], d["detail"], d.get("recommendation", ""))
+            f.timestamp = d.get("timestamp", f.timestamp)
+            self.findings.append(f)
+            self._restored_findings.add((f.severity, f.category, f.title, f.detail))
+
+    def save_checkpoint(self):
+        if self.checkpoint is None or not self.checkpoint.path:
+            return
+        try:
+            self.checkpoint.save(self, self.governor.total_requests())
+        except OSError as e:
+            self.log(f"  [!] Could not write checkpoint {self.checkpoint.path}: {e}", Fore.YELLOW)
+
+    def cursor(self, module, default=None):
+        """Where ``module`` stopped in the checkpoint this scan resumed from."""
+        if self.checkpoint is None:
+            return default
+        return self.checkpoint.cursors.get(module, default)
+
+    def set_cursor(self, module, value):
+        """Record ``module``'s progress; checkpoints when enough requests went out since the last save.
+
+        Call it only where the state saved with the cursor is consistent
+        with it, e.g. between batches.
+        """
+        if self.checkpoint is None:
+            return
+        self.checkpoint.cursors[module] = value
+        if self.checkpoint.due(self.governor.total_requests()):
+            self.save_checkpoint()
+
+    def _complete_phase(self, phase_id):
+        if self.checkpoint is None or self.cancelled.is_set():
+            return  # a cancelled phase may have stopped part way
+        self.checkpoint.completed.add(phase_id)
+        for key in [k for k in self.checkpoint.cursors if k == phase_id or k.startswith(f"{phase_id}:")]:
+            del self.checkpoint.cursors[key]
+        self.save_checkpoint()
+
+    def emit_event(self, kind, data):
+        """Forward a scan event to the ``on_event`` hook, if one is set."""
+        if self.on_event is not None:
+            self.on_event(kind, data)
+
+    def _emit_seeded_state(self):
+        """Stream what --baseline / --resume loaded before the scan, as if it had just been found."""
+        if self.on_event is None:
+            return
+        for url in sorted(self.discovered_urls):
+            self.emit_event("url", {"url": url})
+        for entry in self.subdomains:
+            self.emit_event("subdomain", entry)
+        for f in list(self.findings):
+            self.emit_event("finding", f.to_dict())
+
+    def cached_get(self, url, headers=None, timeout=TIMEOUT, allow_redirects=True):
+        """GET ``url`` through the per-scan response cache (idempotent page fetches only)."""
+        key = ResponseCache.make_key(url, headers, allow_redirects)
+        return self.response_cache.get_or_fetch(
+            key, lambda: self.session.get(url, headers=headers, timeout=timeout,
+                                          allow_redirects=allow_redirects))
+
+    def parse_html(self, html):
+        try:
+            return BeautifulSoup(html, self._html_parser)
+        except FeatureNotFound:
+            self.log(f"  [!] HTML parser '{self._html_parser}' not installed, using html.parser", Fore.YELLOW)
+            self._html_parser = "html.parser"
+            return BeautifulSoup(html, self._html_parser)
+
+    def page_info(self, resp):
+        """Parse a response once and cache its extract_page() summary on it.
+
+        The summary lives on the response object, so it shares the response
+        cache's lifetime and eviction instead of holding full bs4 trees.
+        """
+        info = getattr(resp, "_tupisec_page", None)
+        if info is None:
+            info = extract_page(self.parse_html(resp.text))
+            resp._tupisec_page = info
+        return info
+
+    # ─── Async request layer ──────────────────────────────────────────
+    async def fetch(self, url, method="GET", **kwargs):
+        """Send one request through the async engine (started on first use).
+
+        Accepts ``params``, ``data``, ``json_body``, ``headers``, ``timeout``
+        and ``allow_redirects``. Call ``aclose()`` when done outside of
+        ``run_full_scan_async()``.
+        """
+        if self._engine is None:
+            # No await between the check and the assignment, so this is race-free on the loop
+            self._loop = asyncio.get_running_loop()
+            self._engine = AsyncHTTPEngine(self.session)
+            self._engine.open()
+        return await self._engine.request(method, url, **kwargs)
+
+    async def fetch_all(self, jobs, limit=None):
+        """Run ``fetch(**job)`` for every job concurrently; failures come back as exceptions.
+
+        ``limit`` caps how many of these jobs are in flight at once.
+        """
+        if not limit:
+            return await asyncio.gather(*(self.fetch(**job) for job in jobs), return_exceptions=True)
+        sem = asyncio.Semaphore(limit)
+
+        async def limited(job):
+            async with sem:
+                return await self.fetch(**job)
+        return await asyncio.gather(*(limited(job) for job in jobs), return_exceptions=True)
+
+    async def aclose(self):
+        if self._engine is not None:
+            await self._engine.close()
+        self._engine = None
+        self._loop = None
+
+    def fetch_many(self, jobs, limit=None):
+        """Blocking fetch_all() for module code running in scheduler threads."""
+        jobs = list(jobs)
+        if not jobs:
+            return []
+        if self.cancelled.is_set():
+            return [ScanCancelled("Scan cancelled") for _ in jobs]
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            phase_id = SCAN_PHASE.get()
+
+            async def in_phase():  # tasks on the shared loop don't inherit this thread's context
+                SCAN_PHASE.set(phase_id)
+                return await self.fetch_all(jobs, limit)
+
+            return asyncio.run_coroutine_threadsafe(in_phase(), loop).result()
+
+        async def standalone():
+            sem = asyncio.Semaphore(limit or len(jobs))
+            async with AsyncHTTPEngine(self.session) as engine:
+                async def one(job):
+                    async with sem:
+                        return await engine.request(job.pop("method", "GET"), job.pop("url"), **job)
+                return await asyncio.gather(*(one(job) for job in map(dict, jobs)), return_exceptions=True)
+        return asyncio.run(standalone())
+
+    # ─── Injection points ─────────────────────────────────────────────
+    def injection_points(self):
+        """Form fields and URL query params, enumerated once after forms + crawl."""
+        with self._lock:
+            if self._injection_points is None:
+                self._injection_points = self._enumerate_injection_points()
+            return list(self._injection_points)
+
+    def _enumerate_injection_points(self):
+        points = OrderedDict()
+        for form in self.test_forms():
+            url = urllib.parse.urljoin(form.get("url") or self.target_url, form.get("action") or "")
+            method = (form.get("method") or "GET").upper()
+            fields = form.get("fields", {})
+            params = {fn: fi.get("value", "test") for fn, fi in fields.items()}
+            for name, info in fields.items():
+                p = InjectionPoint("form", method, url, name, params, info.get("type", "text"), form.get("url", ""))
+                points.setdefault(p.key, p)
 
-    def add_finding(self, severity, category, title, detail, recommendation=""):
-        f = Finding(severity, category, title, detail, recommendation)
-        self.findings.append(f)
-        if self.verbose:
-            print(f"  {f}")
+        for page_url in [self.target_url] + sorted(self.test_urls()):
+            parsed = urllib.parse.urlparse(page_url)
+            if not parsed.query:
+                continue
+            params = dict(urllib.parse.parse_qsl(parsed.query, keep_blank_values=True))
+            base = urllib.parse.urlunparse(parsed._replace(query="", fragment=""))
+            for name in params:
+                p = InjectionPoint("query", "GET", base, name, params, "query", page_url)
+                points.setdefault(p.key, p)
+        return list(points.values())
+
+    def test_urls(self):
+        """Crawled URLs for active modules: all of them, or only new and changed pages with --baseline."""
+        return {u for u in self.discovered_urls if u not in self._unchanged_pages}
+
+    def test_forms(self):
+        """Discovered forms, minus those on pages --baseline revalidated as unchanged."""
+        return [f for f in self.discovered_forms if f.get("url") not in self._unchanged_pages]
+
+    def _form_points(self, skip_types=SKIP_FIELD_TYPES, limit=None):
+        points = [p for p in self.injection_points() if p.kind == "form" and p.field_type not in skip_types]
+        return self._limit_groups(points, limit)
+
+    def _query_points(self, limit=None):
+        return self._limit_groups([p for p in self.injection_points() if p.kind == "query"], limit)
+
+    @staticmethod
+    def _limit_groups(points, limit):
+        """Keep only points from the first ``limit`` forms / URLs."""
+        if limit is None:
+            return points
+        groups = []
+        kept = []
+        for p in points:
+            if p.group not in groups:
+                if len(groups) >= limit:
+                    continue
+                groups.append(p.group)
+            kept.append(p)
+        return kept
+
+    def emit_progress(self, phase, message, status, **extra):
+        """Print a PROGRESS: line (to stdout or ``--progress-fd``) when progress output is enabled.
+
+        With an ``on_event`` hook the payload goes there instead of stdout.
+        """
+        if not self._emit_progress and self.on_event is None:
+            return
+        payload = {"phase": phase, "step": self._progress_step, "total": self._progress_total,
+                   "message": message, "status": status, **extra}
+        if self.on_event is not None:
+            self.on_event("progress", payload)
+            return
+        with self._lock:
+            print(f"PROGRESS:{json.dumps(payload)}", file=self._progress_out, flush=True)
 
     # ─── Module 1: HTTP Headers Analysis ──────────────────────────────
     def scan_headers(self):
         self.log("\n[*] Analyzing HTTP Headers...", Fore.GREEN)
         try:
-            resp = self.session.get(self.target_url, timeout=TIMEOUT, allow_redirects=True)
+            resp = self.cached_get(self.target_url)
             headers = resp.headers
 
             # Server disclosure
@@ -273,28 +2741,29 @@ class TupiSecScanner:
     def scan_forms(self, html_content=None):
         self.log("\n[*] Analyzing Forms & Inputs...", Fore.GREEN)
         try:
-            if not html_content:
-                resp = self.session.get(self.target_url, timeout=TIMEOUT)
-                html_content = resp.text
-
-            soup = BeautifulSoup(html_content, "html.parser")
-            forms = soup.find_all("form")
+            if html_content:
+                info = extract_page(self.parse_html(html_content))
+            else:
+                info = self.page_info(self.cached_get(self.target_url))
+            forms = info["forms"]
 
             if not forms:
                 self.log("  No forms found on this page.", Fore.YELLOW)
                 return
 
             for i, form in enumerate(forms):
-                action = form.get("action", "")
-                method = form.get("method", "GET").upper()
-                autocomplete = form.get("autocomplete", "")
+                action = form["action"]
+                method = form["method"]
+                autocomplete = form["autocomplete"]
 
                 self.log(f"\n  Form #{i+1}: action='{action}' method='{method}'", Fore.CYAN)
 
                 # No CSRF token
                 csrf_found = False
-                for inp in form.find_all("input", {"type": "hidden"}):
-                    name = (inp.get("name") or "").lower()
+                for inp in form["inputs"]:
+                    if inp["tag"] != "input" or inp["type"] != "hidden":
+                        continue
+                    name = (inp["name"] or "").lower()
                     if any(t in name for t in ["csrf", "token", "_token", "nonce", "authenticity"]):
                         csrf_found = True
                         break
@@ -305,9 +2774,9 @@ class TupiSecScanner:
                         "Implement CSRF tokens in all forms.")
 
                 # Password field without autocomplete=off
-                pwd_fields = form.find_all("input", {"type": "password"})
+                pwd_fields = [inp for inp in form["inputs"] if inp["tag"] == "input" and inp["type"] == "password"]
                 for pwd in pwd_fields:
-                    if pwd.get("autocomplete", "") != "off" and autocomplete != "off":
+                    if pwd["autocomplete"] != "off" and autocomplete != "off":
                         self.add_finding("LOW", "Form Security",
                             "Password autocomplete enabled",
                             f"Form #{i+1} has password field without autocomplete='off'.",
@@ -329,19 +2798,7 @@ class TupiSecScanner:
                             "Change form action to HTTPS.")
 
                 # Collect form data for further testing
-                fields = {}
-                for inp in form.find_all(["input", "textarea", "select"]):
-                    name = inp.get("name", inp.get("id", ""))
-                    itype = inp.get("type", "text")
-                    if name:
-                        fields[name] = {"type": itype, "value": inp.get("value", "")}
-
-                self.discovered_forms.append({
-                    "action": action,
-                    "method": method,
-                    "fields": fields,
-                    "url": self.target_url,
-                })
+                self._add_form(form, self.target_url)
 
         except Exception as e:
             self.log(f"  [!] Form scan error: {e}", Fore.RED)
@@ -362,44 +2819,18 @@ class TupiSecScanner:
             "supplied argument is not a valid", "mssql_query",
         ]
 
-        for form_data in self.discovered_forms:
-            action = form_data["action"]
-            method = form_data["method"]
-            fields = form_data["fields"]
-
-            if not action:
-                action = self.target_url
-            elif not action.startswith("http"):
-                action = urllib.parse.urljoin(self.target_url, action)
-
-            for field_name, field_info in fields.items():
-                if field_info["type"] in ("hidden", "submit", "button", "image"):
-                    continue
+        matcher = PatternMatcher(sql_errors)
 
-                for payload in SQL_PAYLOADS[:5]:  # Test first 5 payloads
-                    test_data = {}
-                    for fn, fi in fields.items():
-                        if fn == field_name:
-                            test_data[fn] = payload
-                        else:
-                            test_data[fn] = fi.get("value", "test")
+        def detect(resp, payload):
+            return matcher.first(resp)
 
-                    try:
-                        if method == "POST":
-                            resp = self.session.post(action, data=test_data, timeout=TIMEOUT, allow_redirects=True)
-                        else:
-                            resp = self.session.get(action, params=test_data, timeout=TIMEOUT, allow_redirects=True)
-
-                        body = resp.text.lower()
-                        for error in sql_errors:
-                            if error.lower() in body:
-                                self.add_finding("CRITICAL", "SQL Injection",
-                                    f"Possible SQLi in field '{field_name}'",
-                                    f"Payload: {payload}\nSQL error pattern found: '{error}'",
-                                    "Use parameterized queries / prepared statements.")
-                                return  # One finding per form is enough
-                    except:
-                        pass
+        jobs = [(p, payload, detect) for p in self._form_points() for payload in SQL_PAYLOADS[:5]]
+        # One finding per form is enough
+        for point, payload, error, _ in self.dispatcher.run(jobs, per_group=True):
+            self.add_finding("CRITICAL", "SQL Injection",
+                f"Possible SQLi in field '{point.param}'",
+                f"Payload: {payload}\nSQL error pattern found: '{error}'",
+                "Use parameterized queries / prepared statements.", page=point.source)
 
     # ─── Module 5: XSS Testing ────────────────────────────────────────
     def scan_xss(self):
@@ -408,54 +2839,39 @@ class TupiSecScanner:
             self.log("  No forms to test.", Fore.YELLOW)
             return
 
-        for form_data in self.discovered_forms:
-            action = form_data["action"]
-            method = form_data["method"]
-            fields = form_data["fields"]
-
-            if not action:
-                action = self.target_url
-            elif not action.startswith("http"):
-                action = urllib.parse.urljoin(self.target_url, action)
-
-            for field_name, field_info in fields.items():
-                if field_info["type"] in ("hidden", "submit", "button", "image"):
-                    continue
+        def detect(resp, payload):
+            return payload in resp.text
 
-                for payload in XSS_PAYLOADS[:3]:
-                    test_data = {}
-                    for fn, fi in fields.items():
-                        if fn == field_name:
-                            test_data[fn] = payload
-                        else:
-                            test_data[fn] = fi.get("value", "test")
-
-                    try:
-                        if method == "POST":
-                            resp = self.session.post(action, data=test_data, timeout=TIMEOUT, allow_redirects=True)
-                        else:
-                            resp = self.session.get(action, params=test_data, timeout=TIMEOUT, allow_redirects=True)
-
-                        if payload in resp.text:
-                            self.add_finding("HIGH", "XSS",
-                                f"Reflected XSS in field '{field_name}'",
-                                f"Payload reflected without encoding: {payload}",
-                                "Sanitize and encode all user inputs before rendering.")
-                            break
-                    except:
-                        pass
+        jobs = [(p, payload, detect) for p in self._form_points() for payload in XSS_PAYLOADS[:3]]
+        for point, payload, _, _ in self.dispatcher.run(jobs):
+            self.add_finding("HIGH", "XSS",
+                f"Reflected XSS in field '{point.param}'",
+                f"Payload reflected without encoding: {payload}",
+                "Sanitize and encode all user inputs before rendering.", page=point.source)
 
     # ─── Module 6: Directory/File Enumeration ─────────────────────────
     def scan_directories(self):
         self.log("\n[*] Enumerating directories & sensitive files...", Fore.GREEN)
         interesting = []
 
-        for path in COMMON_PATHS:
-            url = f"{self.base_url}/{path}"
+        profile = self.soft_404_profile()
+        candidates = self._directory_candidates()
+        if profile.catch_all:
+            # Every path "exists": a big wordlist would only produce soft-404s
+            self.log(f"  [!] Host answers nonexistent paths with HTTP {profile.statuses}; "
+                     f"skipping external wordlist and filtering soft-404s", Fore.YELLOW)
+            candidates = COMMON_PATHS
+        extra = f" + wordlist {self._dir_wordlist}" if self._dir_wordlist and not profile.catch_all else ""
+        self.log(f"  Probing {len(COMMON_PATHS)} paths{extra} ({self._dir_workers} concurrent, "
+                 f"bodies capped at {self._dir_max_bytes} bytes)", Fore.CYAN)
+        soft = 0
+        for path, url, resp in self._probe_paths(candidates, cursor="directories"):
             try:
-                resp = self.session.get(url, timeout=8, allow_redirects=False)
                 status = resp.status_code
-                length = len(resp.content)
+                size, capped = self._body_size(resp)
+                if status != 404 and profile.is_soft_404(resp, path):
+                    soft += 1
+                    continue
 
                 if status == 200:
                     severity = "MEDIUM"
@@ -465,9 +2881,9 @@ class TupiSecScanner:
 
                     self.add_finding(severity, "Sensitive File/Directory",
                         f"Accessible: {path}",
-                        f"URL: {url} (Status: {status}, Size: {length} bytes)",
+                        f"URL: {url} (Status: {status}, Size: {size}{'+' if capped else ''} bytes)",
                         "Restrict access to sensitive files and directories.")
-                    interesting.append((path, status, length))
+                    interesting.append((path, status, size))
 
                 elif status in (301, 302, 303, 307, 308):
                     location = resp.headers.get("Location", "")
@@ -496,18 +2912,19 @@ class TupiSecScanner:
         ]
 
         self.log("\n[*] Enumerating /newsys/ subdirectory...", Fore.GREEN)
-        for path in newsys_paths:
-            url = f"{self.base_url}/newsys/{path}"
+        for path, url, resp in self._probe_paths(newsys_paths, prefix="newsys/", cursor="directories:newsys"):
             try:
-                resp = self.session.get(url, timeout=8, allow_redirects=False)
                 status = resp.status_code
-                length = len(resp.content)
+                size, capped = self._body_size(resp)
+                if status != 404 and profile.is_soft_404(resp, path):
+                    soft += 1
+                    continue
 
-                if status == 200 and length > 0:
+                if status == 200 and size:
                     severity = "HIGH" if any(s in path for s in ["config", "db", "conn", "conexion", "admin", "phpinfo"]) else "MEDIUM"
                     self.add_finding(severity, "Sensitive File/Directory",
                         f"Accessible in /newsys/: {path}",
-                        f"URL: {url} (Status: {status}, Size: {length} bytes)",
+                        f"URL: {url} (Status: {status}, Size: {size}{'+' if capped else ''} bytes)",
                         "Restrict access to non-public files.")
 
                 elif status == 403:
@@ -517,13 +2934,78 @@ class TupiSecScanner:
             except:
                 pass
 
+        if soft:
+            self.log(f"  Ignored {soft} soft-404 responses", Fore.CYAN)
+
+    def soft_404_profile(self, method="GET", data=None, headers=None):
+        """Fingerprint of this host's answer to nonexistent paths; built once per method."""
+        key = (self.base_url, method, self._dir_max_bytes)  # bodies capped like the probes they're compared to
+        with self._lock:
+            if key in self._soft_404:
+                return self._soft_404[key]
+        token = "tupisec-" + secrets.token_hex(6)
+        probes = [token, f"{token}.php", f"{token}/"]
+        jobs = [{"method": method, "url": f"{self.base_url}/{p}", "data": data, "headers": headers,
+                 "timeout": 8, "allow_redirects": False, "max_bytes": self._dir_max_bytes} for p in probes]
+        samples = [(p, r) for p, r in zip(probes, self.fetch_many(jobs)) if not isinstance(r, Exception)]
+        profile = SoftNotFoundProfile(samples)
+        with self._lock:
+            return self._soft_404.setdefault(key, profile)
+
+    def is_soft_404(self, resp, path=None):
+        """Shared check for enumeration modules: does ``resp`` just mean "not found" on this host?"""
+        return self.soft_404_profile().is_soft_404(resp, path)
+
+    def _directory_candidates(self):
+        """COMMON_PATHS, then the external wordlist (streamed) with extension permutations."""
+        yield from COMMON_PATHS
+        if not self._dir_wordlist:
+            return
+        builtin = set(COMMON_PATHS)
+        for word in iter_wordlist(self._dir_wordlist):
+            word = word.lstrip("/")
+            variants = [word]
+            if not word.endswith("/") and "." not in word.rsplit("/", 1)[-1]:
+                variants += [f"{word}.{ext}" for ext in self._dir_extensions]
+            for path in variants:
+                if path not in builtin:
+                    yield path
+
+    def _probe_paths(self, paths, prefix="", cursor=None):
+        """Yield ``(path, url, resp)`` for each path, fetched concurrently with capped bodies.
+
+        With a ``cursor`` name, paths probed before a resumed checkpoint are skipped.
+        """
+        done = self.cursor(cursor, 0) if cursor else 0
+        paths = itertools.islice(paths, done, None)
+        while True:
+            if cursor:
+                self.set_cursor(cursor, done)  # the previous batch has been fully handled
+            batch = list(itertools.islice(paths, DIR_BATCH))
+            done += len(batch)
+            if not batch:
+                return
+            urls = [f"{self.base_url}/{prefix}{path}" for path in batch]
+            jobs = ({"url": url, "timeout": 8, "allow_redirects": False, "max_bytes": self._dir_max_bytes}
+                    for url in urls)
+            for path, url, resp in zip(batch, urls, self.fetch_many(jobs, limit=self._dir_workers)):
+                if not isinstance(resp, Exception):
+                    yield path, url, resp
+
+    @staticmethod
+    def _body_size(resp):
+        """``(size, capped)``: Content-Length when sent, else the bytes read (``capped`` if there was more)."""
+        declared = resp.headers.get("Content-Length", "")
+        if declared.isdigit():
+            return int(declared), False
+        return len(resp.content), getattr(resp, "truncated", False)
+
     # ─── Module 7: Technology Fingerprinting ──────────────────────────
     def scan_tech(self):
         self.log("\n[*] Fingerprinting technology stack...", Fore.GREEN)
         try:
-            resp = self.session.get(self.target_url, timeout=TIMEOUT)
+            resp = self.cached_get(self.target_url)
             headers = resp.headers
-            body = resp.text
 
             # PHP detection
             if ".php" in self.target_url or "X-Powered-By" in headers:
@@ -536,9 +3018,9 @@ class TupiSecScanner:
                 self.tech_stack["web_server"] = server
 
             # Check for common frameworks in HTML
-            soup = BeautifulSoup(body, "html.parser")
-            scripts = [s.get("src", "") for s in soup.find_all("script") if s.get("src")]
-            links = [l.get("href", "") for l in soup.find_all("link") if l.get("href")]
+            info = self.page_info(resp)
+            scripts = info["scripts"]
+            links = [ref for tag, ref in info["links"] if tag == "link"]
 
             for src in scripts + links:
                 if "jquery" in src.lower():
@@ -553,9 +3035,8 @@ class TupiSecScanner:
                     self.tech_stack["vue"] = src
 
             # Generator meta tag
-            gen = soup.find("meta", {"name": "generator"})
-            if gen:
-                self.tech_stack["generator"] = gen.get("content", "")
+            if info["generator"] is not None:
+                self.tech_stack["generator"] = info["generator"]
 
             if self.tech_stack:
                 self.log(f"  Detected: {json.dumps(self.tech_stack, indent=2)}", Fore.CYAN)
@@ -573,23 +3054,42 @@ class TupiSecScanner:
             import dns.resolver
             record_types = ["A", "AAAA", "MX", "NS", "TXT"]
             for rtype in record_types:
-                try:
-                    answers = dns.resolver.resolve(hostname, rtype, lifetime=10)
-                    for rdata in answers:
-                        self.dns_records.append({"type": rtype, "value": rdata.to_text()})
-                except Exception:
-                    pass
+                cache_key = f"{hostname}:{rtype}"
+                values = self.lookup_cache.get("dns", cache_key)
+                if values is None:
+                    try:
+                        answers = dns.resolver.resolve(hostname, rtype, lifetime=10)
+                        values = [rdata.to_text() for rdata in answers]
+                    except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+                        values = []
+                    except Exception:
+                        continue
+                    self.lookup_cache.set("dns", cache_key, values)
+                for value in values:
+                    self.dns_records.append({"type": rtype, "value": value})
             self.log(f"  Found {len(self.dns_records)} DNS records", Fore.CYAN)
         except ImportError:
             self.log("  [!] dnspython not installed, skipping DNS lookup", Fore.YELLOW)
         except Exception as e:
             self.log(f"  [!] DNS lookup error: {e}", Fore.RED)
 
-        # WHOIS info
+        # WHOIS info (registration data belongs to the apex, so subdomains share one entry)
+        apex = self._get_apex_domain(hostname)
+        with self.lookup_cache.single_flight("whois", apex):
+            self._whois(apex)
+
+    def _whois(self, apex):
+        cached = self.lookup_cache.get("whois", apex)
+        if cached is not None:
+            self.whois_info = cached
+            if cached:
+                self.log(f"  WHOIS: {cached.get('registrar', 'unknown registrar')} (cached)", Fore.CYAN)
+            return
         try:
             import whois
             try:
-                w = whois.whois(hostname)
+                w = whois.whois(apex)
+                self.whois_info = {}
                 if w:
                     def _str(val):
                         if val is None:
@@ -611,6 +3111,7 @@ class TupiSecScanner:
                         if v
                     }
                     self.log(f"  WHOIS: {self.whois_info.get('registrar', 'unknown registrar')}", Fore.CYAN)
+                self.lookup_cache.set("whois", apex, self.whois_info)
             except Exception as e:
                 self.log(f"  [!] WHOIS lookup error: {e}", Fore.RED)
         except ImportError:
@@ -642,14 +3143,29 @@ class TupiSecScanner:
             self.log("  No versioned products found in tech stack.", Fore.YELLOW)
             return
 
+        index = CVEIndex(self._cve_db)
+        if index.exists():
+            # Offline index: every product, no rate limit
+            self.log(f"  Using offline NVD index {self._cve_db}", Fore.CYAN)
+            try:
+                for product, version in products:
+                    for cve in index.lookup(product, version):
+                        self._report_cve(product, version, cve["cve_id"], cve["cvss_score"], cve["description"])
+                self.log(f"  Found {len(self.cve_data)} high/critical CVEs", Fore.CYAN)
+                return
+            except sqlite3.Error as e:
+                self.log(f"  [!] Offline CVE index error: {e}, falling back to NVD API", Fore.RED)
+
         for idx, (product, version) in enumerate(products[:5]):  # cap at 5 queries
             keyword = f"{product} {version}".strip()
             self.log(f"  Querying NVD for: {keyword}", Fore.CYAN)
+            with self.lookup_cache.single_flight("nvd", keyword):
+                data = self.lookup_cache.get("nvd", keyword)
+                from_cache = data is not None
+                if data is None:
+                    data = self._query_nvd(keyword)
             try:
-                url = "https://services.nvd.nist.gov/rest/json/cves/2.0"
-                resp = requests.get(url, params={"keywordSearch": keyword, "resultsPerPage": 5}, timeout=15)
-                if resp.status_code == 200:
-                    data = resp.json()
+                if data is not None:
                     items = data.get("vulnerabilities", [])
                     for item in items:
                         cve_id = item.get("cve", {}).get("id", "")
@@ -664,44 +3180,59 @@ class TupiSecScanner:
                         if score is None:
                             continue
                         score = float(score)
-                        if score < 7.0:
+                        if score < CVE_MIN_SCORE:
                             continue
 
-                        if score >= 9.0:
-                            severity = "CRITICAL"
-                        elif score >= 7.0:
-                            severity = "HIGH"
-                        else:
-                            severity = "MEDIUM"
-
                         descriptions = item.get("cve", {}).get("descriptions", [])
                         desc_text = next((d["value"] for d in descriptions if d.get("lang") == "en"), "")
-                        self.cve_data.append({
-                            "cve_id": cve_id,
-                            "product": product,
-                            "version": version,
-                            "cvss_score": score,
-                            "severity": severity,
-                            "description": desc_text[:300],
-                        })
-                        self.add_finding(
-                            severity, "CVE",
-                            f"{cve_id} affects {product} {version}",
-                            f"CVSS {score}: {desc_text[:200]}",
-                            f"Update {product} to a patched version.",
-                        )
-                elif resp.status_code == 429:
-                    self.log("  [!] NVD rate limit hit, pausing...", Fore.YELLOW)
-                    time.sleep(10)
+                        self._report_cve(product, version, cve_id, score, desc_text)
             except Exception as e:
                 self.log(f"  [!] CVE lookup error for {keyword}: {e}", Fore.RED)
 
             # Rate limiting: max 5 requests per 10 seconds for unauthenticated NVD
-            if idx < len(products) - 1:
+            if idx < len(products) - 1 and not from_cache:
                 time.sleep(2)
 
         self.log(f"  Found {len(self.cve_data)} high/critical CVEs", Fore.CYAN)
 
+    def _query_nvd(self, keyword):
+        """Live NVD API keyword search; the response is stored in the lookup cache."""
+        try:
+            url = "https://services.nvd.nist.gov/rest/json/cves/2.0"
+            resp = requests.get(url, params={"keywordSearch": keyword, "resultsPerPage": 5}, timeout=15)
+            if resp.status_code == 200:
+                data = resp.json()
+                self.lookup_cache.set("nvd", keyword, data)
+                return data
+            if resp.status_code == 429:
+                self.log("  [!] NVD rate limit hit, pausing...", Fore.YELLOW)
+                time.sleep(10)
+        except Exception as e:
+            self.log(f"  [!] CVE lookup error for {keyword}: {e}", Fore.RED)
+        return None
+
+    def _report_cve(self, product, version, cve_id, score, desc_text):
+        if score >= 9.0:
+            severity = "CRITICAL"
+        elif score >= 7.0:
+            severity = "HIGH"
+        else:
+            severity = "MEDIUM"
+        self.cve_data.append({
+            "cve_id": cve_id,
+            "product": product,
+            "version": version,
+            "cvss_score": score,
+            "severity": severity,
+            "description": desc_text[:300],
+        })
+        self.add_finding(
+            severity, "CVE",
+            f"{cve_id} affects {product} {version}",
+            f"CVSS {score}: {desc_text[:200]}",
+            f"Update {product} to a patched version.",
+        )
+
     # ─── Module 11: Open Redirect Testing ─────────────────────────────
     def scan_open_redirect(self):
         self.log("\n[*] Testing for Open Redirects...", Fore.GREEN)
@@ -709,41 +3240,24 @@ class TupiSecScanner:
         redirect_params = {"url", "redirect", "next", "return", "to", "dest",
                            "destination", "location", "goto", "forward", "redir", "target"}
         evil_url = "https://evil.tupisec-test.io"
-        tested = set()
 
-        all_urls = list(self.discovered_urls) + [self.target_url]
-        for page_url in all_urls:
-            parsed = urllib.parse.urlparse(page_url)
-            if not parsed.query:
-                continue
-            params = dict(urllib.parse.parse_qsl(parsed.query))
-            for param in list(params.keys()):
-                if param.lower() not in redirect_params:
-                    continue
-                key = (urllib.parse.urlunparse(parsed._replace(query="")), param)
-                if key in tested:
-                    continue
-                tested.add(key)
-                q = dict(params)
-                q[param] = evil_url
-                test_url = urllib.parse.urlunparse(
-                    parsed._replace(query=urllib.parse.urlencode(q))
-                )
-                try:
-                    resp = self.session.get(test_url, timeout=8, allow_redirects=False)
-                    location = resp.headers.get("Location", "")
-                    if location and "tupisec-test.io" in location:
-                        self.open_redirect_results.append({
-                            "url": page_url, "param": param, "redirect_to": location
-                        })
-                        self.add_finding(
-                            "HIGH", "Open Redirect",
-                            f"Open Redirect via parameter '{param}'",
-                            f"URL: {page_url}\nPayload: {param}={evil_url}\nRedirects to: {location}",
-                            "Validate redirect URLs against a whitelist. Never allow arbitrary external redirects."
-                        )
-                except Exception:
-                    pass
+        def detect(resp, payload):
+            location = resp.headers.get("Location", "")
+            return location if location and "tupisec-test.io" in location else None
+
+        points = [p for p in self._query_points() if p.param.lower() in redirect_params]
+        hits = self.dispatcher.run([(p, evil_url, detect) for p in points], timeout=8, allow_redirects=False)
+        for point, _, location, _ in hits:
+            self.open_redirect_results.append({
+                "url": point.source, "param": point.param, "redirect_to": location
+            })
+            self.add_finding(
+                "HIGH", "Open Redirect",
+                f"Open Redirect via parameter '{point.param}'",
+                f"URL: {point.source}\nPayload: {point.param}={evil_url}\nRedirects to: {location}",
+                "Validate redirect URLs against a whitelist. Never allow arbitrary external redirects.",
+                page=point.source,
+            )
 
         if not self.open_redirect_results:
             self.log("  No open redirects detected.", Fore.CYAN)
@@ -762,58 +3276,24 @@ class TupiSecScanner:
             "hostname", "instance-type", "meta-data",
         ]
 
-        def check_ssrf_response(resp_text, payload, context):
-            for indicator in ssrf_indicators:
-                if indicator.lower() in resp_text.lower():
-                    self.add_finding(
-                        "CRITICAL", "SSRF",
-                        "Cloud Metadata Endpoint Accessible via SSRF",
-                        f"Context: {context}\nPayload: {payload}\nCloud metadata indicator: '{indicator}'",
-                        "Block outbound requests to internal/cloud metadata addresses. Use outbound allowlists."
-                    )
-                    return True
-            return False
+        matcher = PatternMatcher(ssrf_indicators)
 
-        # Test form fields
-        for form_data in self.discovered_forms:
-            action = form_data.get("action", "") or self.target_url
-            if not action.startswith("http"):
-                action = urllib.parse.urljoin(self.target_url, action)
-            method = form_data.get("method", "GET").upper()
-            fields = form_data.get("fields", {})
-            for field_name, field_info in fields.items():
-                if field_info.get("type") in ("hidden", "submit", "button", "image"):
-                    continue
-                for payload in ssrf_payloads:
-                    test_data = {fn: (payload if fn == field_name else fi.get("value", "test"))
-                                 for fn, fi in fields.items()}
-                    try:
-                        if method == "POST":
-                            resp = self.session.post(action, data=test_data, timeout=8, allow_redirects=True)
-                        else:
-                            resp = self.session.get(action, params=test_data, timeout=8, allow_redirects=True)
-                        if check_ssrf_response(resp.text, payload, f"Form field '{field_name}' at {action}"):
-                            break
-                    except Exception:
-                        pass
+        def detect(resp, payload):
+            return matcher.first(resp)
 
-        # Test URL parameters
-        for page_url in list(self.discovered_urls)[:15]:
-            parsed = urllib.parse.urlparse(page_url)
-            if not parsed.query:
-                continue
-            params = dict(urllib.parse.parse_qsl(parsed.query))
-            for param in list(params.keys()):
-                for payload in ssrf_payloads[:2]:
-                    q = dict(params)
-                    q[param] = payload
-                    test_url = urllib.parse.urlunparse(parsed._replace(query=urllib.parse.urlencode(q)))
-                    try:
-                        resp = self.session.get(test_url, timeout=8, allow_redirects=True)
-                        if check_ssrf_response(resp.text, payload, f"URL param '{param}' at {page_url}"):
-                            break
-                    except Exception:
-                        pass
+        jobs = [(p, payload, detect) for p in self._form_points() for payload in ssrf_payloads]
+        jobs += [(p, payload, detect) for p in self._query_points(limit=15) for payload in ssrf_payloads[:2]]
+        for point, payload, indicator, _ in self.dispatcher.run(jobs, timeout=8):
+            if point.kind == "form":
+                context = f"Form field '{point.param}' at {point.url}"
+            else:
+                context = f"URL param '{point.param}' at {point.source}"
+            self.add_finding(
+                "CRITICAL", "SSRF",
+                "Cloud Metadata Endpoint Accessible via SSRF",
+                f"Context: {context}\nPayload: {payload}\nCloud metadata indicator: '{indicator}'",
+                "Block outbound requests to internal/cloud metadata addresses. Use outbound allowlists."
+            )
 
     # ─── Module 13: SSTI Testing ───────────────────────────────────────
     def scan_ssti(self):
@@ -827,72 +3307,34 @@ class TupiSecScanner:
             ("{{7*'7'}}", "7777777"),
         ]
 
-        def check_ssti(resp_text, payload, expected, context):
-            if expected in resp_text:
-                self.add_finding(
-                    "CRITICAL", "SSTI",
-                    f"Server-Side Template Injection — {context}",
-                    f"Payload: {payload}\nResult '{expected}' found in response. RCE may be possible.",
-                    "Never render user input through template engines. Use safe rendering or sandboxing."
-                )
-                return True
-            return False
+        expected_for = dict(payloads)
 
-        # Test form fields
-        for form_data in self.discovered_forms:
-            action = form_data.get("action", "") or self.target_url
-            if not action.startswith("http"):
-                action = urllib.parse.urljoin(self.target_url, action)
-            method = form_data.get("method", "GET").upper()
-            fields = form_data.get("fields", {})
-            for field_name, field_info in fields.items():
-                if field_info.get("type") in ("hidden", "submit", "button", "image", "password"):
-                    continue
-                for payload, expected in payloads:
-                    test_data = {fn: (payload if fn == field_name else fi.get("value", "test"))
-                                 for fn, fi in fields.items()}
-                    try:
-                        if method == "POST":
-                            resp = self.session.post(action, data=test_data, timeout=TIMEOUT, allow_redirects=True)
-                        else:
-                            resp = self.session.get(action, params=test_data, timeout=TIMEOUT, allow_redirects=True)
-                        if check_ssti(resp.text, payload, expected, f"field '{field_name}' at {action}"):
-                            break
-                    except Exception:
-                        pass
+        def detect(resp, payload):
+            return expected_for[payload] in resp.text
 
-        # Test URL parameters
-        for page_url in list(self.discovered_urls)[:15]:
-            parsed = urllib.parse.urlparse(page_url)
-            if not parsed.query:
-                continue
-            params = dict(urllib.parse.parse_qsl(parsed.query))
-            for param in list(params.keys()):
-                for payload, expected in payloads:
-                    q = dict(params)
-                    q[param] = payload
-                    test_url = urllib.parse.urlunparse(parsed._replace(query=urllib.parse.urlencode(q)))
-                    try:
-                        resp = self.session.get(test_url, timeout=TIMEOUT, allow_redirects=True)
-                        if check_ssti(resp.text, payload, expected, f"param '{param}' at {page_url}"):
-                            break
-                    except Exception:
-                        pass
+        points = self._form_points(skip_types=SKIP_FIELD_TYPES + ("password",)) + self._query_points(limit=15)
+        jobs = [(p, payload, detect) for p in points for payload, _ in payloads]
+        for point, payload, _, _ in self.dispatcher.run(jobs):
+            if point.kind == "form":
+                context = f"field '{point.param}' at {point.url}"
+            else:
+                context = f"param '{point.param}' at {point.source}"
+            self.add_finding(
+                "CRITICAL", "SSTI",
+                f"Server-Side Template Injection — {context}",
+                f"Payload: {payload}\nResult '{expected_for[payload]}' found in response. RCE may be possible.",
+                "Never render user input through template engines. Use safe rendering or sandboxing."
+            )
 
     # ─── Module 14: Advanced CORS Testing ─────────────────────────────
     def scan_cors_advanced(self):
         self.log("\n[*] Advanced CORS testing...", Fore.GREEN)
         evil_origin = "https://evil.tupisec-test.io"
-        urls_to_test = [self.target_url] + list(self.discovered_urls)[:5]
+        urls_to_test = [self.target_url] + list(self.test_urls())[:5]
 
         for test_url in urls_to_test:
             try:
-                resp = self.session.get(
-                    test_url,
-                    timeout=TIMEOUT,
-                    headers={"Origin": evil_origin},
-                    allow_redirects=True,
-                )
+                resp = self.cached_get(test_url, headers={"Origin": evil_origin})
                 acao = resp.headers.get("Access-Control-Allow-Origin", "")
                 acac = resp.headers.get("Access-Control-Allow-Credentials", "").lower().strip()
 
@@ -934,20 +3376,7 @@ class TupiSecScanner:
         hostname = self.parsed.hostname or self.parsed.netloc
         apex = self._get_apex_domain(hostname)
 
-        wordlist = [
-            "www", "api", "admin", "dev", "staging", "mail", "ftp", "app", "portal",
-            "vpn", "auth", "dashboard", "panel", "beta", "shop", "blog", "help",
-            "status", "cdn", "docs", "git", "jenkins", "jira", "smtp", "ns1", "ns2",
-            "db", "backup", "monitor", "metrics", "grafana", "kibana", "test", "qa",
-            "uat", "prod", "internal", "remote", "support", "demo", "login", "webmail",
-            "m", "mobile", "static", "assets", "img", "images", "media", "upload",
-            "files", "download", "secure", "dev2", "stage", "sandbox", "preview",
-            "api2", "v2", "legacy", "old", "new", "infra", "ops", "cloud",
-            "proxy", "lb", "waf", "gitlab", "wiki", "confluence", "vault",
-            "elastic", "logstash", "prom", "alerts", "logs", "search", "sso", "id",
-            "account", "accounts", "billing", "payment", "store", "forum",
-            "community", "partner", "careers",
-        ]
+        wordlist = SUBDOMAIN_WORDS
 
         takeover_patterns = [
             ("github.io", "there isn't a github pages site here"),
@@ -960,96 +3389,115 @@ class TupiSecScanner:
             ("fastly.net", "fastly error: unknown domain"),
         ]
 
+        takeover_matcher = PatternMatcher([p for _, p in takeover_patterns])
+
         try:
-            import dns.resolver
+            resolver = DNSResolverPool(self._nameservers, workers=self._dns_workers, cache=self.lookup_cache)
         except ImportError:
             self.log("  [!] dnspython not available, skipping subdomain enumeration", Fore.YELLOW)
             return
 
         # Detect wildcard DNS (e.g. *.tupisa.com.py → same IP for any subdomain)
-        import random as _random
-        import string as _string
-        wildcard_ips = set()
-        for _ in range(2):
-            probe = "wc-" + "".join(_random.choices(_string.ascii_lowercase + _string.digits, k=12))
-            try:
-                wc_ans = dns.resolver.resolve(f"{probe}.{apex}", "A", lifetime=3)
-                for r in wc_ans:
-                    wildcard_ips.add(r.to_text())
-            except Exception:
-                pass
+        wildcard_ips = self._detect_wildcard(resolver, apex)
         if wildcard_ips:
             self.log(f"  [!] Wildcard DNS detected → {', '.join(wildcard_ips)}", Fore.YELLOW)
             self.log(f"      Subdomains resolving to these IPs will be filtered as false positives.", Fore.YELLOW)
 
-        self.log(f"  Testing {len(wordlist)} candidates for {apex}...", Fore.CYAN)
-
-        for sub in wordlist:
-            fqdn = f"{sub}.{apex}"
-            try:
-                answers = dns.resolver.resolve(fqdn, "A", lifetime=3)
-                ips = [r.to_text() for r in answers]
-                ip = ips[0] if ips else ""
-
+        def candidates():
+            builtin = set(wordlist)
+            extra = ()
+            if self._subdomain_wordlist:
+                extra = (w.lower().strip(".") for w in iter_wordlist(self._subdomain_wordlist))
+            for word in itertools.chain(wordlist, (w for w in extra if w not in builtin)):
+                if self.cancelled.is_set():
+                    return  # stop feeding the resolver; lookups in flight drain
+                yield word
+
+        extra = f" + wordlist {self._subdomain_wordlist}" if self._subdomain_wordlist else ""
+        self.log(f"  Testing {len(wordlist)} candidates{extra} for {apex} "
+                 f"({resolver.workers} concurrent lookups)...", Fore.CYAN)
+
+        def probe(fqdn):
+            if self.cancelled.is_set():
+                return 0, {}
+            for scheme in ("https", "http"):
+                try:
+                    resp = self.session.get(f"{scheme}://{fqdn}", timeout=5, allow_redirects=True)
+                    return resp.status_code, takeover_matcher.find_all(resp)
+                except Exception:
+                    pass
+            return 0, {}
+
+        # Resolved names stream straight into the HTTP prober
+        resolved = []
+        with ContextThreadPool(max_workers=SUBDOMAIN_PROBE_WORKERS) as probe_pool:
+            for fqdn, records in resolver.resolve_many(f"{sub}.{apex}" for sub in candidates()):
+                ips = records["A"] + records["AAAA"]
+                if not ips:
+                    continue
                 # Skip wildcard matches — all IPs hit the catch-all record
                 if wildcard_ips and set(ips) <= wildcard_ips:
                     continue
+                resolved.append((fqdn, ips, records["CNAME"], probe_pool.submit(probe, fqdn)))
 
-                status_code = 0
-                takeover_risk = False
-                resp_body = ""
-
-                for scheme in ("https", "http"):
-                    try:
-                        resp = self.session.get(f"{scheme}://{fqdn}", timeout=5, allow_redirects=True)
-                        status_code = resp.status_code
-                        resp_body = resp.text.lower()
-                        break
-                    except Exception:
-                        pass
+        for fqdn, ips, cname_target, fut in sorted(resolved, key=lambda r: r[0]):
+            ip = ips[0]
+            status_code, body_hits = fut.result()
+            takeover_risk = False
 
+            if cname_target:
                 # Check for takeover via CNAME
-                try:
-                    cname_answers = dns.resolver.resolve(fqdn, "CNAME", lifetime=3)
-                    cname_target = str(cname_answers[0].target).lower()
-                    for svc_domain, svc_pattern in takeover_patterns:
-                        if svc_domain in cname_target and svc_pattern in resp_body:
-                            takeover_risk = True
-                            self.add_finding(
-                                "CRITICAL", "Subdomain Takeover",
-                                f"Subdomain takeover risk: {fqdn}",
-                                f"CNAME → {cname_target}\nUnclaimed service pattern: '{svc_pattern}'",
-                                f"Claim the {svc_domain} resource or remove the CNAME record."
-                            )
-                            break
-                except Exception:
-                    # No CNAME — check body directly
-                    for svc_domain, svc_pattern in takeover_patterns:
-                        if svc_pattern in resp_body:
-                            takeover_risk = True
-                            self.add_finding(
-                                "CRITICAL", "Subdomain Takeover",
-                                f"Subdomain takeover risk: {fqdn}",
-                                f"Pattern '{svc_pattern}' found in HTTP response.",
-                                "Remove the DNS record or claim the service resource."
-                            )
-                            break
-
-                entry = {"subdomain": fqdn, "ip": ip, "status": status_code, "takeover_risk": takeover_risk}
-                self.subdomains.append(entry)
-                self.add_finding(
-                    "INFO", "Subdomain Discovery",
-                    f"Subdomain found: {fqdn}",
-                    f"IP: {ip}, HTTP Status: {status_code}",
-                    "Review all discovered subdomains for unnecessary exposure."
-                )
-                self.log(f"  [+] {fqdn} → {ip} (HTTP {status_code})", Fore.CYAN)
+                for svc_domain, svc_pattern in takeover_patterns:
+                    if svc_domain in cname_target and svc_pattern in body_hits:
+                        takeover_risk = True
+                        self.add_finding(
+                            "CRITICAL", "Subdomain Takeover",
+                            f"Subdomain takeover risk: {fqdn}",
+                            f"CNAME → {cname_target}\nUnclaimed service pattern: '{svc_pattern}'",
+                            f"Claim the {svc_domain} resource or remove the CNAME record."
+                        )
+                        break
+            else:
+                # No CNAME — check body directly
+                for svc_domain, svc_pattern in takeover_patterns:
+                    if svc_pattern in body_hits:
+                        takeover_risk = True
+                        self.add_finding(
+                            "CRITICAL", "Subdomain Takeover",
+                            f"Subdomain takeover risk: {fqdn}",
+                            f"Pattern '{svc_pattern}' found in HTTP response.",
+                            "Remove the DNS record or claim the service resource."
+                        )
+                        break
 
-            except Exception:
-                pass
+            entry = {"subdomain": fqdn, "ip": ip, "status": status_code, "takeover_risk": takeover_risk}
+            self.subdomains.append(entry)
+            self.emit_event("subdomain", entry)
+            self.add_finding(
+                "INFO", "Subdomain Discovery",
+                f"Subdomain found: {fqdn}",
+                f"IP: {ip}, HTTP Status: {status_code}",
+                "Review all discovered subdomains for unnecessary exposure."
+            )
 
         self.log(f"  Discovered {len(self.subdomains)} subdomains", Fore.CYAN)
 
+    def _detect_wildcard(self, resolver, apex):
+        """IPs that random labels under ``apex`` resolve to; looked up once per apex."""
+        with self._lock:
+            if apex in self._wildcard_ips:
+                return self._wildcard_ips[apex]
+        import random as _random
+        import string as _string
+        probes = ["wc-" + "".join(_random.choices(_string.ascii_lowercase + _string.digits, k=12)) + f".{apex}"
+                  for _ in range(2)]
+        wildcard_ips = set()
+        for _, records in resolver.resolve_many(probes):
+            wildcard_ips.update(records["A"] + records["AAAA"])
+        with self._lock:
+            self._wildcard_ips[apex] = wildcard_ips
+        return wildcard_ips
+
     # ─── Module 16: Parameter Fuzzing ─────────────────────────────────
     def scan_param_fuzz(self):
         self.log("\n[*] Fuzzing for hidden/undocumented parameters...", Fore.GREEN)
@@ -1089,7 +3537,9 @@ class TupiSecScanner:
             "root:", "/etc/passwd", "sh: ", "permission denied",
         ]
 
-        urls_to_test = [self.target_url] + list(self.discovered_urls)[:8]
+        error_matcher = PatternMatcher(ERROR_PATTERNS)
+
+        urls_to_test = [self.target_url] + list(self.test_urls())[:8]
         tested_combos = set()
 
         for page_url in urls_to_test:
@@ -1097,13 +3547,14 @@ class TupiSecScanner:
             existing_params = set(dict(urllib.parse.parse_qsl(parsed.query)).keys())
 
             try:
-                baseline_resp = self.session.get(page_url, timeout=8, allow_redirects=True)
+                baseline_resp = self.cached_get(page_url, timeout=8)
                 baseline_status = baseline_resp.status_code
                 baseline_len = len(baseline_resp.content)
-                baseline_text = baseline_resp.text.lower()
+                baseline_errors = error_matcher.find_all(baseline_resp)
             except Exception:
                 continue
 
+            pending = []
             for param in FUZZ_PARAMS:
                 if param in existing_params:
                     continue
@@ -1112,32 +3563,38 @@ class TupiSecScanner:
                 if combo_key in tested_combos:
                     continue
                 tested_combos.add(combo_key)
+                pending.append(param)
 
-                for val in FUZZ_VALUES:
+            # One concurrent round per value; params that already produced a finding drop out
+            for val in FUZZ_VALUES:
+                jobs = []
+                for param in pending:
                     test_params = dict(urllib.parse.parse_qsl(parsed.query))
                     test_params[param] = val
                     test_url = urllib.parse.urlunparse(
                         parsed._replace(query=urllib.parse.urlencode(test_params))
-                    )
-                    try:
-                        resp = self.session.get(test_url, timeout=8, allow_redirects=True)
-                        fuzz_status = resp.status_code
-                        fuzz_len = len(resp.content)
-                        fuzz_text = resp.text.lower()
-                    except Exception:
+                    )
+                    jobs.append({"url": test_url, "timeout": 8})
+                responses = self.fetch_many(jobs)
+
+                still_pending = []
+                for param, resp in zip(pending, responses):
+                    if isinstance(resp, Exception):
+                        still_pending.append(param)
                         continue
+                    fuzz_status = resp.status_code
+                    fuzz_len = len(resp.content)
 
                     status_changed = fuzz_status != baseline_status and fuzz_status not in (429, 503)
                     size_diff = abs(fuzz_len - baseline_len)
                     size_changed = size_diff > 300 and (size_diff / (baseline_len + 1)) > 0.20
 
-                    error_found = None
-                    for pattern in ERROR_PATTERNS:
-                        if pattern in fuzz_text and pattern not in baseline_text:
-                            error_found = pattern
-                            break
+                    fuzz_errors = error_matcher.find_all(resp)
+                    error_found = next((p for p in ERROR_PATTERNS
+                                        if p in fuzz_errors and p not in baseline_errors), None)
 
                     if not (status_changed or size_changed or error_found):
+                        still_pending.append(param)
                         continue
 
                     # Classify finding
@@ -1181,7 +3638,7 @@ class TupiSecScanner:
                         "Remove or restrict undocumented parameters. "
                         "Ensure all parameters are authorized and properly sanitized."
                     )
-                    break  # One finding per param per URL is enough
+                pending = still_pending  # One finding per param per URL is enough
 
         self.log(f"  Found {len(self.fuzz_results)} interesting parameters", Fore.CYAN)
 
@@ -1190,51 +3647,62 @@ class TupiSecScanner:
         self.log("\n[*] Scanning for sensitive data exposure...", Fore.GREEN)
         self.sensitive_findings = []
 
-        PATTERNS = [
-            ("AWS Access Key",        r"AKIA[0-9A-Z]{16}",                                                    "CRITICAL"),
-            ("Private Key",           r"-----BEGIN\s+(?:RSA\s+|EC\s+|DSA\s+|OPENSSH\s+)?PRIVATE KEY-----",   "CRITICAL"),
-            ("DB Connection String",  r"(?i)(?:mysql|postgresql|postgres|mongodb|redis):\/\/[^:]+:[^@\s]+@",  "CRITICAL"),
-            ("Google API Key",        r"AIza[0-9A-Za-z_\-]{35}",                                              "HIGH"),
-            ("Slack Token",           r"xox[baprs]-[0-9a-zA-Z\-]{10,}",                                       "HIGH"),
-            ("Bearer Token",          r"Bearer\s+[a-zA-Z0-9_\-\.]{20,}",                                      "HIGH"),
-            ("API Key in source",     r"(?i)(?:api[_\-]?key|apikey)\s*[:=]\s*['\"][a-zA-Z0-9_\-]{20,}['\"]", "HIGH"),
-            ("Hardcoded Password",    r"(?i)(?:password|passwd|pwd)\s*[:=]\s*['\"][^'\"]{6,}['\"]",           "HIGH"),
-            ("JWT Token",             r"eyJ[a-zA-Z0-9_-]+\.[a-zA-Z0-9_-]+\.[a-zA-Z0-9_-]*",                  "MEDIUM"),
-            ("Internal IP",           r"(?<!\d)(?:10\.\d{1,3}\.\d{1,3}\.\d{1,3}|172\.(?:1[6-9]|2\d|3[01])\.\d{1,3}\.\d{1,3}|192\.168\.\d{1,3}\.\d{1,3})(?!\d)", "MEDIUM"),
-            ("Email Address",         r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}",                   "INFO"),
-        ]
+        urls_to_scan = self._secret_targets()
+        self.log(f"  Streaming {len(urls_to_scan)} HTML/JS/JSON resources through the secret scanner", Fore.CYAN)
+        secret_scanner = SecretScanner()
 
-        urls_to_scan = [self.target_url] + list(self.discovered_urls)[:15]
-        reported = set()
+        with ContextThreadPool(max_workers=SECRET_SCAN_WORKERS) as pool:
+            results = list(pool.map(lambda u: self._scan_secrets(u, secret_scanner), urls_to_scan))
 
-        for url in urls_to_scan:
-            try:
-                resp = self.session.get(url, timeout=TIMEOUT, allow_redirects=True)
-                body = resp.text
-                for name, pattern, severity in PATTERNS:
-                    matches = re.findall(pattern, body)
-                    if not matches:
-                        continue
-                    key = (url, name)
-                    if key in reported:
-                        continue
-                    reported.add(key)
-                    sample = str(matches[0])
-                    if severity in ("CRITICAL", "HIGH") and len(sample) > 12:
-                        sample = sample[:6] + "***" + sample[-4:]
-                    self.sensitive_findings.append({"url": url, "type": name, "severity": severity})
-                    self.add_finding(
-                        severity, "Sensitive Data Exposure",
-                        f"{name} found in response",
-                        f"URL: {url}\nPattern: {name}\nSample: {sample}",
-                        "Remove sensitive data from client-facing responses. "
-                        "Use environment variables and secrets managers for credentials."
-                    )
-            except Exception:
-                pass
+        for url, hits in zip(urls_to_scan, results):
+            for name, severity, offset, sample in hits:
+                if severity in ("CRITICAL", "HIGH") and len(sample) > 12:
+                    sample = sample[:6] + "***" + sample[-4:]
+                self.sensitive_findings.append({"url": url, "type": name, "severity": severity, "offset": offset})
+                self.add_finding(
+                    severity, "Sensitive Data Exposure",
+                    f"{name} found in response",
+                    f"URL: {url}\nPattern: {name}\nOffset: {offset}\nSample: {sample}",
+                    "Remove sensitive data from client-facing responses. "
+                    "Use environment variables and secrets managers for credentials."
+                )
 
         self.log(f"  Found {len(self.sensitive_findings)} sensitive data issues", Fore.CYAN)
 
+    def _secret_targets(self):
+        """Target plus every crawled same-host HTML page and JS/JSON resource."""
+        urls = [self.target_url]
+        for url in sorted(self.test_urls()):
+            path = urllib.parse.urlparse(url).path.lower()
+            if path.endswith(SECRET_EXTENSIONS) or not path.endswith(STATIC_EXTENSIONS):
+                urls.append(url)
+        return list(dict.fromkeys(urls))
+
+    def _scan_secrets(self, url, secret_scanner):
+        """Scan one resource; reuses a cached page, otherwise streams it without caching."""
+        try:
+            cached = self.response_cache.lookup(ResponseCache.make_key(url))
+            if cached is not None:
+                content = cached.content[:SECRET_MAX_BYTES]
+                chunks = (content[i:i + SECRET_CHUNK_BYTES] for i in range(0, len(content), SECRET_CHUNK_BYTES))
+                return list(secret_scanner.scan_chunks(chunks, cached.encoding or "utf-8"))
+
+            with self.session.get(url, timeout=TIMEOUT, stream=True) as resp:
+                ctype = resp.headers.get("Content-Type", "").lower()
+                if ctype and not any(t in ctype for t in SECRET_CONTENT_TYPES):
+                    return []
+
+                def chunks():
+                    read = 0
+                    for chunk in resp.iter_content(SECRET_CHUNK_BYTES):
+                        yield chunk
+                        read += len(chunk)
+                        if read >= SECRET_MAX_BYTES:
+                            break
+                return list(secret_scanner.scan_chunks(chunks(), resp.encoding or "utf-8"))
+        except Exception:
+            return []
+
     # ─── Module 18: JWT Security Testing ──────────────────────────────
     def scan_jwt(self):
         self.log("\n[*] Testing JWT security...", Fore.GREEN)
@@ -1253,7 +3721,7 @@ class TupiSecScanner:
 
         jwts_found = []
         try:
-            resp = self.session.get(self.target_url, timeout=TIMEOUT)
+            resp = self.cached_get(self.target_url)
             for cookie in self.session.cookies:
                 m = jwt_re.search(cookie.value)
                 if m:
@@ -1318,7 +3786,7 @@ class TupiSecScanner:
                         json.dumps({"alg": "none", "typ": "JWT"}).encode()
                     ).rstrip(b"=").decode()
                     none_token = f"{none_hdr}.{parts[1]}."
-                    base_resp = self.session.get(self.target_url, timeout=8)
+                    base_resp = self.cached_get(self.target_url, timeout=8)
                     test_resp = self.session.get(
                         self.target_url,
                         headers={"Authorization": f"Bearer {none_token}"},
@@ -1366,7 +3834,7 @@ class TupiSecScanner:
         BURST = 15
         endpoints = []
 
-        for form in self.discovered_forms:
+        for form in self.test_forms():
             fields = form.get("fields", {})
             has_pwd = any(f.get("type") == "password" for f in fields.values())
             has_user = any(k.lower() in ("user", "username", "email", "login") for k in fields)
@@ -1376,7 +3844,7 @@ class TupiSecScanner:
                     action = urllib.parse.urljoin(self.target_url, action)
                 endpoints.append((action, form.get("method", "GET").upper(), fields))
 
-        for url in self.discovered_urls:
+        for url in self.test_urls():
             if any(x in url for x in ("/login", "/auth", "/api/", "/signin", "/token")):
                 endpoints.append((url, "GET", {}))
 
@@ -1398,7 +3866,7 @@ class TupiSecScanner:
                 except Exception:
                     return 0
 
-            with concurrent.futures.ThreadPoolExecutor(max_workers=10) as ex:
+            with ContextThreadPool(max_workers=10) as ex:
                 codes = list(ex.map(fire, range(BURST)))
 
             throttled = sum(1 for c in codes if c == 429)
@@ -1422,53 +3890,43 @@ class TupiSecScanner:
             self.log("  Site is HTTP — mixed content check N/A.", Fore.YELLOW)
             return
 
-        ACTIVE_TAGS  = {"script": "src", "iframe": "src", "object": "data", "embed": "src"}
-        PASSIVE_TAGS = {"img": "src", "audio": "src", "video": "src",
-                        "source": "src", "link": "href"}
         reported = set()
 
-        for url in [self.target_url] + list(self.discovered_urls)[:10]:
+        for url in [self.target_url] + list(self.test_urls())[:10]:
             if not url.startswith("https"):
                 continue
             try:
-                resp = self.session.get(url, timeout=TIMEOUT, allow_redirects=True)
-                soup = BeautifulSoup(resp.text, "html.parser")
-
-                for tag_name, attr in ACTIVE_TAGS.items():
-                    for tag in soup.find_all(tag_name):
-                        src = tag.get(attr, "")
-                        if src.startswith("http://") and (url, src) not in reported:
-                            reported.add((url, src))
-                            self.add_finding(
-                                "HIGH", "Mixed Content",
-                                f"Active mixed content: <{tag_name}> loaded over HTTP",
-                                f"Page: {url}\nResource: {src}",
-                                "Change all resource URLs to HTTPS or use protocol-relative URLs (//)."
-                            )
+                info = self.page_info(self.cached_get(url))
 
-                for tag_name, attr in PASSIVE_TAGS.items():
-                    for tag in soup.find_all(tag_name):
-                        src = tag.get(attr, "")
-                        if src.startswith("http://") and (url, src) not in reported:
-                            reported.add((url, src))
-                            self.add_finding(
-                                "MEDIUM", "Mixed Content",
-                                f"Passive mixed content: <{tag_name}> loaded over HTTP",
-                                f"Page: {url}\nResource: {src}",
-                                "Change all resource URLs to HTTPS."
-                            )
+                for tag_name, src, kind in info["mixed_content"]:
+                    if (url, src) in reported:
+                        continue
+                    reported.add((url, src))
+                    if kind == "active":
+                        self.add_finding(
+                            "HIGH", "Mixed Content",
+                            f"Active mixed content: <{tag_name}> loaded over HTTP",
+                            f"Page: {url}\nResource: {src}",
+                            "Change all resource URLs to HTTPS or use protocol-relative URLs (//)."
+                        )
+                    else:
+                        self.add_finding(
+                            "MEDIUM", "Mixed Content",
+                            f"Passive mixed content: <{tag_name}> loaded over HTTP",
+                            f"Page: {url}\nResource: {src}",
+                            "Change all resource URLs to HTTPS."
+                        )
 
-                for style in soup.find_all("style"):
-                    if style.string and "http://" in style.string:
-                        key = (url, "inline-style")
-                        if key not in reported:
-                            reported.add(key)
-                            self.add_finding(
-                                "MEDIUM", "Mixed Content",
-                                "Mixed content in inline CSS",
-                                f"Page: {url}\nInline <style> contains http:// URLs.",
-                                "Update CSS url() references to use HTTPS."
-                            )
+                if info["inline_style_http"]:
+                    key = (url, "inline-style")
+                    if key not in reported:
+                        reported.add(key)
+                        self.add_finding(
+                            "MEDIUM", "Mixed Content",
+                            "Mixed content in inline CSS",
+                            f"Page: {url}\nInline <style> contains http:// URLs.",
+                            "Update CSS url() references to use HTTPS."
+                        )
             except Exception:
                 pass
 
@@ -1486,12 +3944,14 @@ class TupiSecScanner:
             {"query": "{ __schema { types { name } } }"},
         ])
         HDR = {"Content-Type": "application/json", "Accept": "application/json"}
+        # Catch-all APIs answer any POST the same way; compare against that answer
+        profile = self.soft_404_profile("POST", data=INTROSPECT, headers=HDR)
 
         for path in PATHS:
             url = f"{self.base_url}/{path}"
             try:
                 resp = self.session.post(url, data=INTROSPECT, headers=HDR, timeout=8)
-                if resp.status_code not in (200, 400):
+                if resp.status_code not in (200, 400) or profile.is_soft_404(resp, path):
                     continue
                 try:
                     data = resp.json()
@@ -1546,26 +4006,28 @@ class TupiSecScanner:
         INDICATORS = ["root:x:", "root:*:", "/bin/bash", "/sbin/nologin", "127.0.0.1\t"]
         XML_HDR    = {"Content-Type": "application/xml"}
 
-        candidates = [u for u in [self.target_url] + list(self.discovered_urls)[:20]
+        candidates = [u for u in [self.target_url] + list(self.test_urls())[:20]
                       if any(x in urllib.parse.urlparse(u).path.lower()
                              for x in ["xml", "soap", "rpc", "upload", "import", "parse", "api"])]
         candidates.append(self.target_url)
         candidates = list(dict.fromkeys(candidates))[:8]
 
+        matcher = PatternMatcher(INDICATORS, ignore_case=False)
+
         for url in candidates:
             for payload in PAYLOADS:
                 try:
                     resp = self.session.post(url, data=payload, headers=XML_HDR, timeout=8)
-                    for indicator in INDICATORS:
-                        if indicator in resp.text:
-                            self.add_finding(
-                                "CRITICAL", "XXE",
-                                "XML External Entity — local file read",
-                                f"URL: {url}\nIndicator in response: '{indicator}'",
-                                "Disable external entity processing in XML parser. "
-                                "Use FEATURE_SECURE_PROCESSING or disable DOCTYPE declarations."
-                            )
-                            return
+                    indicator = matcher.first(resp)
+                    if indicator:
+                        self.add_finding(
+                            "CRITICAL", "XXE",
+                            "XML External Entity — local file read",
+                            f"URL: {url}\nIndicator in response: '{indicator}'",
+                            "Disable external entity processing in XML parser. "
+                            "Use FEATURE_SECURE_PROCESSING or disable DOCTYPE declarations."
+                        )
+                        return
                 except Exception:
                     pass
 
@@ -1575,12 +4037,12 @@ class TupiSecScanner:
         self.broken_links = []
 
         external = {}
-        for page_url in [self.target_url] + list(self.discovered_urls)[:10]:
+        for page_url in [self.target_url] + list(self.test_urls())[:10]:
             try:
-                resp = self.session.get(page_url, timeout=TIMEOUT, allow_redirects=True)
-                soup = BeautifulSoup(resp.text, "html.parser")
-                for tag in soup.find_all(["a", "script", "link", "iframe"]):
-                    href = tag.get("href") or tag.get("src") or ""
+                info = self.page_info(self.cached_get(page_url))
+                for tag, href in info["links"]:
+                    if tag not in ("a", "script", "link", "iframe"):
+                        continue
                     if href.startswith("http") and self.parsed.netloc not in href:
                         domain = urllib.parse.urlparse(href).netloc
                         if domain:
@@ -1600,7 +4062,7 @@ class TupiSecScanner:
                 continue
             checked_domains.add(domain)
             try:
-                r = self.session.get(link, timeout=6, allow_redirects=True)
+                r = self.cached_get(link, timeout=6)
                 if r.status_code in (404, 410):
                     try:
                         socket.gethostbyname(domain)
@@ -1637,8 +4099,28 @@ class TupiSecScanner:
         try:
             import nmap
             nm = nmap.PortScanner()
+        except ImportError:
+            self.log("  [!] python-nmap not available, using socket scan", Fore.YELLOW)
+            self._socket_port_scan()
+            return
+        except Exception as e:
+            self.log(f"  [!] Port scan error: {e}", Fore.RED)
+            self._socket_port_scan()
+            return
+
+        # nmap can take minutes; let it overlap with the HTTP phases and
+        # collect it in wait_port_scan() before the report is written
+        self._port_thread = threading.Thread(target=self._nmap_scan, args=(nm,), daemon=True)
+        self._port_thread.start()
+        self.log("  nmap running in background", Fore.CYAN)
+
+    def _nmap_scan(self, nm):
+        try:
             hostname = self.parsed.hostname
-            nm.scan(hostname, arguments="-T4 -F --top-ports 100")
+            if self._ports:
+                nm.scan(hostname, arguments=f"-T4 -p {format_ports(self._ports)}")
+            else:
+                nm.scan(hostname, arguments="-T4 -F --top-ports 100")
 
             for host in nm.all_hosts():
                 for proto in nm[host].all_protocols():
@@ -1654,33 +4136,42 @@ class TupiSecScanner:
                                     f"Port {port}/{proto} open: {service}",
                                     f"Service: {service} {version}",
                                     "Ensure only necessary ports are exposed.")
-        except ImportError:
-            self.log("  [!] python-nmap not available, using socket scan", Fore.YELLOW)
-            self._socket_port_scan()
         except Exception as e:
             self.log(f"  [!] Port scan error: {e}", Fore.RED)
             self._socket_port_scan()
 
+    def wait_port_scan(self):
+        """Block until a background nmap scan started by scan_ports() is done."""
+        thread = self._port_thread
+        if thread is None:
+            return
+        while thread.is_alive() and not self.cancelled.is_set():
+            thread.join(0.2)
+        if not thread.is_alive():
+            self._port_thread = None
+
     def _socket_port_scan(self):
-        """Fallback port scan using sockets."""
-        common_ports = [21, 22, 23, 25, 53, 80, 110, 143, 443, 445, 993, 995,
-                        1433, 1521, 3306, 3389, 5432, 5900, 6379, 8080, 8443, 8888, 9090, 27017]
+        """Fallback port scan: concurrent asyncio TCP connects, findings reported as ports open."""
         hostname = self.parsed.hostname
-        for port in common_ports:
-            try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(2)
-                result = sock.connect_ex((hostname, port))
-                if result == 0:
-                    self.log(f"  Port {port}: OPEN", Fore.CYAN)
-                    if port not in (80, 443):
-                        self.add_finding("INFO", "Open Port",
-                            f"Port {port} is open",
-                            f"Host: {hostname}:{port}",
-                            "Ensure only necessary ports are exposed.")
-                sock.close()
-            except:
-                pass
+        ports = self._ports or COMMON_PORTS
+
+        def on_open(port):
+            self.log(f"  Port {port}: OPEN", Fore.CYAN)
+            if port not in (80, 443):
+                self.add_finding("INFO", "Open Port",
+                    f"Port {port} is open",
+                    f"Host: {hostname}:{port}",
+                    "Ensure only necessary ports are exposed.")
+
+        scan = tcp_connect_scan(hostname, ports, self._port_concurrency, PORT_TIMEOUT, on_open, self.cancelled)
+        try:
+            loop = self._loop
+            if loop is not None and loop.is_running():
+                asyncio.run_coroutine_threadsafe(scan, loop).result()
+            else:
+                asyncio.run(scan)
+        except Exception as e:
+            self.log(f"  [!] Port scan error: {e}", Fore.RED)
 
     # ─── Module 9: HTTP Methods Testing ───────────────────────────────
     def scan_methods(self):
@@ -1724,7 +4215,7 @@ class TupiSecScanner:
 
         found = False
 
-        for url in list(self.discovered_urls)[:25]:
+        for url in list(self.test_urls())[:25]:
             parsed = urllib.parse.urlparse(url)
             params = urllib.parse.parse_qs(parsed.query)
             if not params:
@@ -1774,7 +4265,7 @@ class TupiSecScanner:
 
         found = False
 
-        for url in list(self.discovered_urls)[:20]:
+        for url in list(self.test_urls())[:20]:
             parsed = urllib.parse.urlparse(url)
             params = urllib.parse.parse_qs(parsed.query)
 
@@ -1878,88 +4369,82 @@ class TupiSecScanner:
             {"$regex": ".*"},
         ]
 
+        error_matcher = PatternMatcher(NOSQL_ERRORS)
+
         # Query-string bracket notation payloads
         qs_suffixes = [("[$ne]", "1"), ("[$gt]", "0"), ("[$regex]", ".*")]
 
-        found = False
-
-        # Test login forms
-        for form_data in self.discovered_forms:
-            action = form_data.get("action") or self.target_url
-            if not action.startswith("http"):
-                action = urllib.parse.urljoin(self.target_url, action)
-            fields = form_data["fields"]
-            has_password = any("pass" in k.lower() or "pwd" in k.lower() for k in fields)
-            if not has_password:
+        # Test login forms: operator objects sent as JSON, other fields set to "test"
+        login_points = []
+        for point in self._form_points(skip_types=()):
+            if not any("pass" in k.lower() or "pwd" in k.lower() for k in point.params):
                 continue
-
-            try:
-                baseline = self.session.post(action, json={"username": "x", "password": "x"},
-                                             timeout=TIMEOUT, allow_redirects=False)
-            except:
-                baseline = None
-
-            for field_name in list(fields.keys())[:3]:
-                for payload in json_payloads:
-                    test_body = {k: (payload if k == field_name else "test") for k in fields}
-                    try:
-                        resp = self.session.post(action, json=test_body, timeout=TIMEOUT,
-                                                 allow_redirects=False)
-                        resp_lower = resp.text.lower()
-                        redirect_bypass = (resp.status_code in (302, 303)
-                                           and (baseline is None or baseline.status_code not in (302, 303)))
-                        if redirect_bypass:
-                            self.add_finding("CRITICAL", "NoSQL Injection",
-                                f"NoSQL authentication bypass via field '{field_name}'",
-                                f"POST {action} with operator payload returned redirect — possible login bypass.",
-                                "Validate and sanitize all inputs; use typed schemas to reject operator injection.")
-                            found = True
-                            break
-                        for err in NOSQL_ERRORS:
-                            if err in resp_lower:
-                                self.add_finding("HIGH", "NoSQL Injection",
-                                    "NoSQL error disclosure",
-                                    f"MongoDB/Mongoose error in response to POST {action}.",
-                                    "Disable detailed error messages and validate input types.")
-                                found = True
-                                break
-                    except:
-                        pass
-                if found:
-                    break
+            if list(point.params).index(point.param) >= 3:
+                continue
+            blank = {k: "test" for k in point.params}
+            login_points.append(InjectionPoint("form", "POST", point.url, point.param, blank,
+                                               point.field_type, point.source))
+
+        actions = sorted({p.url for p in login_points})
+        responses = self.fetch_many({"method": "POST", "url": action, "allow_redirects": False,
+                                     "json_body": {"username": "x", "password": "x"}} for action in actions)
+        baselines = {a: (None if isinstance(r, Exception) else r) for a, r in zip(actions, responses)}
+
+        jobs = []
+        for point in login_points:
+            def detect(resp, payload, action=point.url):
+                baseline = baselines.get(action)
+                if resp.status_code in (302, 303) and (baseline is None or baseline.status_code not in (302, 303)):
+                    return ("bypass", None)
+                err = error_matcher.first(resp)
+                return ("error", err) if err else None
+            jobs += [(point, payload, detect) for payload in json_payloads]
+
+        hits = self.dispatcher.run(jobs, per_group=True, encoding="json", allow_redirects=False)
+        for point, _, (kind, _), _ in hits:
+            if kind == "bypass":
+                self.add_finding("CRITICAL", "NoSQL Injection",
+                    f"NoSQL authentication bypass via field '{point.param}'",
+                    f"POST {point.url} with operator payload returned redirect — possible login bypass.",
+                    "Validate and sanitize all inputs; use typed schemas to reject operator injection.", page=point.source)
+            else:
+                self.add_finding("HIGH", "NoSQL Injection",
+                    "NoSQL error disclosure",
+                    f"MongoDB/Mongoose error in response to POST {point.url}.",
+                    "Disable detailed error messages and validate input types.", page=point.source)
+        found = bool(hits)
 
         # Test URL params with bracket notation
-        for url in list(self.discovered_urls)[:15]:
-            parsed = urllib.parse.urlparse(url)
-            params = urllib.parse.parse_qs(parsed.query)
-            if not params:
+        jobs = []
+        for point in self._query_points(limit=15):
+            if list(point.params).index(point.param) >= 3:
                 continue
             try:
-                baseline = self.session.get(url, timeout=TIMEOUT)
+                baseline = self.cached_get(point.source)
             except:
                 continue
-            for param in list(params.keys())[:3]:
-                for suffix, value in qs_suffixes:
-                    flat = {k: v[0] for k, v in params.items()}
-                    flat[f"{param}{suffix}"] = value
-                    try:
-                        resp = self.session.get(parsed._replace(query="").geturl(),
-                                                params=flat, timeout=TIMEOUT)
-                        if resp.status_code == 200 and baseline.status_code != 200:
-                            self.add_finding("HIGH", "NoSQL Injection",
-                                f"Possible NoSQL bypass via parameter '{param}'",
-                                f"URL: {url} — status changed {baseline.status_code}→200 with operator payload.",
-                                "Reject bracket notation in URL params; validate input types server-side.")
-                            found = True
-                        for err in NOSQL_ERRORS:
-                            if err in resp.text.lower():
-                                self.add_finding("HIGH", "NoSQL Injection",
-                                    f"NoSQL error disclosure in parameter '{param}'",
-                                    f"MongoDB/Mongoose error for param '{param}' at {url}.",
-                                    "Disable detailed error messages and validate input types.")
-                                found = True
-                    except:
-                        pass
+
+            def detect(resp, payload, baseline=baseline):
+                if resp.status_code == 200 and baseline.status_code != 200:
+                    return ("bypass", baseline.status_code)
+                err = error_matcher.first(resp)
+                return ("error", err) if err else None
+            for suffix, value in qs_suffixes:
+                jobs.append((point.derive(f"{point.param}{suffix}"), value, detect))
+
+        for point, _, (kind, status), _ in self.dispatcher.run(jobs):
+            param = point.param.split("[", 1)[0]
+            if kind == "bypass":
+                self.add_finding("HIGH", "NoSQL Injection",
+                    f"Possible NoSQL bypass via parameter '{param}'",
+                    f"URL: {point.source} — status changed {status}→200 with operator payload.",
+                    "Reject bracket notation in URL params; validate input types server-side.", page=point.source)
+            else:
+                self.add_finding("HIGH", "NoSQL Injection",
+                    f"NoSQL error disclosure in parameter '{param}'",
+                    f"MongoDB/Mongoose error for param '{param}' at {point.source}.",
+                    "Disable detailed error messages and validate input types.", page=point.source)
+            found = True
 
         if not found:
             self.log("  No NoSQL injection found.", Fore.YELLOW)
@@ -1975,67 +4460,50 @@ class TupiSecScanner:
             ("$(id)",  ["uid=", "root:", "daemon:"]),
             ("`id`",   ["uid=", "root:", "daemon:"]),
         ]
-        TIME_PAYLOADS = ["; sleep 5", "| sleep 5", "&& sleep 5", "$(sleep 5)"]
-
-        found = False
-
-        for form_data in self.discovered_forms:
-            action = form_data.get("action") or self.target_url
-            if not action.startswith("http"):
-                action = urllib.parse.urljoin(self.target_url, action)
-            method = form_data["method"]
-            fields = form_data["fields"]
-
-            for field_name, field_info in fields.items():
-                if field_info.get("type") in ("hidden", "submit", "button", "image", "checkbox", "radio"):
-                    continue
-
-                # Output-based detection
-                for payload, indicators in OUTPUT_PAYLOADS:
-                    test_data = {fn: (payload if fn == field_name else fi.get("value", "test"))
-                                 for fn, fi in fields.items()}
-                    try:
-                        if method == "POST":
-                            resp = self.session.post(action, data=test_data, timeout=TIMEOUT)
-                        else:
-                            resp = self.session.get(action, params=test_data, timeout=TIMEOUT)
-                        for indicator in indicators:
-                            if indicator in resp.text:
-                                self.add_finding("CRITICAL", "OS Command Injection",
-                                    f"Command injection in field '{field_name}'",
-                                    f"Indicator '{indicator}' found in response with payload: {payload}",
-                                    "Never pass user input to shell commands; use subprocess with argument lists.")
-                                found = True
-                                break
-                    except:
-                        pass
-                    if found:
-                        break
-
-                # Time-based detection (only if output-based didn't fire)
-                if not found:
-                    for payload in TIME_PAYLOADS:
-                        test_data = {fn: (payload if fn == field_name else fi.get("value", "test"))
-                                     for fn, fi in fields.items()}
-                        try:
-                            start = time.time()
-                            if method == "POST":
-                                self.session.post(action, data=test_data, timeout=12)
-                            else:
-                                self.session.get(action, params=test_data, timeout=12)
-                            elapsed = time.time() - start
-                            if elapsed >= 4.5:
-                                self.add_finding("CRITICAL", "OS Command Injection",
-                                    f"Blind command injection (time-based) in field '{field_name}'",
-                                    f"Response delayed ~{elapsed:.1f}s with payload: {payload}",
-                                    "Never pass user input to shell commands; use subprocess with argument lists.")
-                                found = True
-                                break
-                        except:
-                            pass
-
-                if found:
-                    break
+        TIME_PAYLOADS = ["; sleep {}", "| sleep {}", "&& sleep {}", "$(sleep {})"]
+
+        indicators_for = dict(OUTPUT_PAYLOADS)
+        points = self._form_points(skip_types=SKIP_FIELD_TYPES + ("checkbox", "radio"))
+
+        matcher = PatternMatcher({i for _, inds in OUTPUT_PAYLOADS for i in inds}, ignore_case=False)
+
+        # Output-based detection
+        def detect(resp, payload):
+            present = matcher.find_all(resp)
+            return next((i for i in indicators_for[payload] if i in present), None)
+
+        jobs = [(p, payload, detect) for p in points for payload, _ in OUTPUT_PAYLOADS]
+        hits = self.dispatcher.run(jobs)
+        for point, payload, indicator, _ in hits:
+            self.add_finding("CRITICAL", "OS Command Injection",
+                f"Command injection in field '{point.param}'",
+                f"Indicator '{indicator}' found in response with payload: {payload}",
+                "Never pass user input to shell commands; use subprocess with argument lists.", page=point.source)
+        found = bool(hits)
+
+        # Time-based detection on the fields output-based probes didn't confirm;
+        # sent outside the shared async pool, whose queueing would add noise
+        session = self.timing_session()
+
+        def measure(point, template, delay):
+            job = point.request(template.format(delay), timeout=self.request_timeout(point.url, extra=delay))
+            resp = session.request(job["method"], job["url"], params=job.get("params"), data=job.get("data"),
+                                   json=job.get("json_body"), timeout=job["timeout"],
+                                   allow_redirects=job["allow_redirects"])
+            return resp.elapsed.total_seconds()
+
+        confirmed = {point for point, _, _, _ in hits}
+        oracle = TimingOracle()
+        jobs = [(p, template, lambda template, delay, p=p: measure(p, template, delay))
+                for p in points if p not in confirmed for template in TIME_PAYLOADS]
+        for point, template, evidence in oracle.run(jobs):
+            self.add_finding("CRITICAL", "OS Command Injection",
+                f"Blind command injection (time-based) in field '{point.param}'",
+                f"Payload {template.format('N')!r} delayed responses by {evidence['extra']}s for requested "
+                f"delays of {evidence['delays']}s over {len(evidence['delays'])} interleaved rounds "
+                f"(t = {evidence['t']:.1f})",
+                "Never pass user input to shell commands; use subprocess with argument lists.", page=point.source)
+            found = True
 
         if not found:
             self.log("  No command injection found.", Fore.YELLOW)
@@ -2061,8 +4529,8 @@ class TupiSecScanner:
         for path in ADMIN_PATHS:
             url = f"{self.base_url}/{path}"
             try:
-                resp = self.session.get(url, timeout=TIMEOUT, allow_redirects=True)
-                if resp.status_code == 200:
+                resp = self.cached_get(url)
+                if resp.status_code == 200 and not self.is_soft_404(resp, path):
                     html_lower = resp.text.lower()
                     if "<form" in html_lower and ('type="password"' in html_lower or "type='password'" in html_lower):
                         found_panels.append((url, resp))
@@ -2075,27 +4543,27 @@ class TupiSecScanner:
             return
 
         for panel_url, panel_resp in found_panels:
-            soup = BeautifulSoup(panel_resp.text, "html.parser")
-            form = soup.find("form")
-            if not form:
+            forms = self.page_info(panel_resp)["forms"]
+            if not forms:
                 continue
+            form = forms[0]
 
-            action = form.get("action", "") or panel_url
+            action = form["action"] or panel_url
             if not action.startswith("http"):
                 action = urllib.parse.urljoin(panel_url, action)
-            method = (form.get("method") or "post").lower()
 
-            inputs = form.find_all("input")
             user_field = None
             pass_field = None
             hidden_fields = {}
-            for inp in inputs:
-                itype = (inp.get("type") or "text").lower()
-                iname = inp.get("name", "")
+            for inp in form["inputs"]:
+                if inp["tag"] != "input":
+                    continue
+                itype = (inp["type"] or "text").lower()
+                iname = inp["name"]
                 if not iname:
                     continue
                 if itype == "hidden":
-                    hidden_fields[iname] = inp.get("value", "")
+                    hidden_fields[iname] = inp["value"]
                 elif itype == "password":
                     pass_field = iname
                 elif itype in ("text", "email") and not user_field:
@@ -2136,40 +4604,226 @@ class TupiSecScanner:
             self.log("  No default credentials accepted.", Fore.YELLOW)
 
     # ─── Module 10: Crawl & Discover ──────────────────────────────────
-    def crawl(self, depth=2):
-        self.log("\n[*] Crawling for additional pages...", Fore.GREEN)
-        visited = set()
-        to_visit = {self.target_url}
-
-        for d in range(depth):
-            next_visit = set()
-            for url in to_visit:
-                if url in visited:
-                    continue
-                visited.add(url)
-                try:
-                    resp = self.session.get(url, timeout=TIMEOUT)
-                    soup = BeautifulSoup(resp.text, "html.parser")
+    def _add_form(self, form, page_url):
+        """Record a form for injection testing, skipping duplicates across pages."""
+        resolved = urllib.parse.urljoin(page_url, form["action"] or page_url)
+        key = (resolved, form["method"], tuple(sorted(form["fields"])))
+        with self._lock:
+            if key in self._form_keys:
+                return False
+            self._form_keys.add(key)
+            self.discovered_forms.append({
+                "action": form["action"] if page_url == self.target_url else resolved,
+                "method": form["method"],
+                "fields": form["fields"],
+                "url": page_url,
+            })
+        return True
+
+    def crawl(self, depth=None, max_pages=None):
+        depth = self._crawl_depth if depth is None else depth
+        max_pages = self._max_pages if max_pages is None else max_pages
+        self.log(f"\n[*] Crawling for additional pages (depth {depth}, max {max_pages} pages)...", Fore.GREEN)
+        visited = {self.target_url}
+        frontier = [self.target_url]
+        crawled = 0
+        start_level = 0
+        saved = self.cursor("crawl")
+        if saved:
+            visited, frontier = set(saved["visited"]), saved["frontier"]
+            crawled, start_level = saved["crawled"], saved["level"]
+            self.log(f"  Resuming at depth {start_level + 1} with {len(frontier)} queued pages", Fore.CYAN)
+        elif self._baseline is not None:
+            # Unchanged pages keep their baseline links and forms; changed ones are crawled again
+            changed = self._revalidate_baseline()
+            visited |= self._unchanged_pages | set(changed)
+            frontier += changed
+        host_slots = defaultdict(lambda: threading.BoundedSemaphore(CRAWL_PER_HOST))
+        slots_lock = threading.Lock()
+        started = time.time()
+        last_report = started
+
+        def fetch(url):
+            host = urllib.parse.urlparse(url).netloc
+            with slots_lock:
+                slot = host_slots[host]
+            with slot:
+                resp = self.cached_get(url)
+            if resp.status_code == 200:
+                self.page_validators[url] = page_validators(resp)
+            if "html" not in resp.headers.get("Content-Type", "html").lower():
+                return None
+            return self.page_info(resp)
+
+        with ContextThreadPool(max_workers=self._crawl_workers) as pool:
+            for level in range(start_level, depth):
+                budget = max_pages - crawled
+                if budget <= 0 or not frontier:
+                    break
+                self.set_cursor("crawl", {"level": level, "crawled": crawled,
+                                          "visited": sorted(visited), "frontier": frontier})
+                batch, frontier = frontier[:budget], []
+                futures = {pool.submit(fetch, url): url for url in batch}
+                for fut in concurrent.futures.as_completed(futures):
+                    url = futures[fut]
+                    crawled += 1
+                    try:
+                        info = fut.result()
+                    except Exception:
+                        continue
+                    if info is None:
+                        continue
 
-                    for tag in soup.find_all(["a", "form", "script", "link", "img", "iframe"]):
-                        href = tag.get("href") or tag.get("src") or tag.get("action") or ""
+                    for form in info["forms"]:
+                        self._add_form(form, url)
+
+                    for _, href in info["links"]:
                         if href and not href.startswith(("#", "javascript:", "mailto:", "tel:")):
                             full_url = urllib.parse.urljoin(url, href)
                             parsed = urllib.parse.urlparse(full_url)
                             # Only follow links on same domain
                             if parsed.netloc == self.parsed.netloc:
-                                self.discovered_urls.add(full_url)
-                                if full_url not in visited:
-                                    next_visit.add(full_url)
-                except:
-                    pass
-            to_visit = next_visit
-
+                                with self._lock:
+                                    new = full_url not in self.discovered_urls
+                                    self.discovered_urls.add(full_url)
+                                if new:
+                                    self.emit_event("url", {"url": full_url})
+                                if full_url not in visited and not parsed.path.lower().endswith(STATIC_EXTENSIONS):
+                                    visited.add(full_url)
+                                    frontier.append(full_url)
+
+                    now = time.time()
+                    if now - last_report >= 1.0:
+                        last_report = now
+                        rate = crawled / (now - started)
+                        self.emit_progress("crawl", f"Crawling site — {crawled} pages ({rate:.1f} pages/sec)",
+                                           "running", pages=crawled, pages_per_sec=round(rate, 2))
+
+        elapsed = max(time.time() - started, 1e-6)
+        rate = crawled / elapsed
+        self.emit_progress("crawl", f"Crawled {crawled} pages ({rate:.1f} pages/sec)",
+                           "running", pages=crawled, pages_per_sec=round(rate, 2))
+        self.log(f"  Crawled {crawled} pages in {elapsed:.1f}s ({rate:.1f} pages/sec), "
+                 f"{len(self.discovered_forms)} forms", Fore.CYAN)
         self.log(f"  Discovered {len(self.discovered_urls)} URLs", Fore.CYAN)
         for url in sorted(self.discovered_urls):
             self.log(f"    {url}", Fore.BLUE)
 
+    def load_baseline(self, report):
+        """Seed URLs, forms and tech stack from a previous JSON report of this target (--baseline)."""
+        if not isinstance(report, dict) or report.get("target") != self.target_url:
+            raise ValueError(f"Baseline report is not for {self.target_url}")
+        self._baseline = report
+        self.discovered_urls |= set(report.get("discovered_urls", []))
+        for form in report.get("discovered_forms", []):
+            self._add_form({"action": form["action"], "method": form["method"], "fields": form["fields"]},
+                           form["url"])
+        self.tech_stack.update(report.get("tech_stack", {}))
+
+    def _revalidate_baseline(self):
+        """Conditionally re-fetch the baseline's pages; returns the changed ones.
+
+        A 304, or a 200 with the same body hash, marks a page unchanged: its
+        links and forms are reused and active modules skip it. Baseline
+        findings whose injection page and quoted URLs are all unchanged
+        pages are carried over.
+        Changed bodies go into the response cache so the crawl reuses them.
+        """
+        validators = {u: v for u, v in self._baseline.get("page_validators", {}).items()
+                      if u != self.target_url}
+
+        def revalidate(url):
+            old = validators[url]
+            headers = {}
+            if old.get("etag"):
+                headers["If-None-Match"] = old["etag"]
+            if old.get("last_modified"):
+                headers["If-Modified-Since"] = old["last_modified"]
+            try:
+                resp = self.session.get(url, headers=headers, timeout=TIMEOUT)
+            except requests.RequestException:
+                return False
+            if resp.status_code == 304:
+                return True
+            self.response_cache.get_or_fetch(ResponseCache.make_key(url, None, True), lambda: resp)
+            return resp.status_code == 200 and page_validators(resp)["sha1"] == old.get("sha1")
+
+        changed = []
+        with ContextThreadPool(max_workers=self._crawl_workers) as pool:
+            for url, same in zip(validators, pool.map(revalidate, validators)):
+                if same:
+                    self._unchanged_pages.add(url)
+                    self.page_validators[url] = validators[url]
+                else:
+                    changed.append(url)
+
+        carried = 0
+        for d in self._baseline.get("findings", []):
+            urls = {u.rstrip(".,;:") for u in FINDING_URL_RE.findall(f"{d['title']} {d['detail']}")}
+            if d.get("page"):
+                urls.add(d["page"])
+            if not urls or not urls <= self._unchanged_pages:
+                continue
+            f = Finding(d["severity"], d["category"], d["title"], d["detail"], d.get("recommendation", ""),
+                        d.get("page"))
+            f.timestamp = d.get("timestamp", f.timestamp)
+            with self._lock:
+                self.findings.append(f)
+                self._restored_findings.add((f.severity, f.category, f.title, f.detail))
+            self.emit_event("finding", f.to_dict())
+            carried += 1
+
+        self._baseline_stats = {"unchanged_pages": len(self._unchanged_pages), "changed_pages": len(changed),
+                                "carried_findings": carried}
+        self.log(f"  Baseline: {len(self._unchanged_pages)} pages unchanged, {len(changed)} changed, "
+                 f"{carried} findings carried over", Fore.CYAN)
+        return changed
+
     # ─── Report Generation ────────────────────────────────────────────
+    def report_data(self):
+        """Structured report used for the JSON file and --json-stdout."""
+        with self._lock:  # phases may still be adding results after a cancellation
+            findings = list(self.findings)
+            discovered_urls = list(self.discovered_urls)
+            modules = dict(self.phase_status)
+        severity_order = {"CRITICAL": 0, "HIGH": 1, "MEDIUM": 2, "LOW": 3, "INFO": 4}
+        sorted_findings = sorted(findings, key=lambda f: severity_order.get(f.severity, 5))
+        counts = defaultdict(int)
+        for f in findings:
+            counts[f.severity] += 1
+        return {
+            "target": self.target_url,
+            "base_url": self.base_url,
+            "scan_date": datetime.now().isoformat(),
+            "summary": dict(counts),
+            "tech_stack": self.tech_stack,
+            "discovered_urls": discovered_urls,
+            "discovered_forms": self.discovered_forms,
+            "page_validators": self.page_validators,
+            "findings": [f.to_dict() for f in sorted_findings],
+            "dns_records": self.dns_records,
+            "whois_info": self.whois_info,
+            "cve_data": self.cve_data,
+            "subdomains": self.subdomains,
+            "fuzz_results": self.fuzz_results,
+            "sensitive_findings": self.sensitive_findings,
+            "broken_links": self.broken_links,
+            "cache_stats": self.response_cache.stats(),
+            "injection_stats": self.dispatcher.stats(),
+            "lookup_cache_stats": self.lookup_cache.stats(),
+            "rate_governor": self.governor.stats(),
+            "circuit_breaker": dict(self.breaker.stats(), short_circuited=dict(self.short_circuited)),
+            "latency_ms": self.latency.stats(),
+            "cancelled": self.cancelled.is_set(),
+            # Stopped early, or some module did not run to completion
+            "partial": self.cancelled.is_set() or any(st not in ("completed", "resumed") for st in modules.values()),
+            "stop_reason": self.stop_reason,
+            "modules": modules,
+            "resumed_phases": self._resumed_phases,
+            "baseline": self._baseline_stats,
+            "plan": self.plan.to_dict() if self.plan is not None else None,
+        }
+
     def generate_report(self, output_file=None):
         severity_order = {"CRITICAL": 0, "HIGH": 1, "MEDIUM": 2, "LOW": 3, "INFO": 4}
         sorted_findings = sorted(self.findings, key=lambda f: severity_order.get(f.severity, 5))
@@ -2212,6 +4866,27 @@ class TupiSecScanner:
                 report.append(f"  {url}")
             report.append("")
 
+        if self.short_circuited:
+            report.append("  INCOMPLETE MODULES (target stopped responding)")
+            report.append("  " + "-" * 40)
+            for phase_id, rejected in sorted(self.short_circuited.items()):
+                report.append(f"  {phase_id}: {rejected} requests skipped")
+            report.append("")
+
+        if self.plan is not None:
+            report.append("  SCAN PLAN")
+            report.append("  " + "-" * 40)
+            report.append(self.plan.format())
+            report.append("")
+
+        if self.cancelled.is_set():
+            report.append(f"  PARTIAL SCAN ({self.stop_reason})")
+            report.append("  " + "-" * 40)
+            for phase_id, status in self.phase_status.items():
+                if status not in ("completed", "resumed"):
+                    report.append(f"  {phase_id}: {status}")
+            report.append("")
+
         report.append("  DETAILED FINDINGS")
         report.append("  " + "-" * 40)
 
@@ -2234,15 +4909,7 @@ class TupiSecScanner:
             # Also save JSON version
             json_file = output_file.rsplit(".", 1)[0] + ".json"
             with open(json_file, "w") as fh:
-                json.dump({
-                    "target": self.target_url,
-                    "base_url": self.base_url,
-                    "scan_date": datetime.now().isoformat(),
-                    "summary": dict(counts),
-                    "tech_stack": self.tech_stack,
-                    "discovered_urls": list(self.discovered_urls),
-                    "findings": [f.to_dict() for f in sorted_findings],
-                }, fh, indent=2)
+                json.dump(self.report_data(), fh, indent=2)
             self.log(f"\n[+] Report saved to {output_file}", Fore.GREEN)
             self.log(f"[+] JSON report saved to {json_file}", Fore.GREEN)
 
@@ -2269,7 +4936,11 @@ class TupiSecScanner:
         findings = []
 
         def raw_probe(raw_request, timeout_sec=8.0):
-            """Send raw HTTP request and return response or "TIMEOUT" / "ERROR"."""
+            """Send raw HTTP request and return the response head or "TIMEOUT" / "ERROR:...".
+
+            Reading stops at the end of the headers: a keep-alive server holds
+            the socket open after answering, so waiting for EOF would time out.
+            """
             try:
                 sock = socket.create_connection((host, port), timeout=5)
                 try:
@@ -2281,19 +4952,19 @@ class TupiSecScanner:
 
                     sock.settimeout(timeout_sec)
                     sock.sendall(raw_request.encode("utf-8", errors="replace"))
-                    start = _time.time()
-                    chunks = []
+                    start = _time.monotonic()
+                    head = b""
                     try:
-                        while True:
+                        while b"\r\n\r\n" not in head:
                             chunk = sock.recv(4096)
                             if not chunk:
                                 break
-                            chunks.append(chunk)
-                            if _time.time() - start > timeout_sec:
+                            head += chunk
+                            if _time.monotonic() - start > timeout_sec:
                                 return "TIMEOUT"
                     except socket.timeout:
                         return "TIMEOUT"
-                    return b"".join(chunks).decode("utf-8", errors="replace")
+                    return head.decode("utf-8", errors="replace")
                 finally:
                     sock.close()
             except Exception as ex:
@@ -2313,31 +4984,53 @@ class TupiSecScanner:
         )
 
         # --- TE.CL probe ---
+        # Complete under either framing when sent directly; only a TE front-end that
+        # forwards just the 0-chunk to a CL back-end leaves the back-end waiting
         tecl_req = (
             f"POST {req_path} HTTP/1.1\r\n"
             f"Host: {host}\r\n"
             "Content-Type: application/x-www-form-urlencoded\r\n"
-            "Content-Length: 4\r\n"
+            "Content-Length: 6\r\n"
             "Transfer-Encoding: chunked\r\n"
             "Connection: keep-alive\r\n"
             "\r\n"
-            "a\r\n"
+            "0\r\n"
+            "\r\n"
+            "X"
         )
 
-        try:
-            clte_result = raw_probe(clte_req, timeout_sec=7.0)
-            if clte_result == "TIMEOUT":
-                findings.append(("CL.TE", "HIGH",
-                    "The server appears to use Content-Length for request framing while supporting Transfer-Encoding: chunked. "
-                    "An intermediary using TE framing could allow request smuggling."))
-
-            tecl_result = raw_probe(tecl_req, timeout_sec=7.0)
-            if tecl_result == "TIMEOUT":
-                findings.append(("TE.CL", "HIGH",
-                    "The server appears to use Transfer-Encoding for request framing but an intermediary may use Content-Length. "
-                    "This desync can enable TE.CL request smuggling."))
-        except Exception:
-            pass
+        # Same request with unambiguous framing: answered at once by any server
+        control_req = (
+            f"POST {req_path} HTTP/1.1\r\n"
+            f"Host: {host}\r\n"
+            "Content-Type: application/x-www-form-urlencoded\r\n"
+            "Content-Length: 0\r\n"
+            "Connection: keep-alive\r\n"
+            "\r\n"
+        )
+
+        def measure(raw_request, delay):
+            """A desynced server hangs waiting for body bytes, so the wait tracks the read timeout."""
+            start = _time.monotonic()
+            if delay:
+                result = raw_probe(raw_request, timeout_sec=delay)
+            else:
+                result = raw_probe(control_req, timeout_sec=self.request_timeout()[1])
+            if result.startswith("ERROR:") or (not delay and result == "TIMEOUT"):
+                raise ConnectionError(result)
+            return _time.monotonic() - start
+
+        DETAILS = {
+            "CL.TE": "The server appears to use Content-Length for request framing while supporting Transfer-Encoding: chunked. "
+                     "An intermediary using TE framing could allow request smuggling.",
+            "TE.CL": "The server appears to use Transfer-Encoding for request framing but an intermediary may use Content-Length. "
+                     "This desync can enable TE.CL request smuggling.",
+        }
+        for variant, raw, evidence in TimingOracle().run([("CL.TE", clte_req, measure), ("TE.CL", tecl_req, measure)]):
+            findings.append((variant, "HIGH",
+                             f"{DETAILS[variant]} The probe hung for the full read timeout in "
+                             f"{len(evidence['delays'])} of {len(evidence['delays'])} rounds "
+                             f"(timeouts {evidence['delays']}s) while a well-framed request was answered at once."))
 
         for variant, severity, detail in findings:
             self.add_finding(
@@ -2375,76 +5068,46 @@ class TupiSecScanner:
         LINUX_INDICATORS = ["root:x:", "root:0:", "daemon:", "/bin/bash", "/bin/sh", "/usr/sbin"]
         WINDOWS_INDICATORS = ["[extensions]", "[fonts]", "[files]", "for 16-bit app support"]
 
-        found = set()
+        matcher = PatternMatcher(LINUX_INDICATORS + WINDOWS_INDICATORS)
 
-        def is_traversal_response(text):
-            for ind in LINUX_INDICATORS + WINDOWS_INDICATORS:
-                if ind.lower() in text.lower():
-                    return True
-            return False
+        def detect(resp, payload):
+            return matcher.search(resp) is not None
 
         # Test URL parameters
-        for url in list(self.discovered_urls)[:60]:
-            parsed = urllib.parse.urlparse(url)
-            params = urllib.parse.parse_qs(parsed.query, keep_blank_values=True)
-            if not params:
-                continue
-            for param in list(params.keys()):
-                if param.lower() not in PATH_PARAMS:
-                    continue
-                for payload in PAYLOADS[:5]:
-                    try:
-                        new_params = dict(params)
-                        new_params[param] = [payload]
-                        new_query = urllib.parse.urlencode(new_params, doseq=True)
-                        test_url = urllib.parse.urlunparse(parsed._replace(query=new_query))
-                        resp = self.session.get(test_url, timeout=TIMEOUT, allow_redirects=True)
-                        if is_traversal_response(resp.text):
-                            key = f"{param}:{payload[:20]}"
-                            if key not in found:
-                                found.add(key)
-                                self.add_finding(
-                                    "CRITICAL", "Path Traversal",
-                                    f"Path Traversal in parameter '{param}'",
-                                    f"The parameter '{param}' in {urllib.parse.urlunparse(parsed._replace(query=''))} "
-                                    f"is vulnerable to path traversal. Payload: {payload}",
-                                    "Validate and sanitize all file path inputs. Use a whitelist of allowed files/paths. "
-                                    "Never pass user-supplied input directly to file system operations."
-                                )
-                            break
-                    except Exception:
-                        continue
-
+        query_points = [p for p in self._query_points(limit=60) if p.param.lower() in PATH_PARAMS]
+        jobs = [(p, payload, detect) for p in query_points for payload in PAYLOADS[:5]]
         # Test forms
-        for form in self.discovered_forms[:10]:
-            action = form.get("action", self.base_url)
-            method = form.get("method", "get").upper()
-            inputs = form.get("inputs", [])
-            for inp in inputs:
-                name = inp.get("name", "")
-                if not name or name.lower() not in PATH_PARAMS:
+        form_points = [p for p in self._form_points(skip_types=(), limit=10) if p.param.lower() in PATH_PARAMS]
+        jobs += [(p, payload, detect) for p in form_points for payload in PAYLOADS[:4]]
+
+        found = set()
+        for point, payload, _, _ in self.dispatcher.run(jobs):
+            if point.kind == "query":
+                key = (point.url, point.param)
+                if key in found:
                     continue
-                for payload in PAYLOADS[:4]:
-                    try:
-                        data = {i.get("name", ""): i.get("value", "") for i in inputs if i.get("name")}
-                        data[name] = payload
-                        if method == "POST":
-                            resp = self.session.post(action, data=data, timeout=TIMEOUT, allow_redirects=True)
-                        else:
-                            resp = self.session.get(action, params=data, timeout=TIMEOUT, allow_redirects=True)
-                        if is_traversal_response(resp.text):
-                            key = f"form:{name}"
-                            if key not in found:
-                                found.add(key)
-                                self.add_finding(
-                                    "CRITICAL", "Path Traversal",
-                                    f"Path Traversal via form field '{name}'",
-                                    f"The form field '{name}' at {action} is vulnerable to local file inclusion. Payload: {payload}",
-                                    "Validate and sanitize all file path inputs. Never pass form input to filesystem APIs."
-                                )
-                            break
-                    except Exception:
-                        continue
+                found.add(key)
+                self.add_finding(
+                    "CRITICAL", "Path Traversal",
+                    f"Path Traversal in parameter '{point.param}'",
+                    f"The parameter '{point.param}' in {point.url} "
+                    f"is vulnerable to path traversal. Payload: {payload}",
+                    "Validate and sanitize all file path inputs. Use a whitelist of allowed files/paths. "
+                    "Never pass user-supplied input directly to file system operations.",
+                    page=point.source,
+                )
+            else:
+                key = ("form", point.param)
+                if key in found:
+                    continue
+                found.add(key)
+                self.add_finding(
+                    "CRITICAL", "Path Traversal",
+                    f"Path Traversal via form field '{point.param}'",
+                    f"The form field '{point.param}' at {point.url} is vulnerable to local file inclusion. Payload: {payload}",
+                    "Validate and sanitize all file path inputs. Never pass form input to filesystem APIs.",
+                    page=point.source,
+                )
 
     def scan_file_upload(self):
         """File Upload vulnerability testing"""
@@ -2452,9 +5115,9 @@ class TupiSecScanner:
 
         # Find upload forms
         upload_forms = []
-        for form in self.discovered_forms:
-            inputs = form.get("inputs", [])
-            if any(i.get("type", "").lower() == "file" for i in inputs):
+        for form in self.test_forms():
+            fields = form.get("fields", {})
+            if any(f.get("type", "").lower() == "file" for f in fields.values()):
                 upload_forms.append(form)
 
         if not upload_forms:
@@ -2475,21 +5138,18 @@ class TupiSecScanner:
         XSS_INDICATORS = ["TUPISEC_XSS_TEST"]
 
         for form in upload_forms[:3]:
-            action = form.get("action", self.base_url)
-            inputs = form.get("inputs", [])
+            action = urllib.parse.urljoin(form.get("url") or self.target_url, form.get("action") or "")
+            fields = form.get("fields", {})
 
             for filename, content, mime in TEST_PAYLOADS[:4]:
                 try:
                     files = {}
                     data = {}
-                    for inp in inputs:
-                        name = inp.get("name")
-                        if not name:
-                            continue
-                        if inp.get("type", "").lower() == "file":
+                    for name, info in fields.items():
+                        if info.get("type", "").lower() == "file":
                             files[name] = (filename, _io.BytesIO(content), mime)
                         else:
-                            data[name] = inp.get("value", "test")
+                            data[name] = info.get("value", "test")
 
                     # POST with multipart
                     resp = self.session.post(
@@ -2558,125 +5218,817 @@ class TupiSecScanner:
 
     # ─── Full Scan ────────────────────────────────────────────────────
     def run_full_scan(self, emit_progress=False):
+        """Synchronous wrapper around run_full_scan_async()."""
+        return asyncio.run(self.run_full_scan_async(emit_progress=emit_progress))
+
+    async def run_full_scan_async(self, emit_progress=False):
+        """Run every phase with the async engine bound to the caller's event loop.
+
+        Several scanners can be awaited concurrently on one loop; each runs its
+        phase graph in a worker thread and issues bulk probes through fetch().
+        """
+        self._emit_seeded_state()
+        self._loop = asyncio.get_running_loop()
+        self._engine = await AsyncHTTPEngine(self.session, connector=self._connector).start()
+        timer = None
+        if self._time_budget:
+            timer = self._loop.call_later(self._time_budget, self.cancel, "time budget exceeded")
+        work = self._start_phases(emit_progress)
+        try:
+            while not work.done() and not self.cancelled.is_set():
+                await asyncio.wait({work}, timeout=0.1)
+            if not work.done():
+                # Cancelled: in-flight requests get a grace period, then the report is built as is
+                await asyncio.wait({work}, timeout=self._grace)
+            if work.done():
+                return work.result()
+            self.abandoned = True
+            work.cancel()
+            with self._lock:
+                for phase_id, status in self.phase_status.items():
+                    if status == "running":
+                        self.phase_status[phase_id] = "partial"
+            self.log(f"  [!] Phases still running after {self._grace}s grace period: "
+                     f"{', '.join(p for p, st in self.phase_status.items() if st == 'partial')}", Fore.YELLOW)
+            return None
+        finally:
+            if timer is not None:
+                timer.cancel()
+            await self.aclose()
+
+    def _start_phases(self, emit_progress):
+        """Run _run_phases() on a daemon thread, so a cancelled scan can return without joining it."""
+        result = concurrent.futures.Future()
+
+        def run():
+            result.set_running_or_notify_cancel()
+            try:
+                result.set_result(self._run_phases(emit_progress))
+            except BaseException as e:
+                result.set_exception(e)
+
+        threading.Thread(target=run, name="tupisec-phases", daemon=True).start()
+        return asyncio.wrap_future(result)
+
+    def _apply_plan(self, phases, max_requests, max_seconds):
+        """Estimate ``phases`` (run after discovery) and keep the ones that fit the budgets.
+
+        With --plan nothing is kept: the estimate is the result.
+        """
+        spent = self.governor.total_requests()
+        elapsed = time.monotonic() - self._started
+        self.plan = self.estimate_plan(phases)
+        self.plan.discovery = {"requests": spent, "seconds": round(elapsed, 1)}
+        if max_requests is not None or max_seconds is not None:
+            selected, depth = self.plan.select(
+                None if max_requests is None else max(0, max_requests - spent),
+                None if max_seconds is None else max(0.0, (max_seconds - elapsed) * PLAN_TIME_MARGIN))
+            dropped = [p[0] for p in phases if p[0] not in selected]
+            if dropped:
+                self.log(f"  Over budget, not running: {', '.join(dropped)}", Fore.YELLOW)
+            if depth is not None:
+                self.log(f"  Payloads limited to the first {depth} per injection point", Fore.YELLOW)
+            self.dispatcher.max_waves = depth
+            phases = [p for p in phases if p[0] in selected]
+        self.emit_event("plan", self.plan.to_dict())
+        return [] if self._plan_only else phases
+
+    def estimate_plan(self, phases):
+        """ScanPlan for ``phases`` from a dry run of each module against counted, empty responses.
+
+        The dry run takes the path where every probe misses, so modules that
+        follow up on what they find cost at least the estimate. Modules that
+        don't go through the HTTP session get static estimates.
+        """
+        concurrency = min(ASYNC_MAX_IN_FLIGHT, ASYNC_MAX_PER_HOST, self.governor.max_in_flight)
+        profile = self.latency_profile()
+        latency = profile["p50"] if profile else PLAN_DEFAULT_LATENCY
+        meter = PlanMeter(concurrency)
+        sim = self._dry_run_clone(meter)
+        graph = {pid: fn for pid, _, fn, _ in sim._phase_graph()}
+        modules = {}
+        for pid, _, _, _ in phases:
+            estimate = self._static_estimate(pid)
+            if estimate is None:
+                meter.reset()
+                before = list(sim.dispatcher.wave_sent)
+                estimate = {"method": "dry-run"}
+                try:
+                    graph[pid]()
+                except Exception as e:
+                    estimate["error"] = str(e)
+                sent = [n - (before[i] if i < len(before) else 0) for i, n in enumerate(sim.dispatcher.wave_sent)]
+                while sent and not sent[-1]:
+                    sent.pop()
+                estimate.update(requests=meter.requests, rounds=meter.rounds(), seconds=0.0,
+                                waves=[(n, math.ceil(n / concurrency)) for n in sent])
+            modules[pid] = estimate
+        return ScanPlan(modules, {pid: deps for pid, _, _, deps in phases}, latency,
+                        workers=self._workers, max_rps=self.governor.max_rps)
+
+    def _dry_run_clone(self, meter):
+        """Copy of this scanner whose requests are counted by ``meter`` instead of sent."""
+        sim = copy.copy(self)
+        for name, value in vars(self).items():
+            if isinstance(value, (list, dict, set)):
+                setattr(sim, name, copy.copy(value))
+        sim.verbose = False
+        sim.on_event = None
+        sim._lock = threading.RLock()
+        sim.response_cache = self.response_cache.copy()
+        sim.session = DryRunSession(meter)
+        sim.session.headers.update(self.session.headers)
+        sim.session.cookies.update(self.session.cookies)
+        sim.session.verify = self.session.verify
+        sim._timing_session = sim.session
+        sim._port_thread = None
+        sim.checkpoint = None
+        if self.checkpoint is not None:  # resumed modules pick up at their cursors
+            sim.checkpoint = ScanCheckpoint(None)
+            sim.checkpoint.cursors = dict(self.checkpoint.cursors)
+
+        def not_found(jobs):
+            return [FetchResponse(job.get("url", ""), 404, {}, b"") for job in jobs]
+
+        def fetch_many(jobs, limit=None):
+            jobs = list(jobs)
+            meter.batch(len(jobs), limit)
+            return not_found(jobs)
+
+        sim.fetch_many = fetch_many
+        sim.dispatcher = PayloadDispatcher(not_found, budget=max(0, self.dispatcher.budget - self.dispatcher.sent))
+        return sim
+
+    def _static_estimate(self, phase_id):
+        """Estimate for modules that don't use the HTTP session, or None to dry-run the module.
+
+        ``requests`` only counts traffic to the target; DNS, WHOIS and NVD
+        lookups show up as time.
+        """
+        estimate = {"requests": 0, "rounds": 0, "seconds": 0.0, "waves": [], "method": "static"}
+        if phase_id == "ssl":
+            estimate.update(requests=1, rounds=1)
+        elif phase_id == "smuggling":
+            estimate.update(requests=TIMING_BASELINE_SAMPLES + 2, rounds=3)
+        elif phase_id == "ports":
+            ports = len(self._ports or COMMON_PORTS)
+            # Filtered ports wait out the connect timeout
+            estimate.update(requests=ports, seconds=math.ceil(ports / max(1, self._port_concurrency)) * PORT_TIMEOUT)
+        elif phase_id == "dns":
+            estimate.update(seconds=6 * PLAN_DNS_LATENCY)  # five record types and WHOIS
+        elif phase_id == "subdomains":
+            words = len(SUBDOMAIN_WORDS)
+            if self._subdomain_wordlist:
+                try:
+                    words += sum(1 for _ in iter_wordlist(self._subdomain_wordlist))
+                except OSError:
+                    pass
+            queries = words * len(DNSResolverPool.RECORD_TYPES)
+            estimate.update(seconds=math.ceil(queries / max(1, self._dns_workers)) * PLAN_DNS_LATENCY)
+        elif phase_id == "cves":
+            if not CVEIndex(self._cve_db).exists():
+                estimate.update(seconds=2.0 * max(0, min(5, len(self.tech_stack)) - 1))  # NVD API pacing
+        else:
+            return None
+        return estimate
+
+    def _phase_graph(self):
+        """Every scan phase as a ``(phase_id, message, fn, deps)`` tuple; phases run as soon as their deps finish."""
+        return [
+            ("headers", "Analyzing HTTP headers", lambda: self.scan_headers(), []),
+            ("ssl", "Analyzing SSL/TLS", lambda: self.scan_ssl(), []),
+            ("tech", "Fingerprinting technology", lambda: self.scan_tech(), []),
+            ("dns", "Collecting DNS & WHOIS", lambda: self.scan_dns_whois(), []),
+            ("cves", "Looking up CVEs", lambda: self.scan_cves(), ["headers", "tech"]),
+            ("methods", "Testing HTTP methods", lambda: self.scan_methods(), []),
+            ("forms", "Analyzing forms", lambda: self.scan_forms(), []),
+            ("crawl", "Crawling site", lambda: self.crawl(), []),
+            ("sqli", "Testing SQL injection", lambda: self.scan_sqli(), ["forms", "crawl"]),
+            ("xss", "Testing XSS", lambda: self.scan_xss(), ["forms", "crawl"]),
+            ("directories", "Enumerating directories", lambda: self.scan_directories(), []),
+            ("ports", "Scanning ports", lambda: self.scan_ports(), []),
+            ("open_redirect", "Testing for open redirects", lambda: self.scan_open_redirect(), ["crawl"]),
+            ("ssrf", "Testing for SSRF", lambda: self.scan_ssrf(), ["forms", "crawl"]),
+            ("ssti", "Testing for template injection", lambda: self.scan_ssti(), ["forms", "crawl"]),
+            ("cors", "Advanced CORS testing", lambda: self.scan_cors_advanced(), ["crawl"]),
+            ("subdomains", "Enumerating subdomains", lambda: self.scan_subdomains(), []),
+            ("param_fuzz",       "Fuzzing for hidden parameters",   lambda: self.scan_param_fuzz(), ["crawl"]),
+            ("sensitive_data",   "Scanning for sensitive data",     lambda: self.scan_sensitive_data(), ["crawl"]),
+            ("jwt",              "Testing JWT security",            lambda: self.scan_jwt(), []),
+            ("rate_limit",       "Testing rate limiting",           lambda: self.scan_rate_limit(), ["forms", "crawl"]),
+            ("mixed_content",    "Checking for mixed content",      lambda: self.scan_mixed_content(), ["crawl"]),
+            ("graphql",          "Testing GraphQL endpoints",       lambda: self.scan_graphql(), []),
+            ("xxe",              "Testing for XXE",                 lambda: self.scan_xxe(), ["crawl"]),
+            ("broken_links",     "Checking broken external links",  lambda: self.scan_broken_links(), ["crawl"]),
+            ("nosql",            "Testing for NoSQL injection",       lambda: self.scan_nosql_injection(), ["forms", "crawl"]),
+            ("cmd_injection",    "Testing for command injection",     lambda: self.scan_cmd_injection(), ["forms", "crawl"]),
+            ("default_creds",    "Testing for default credentials",   lambda: self.scan_default_creds(), []),
+            ("crlf",             "Testing for CRLF injection",        lambda: self.scan_crlf_injection(), ["crawl"]),
+            ("prototype",        "Testing for prototype pollution",   lambda: self.scan_prototype_pollution(), ["crawl"]),
+            ("s3_buckets",       "Testing for S3 misconfiguration",  lambda: self.scan_s3_buckets(), ["subdomains"]),
+            ("smuggling",        "Testing for HTTP request smuggling", lambda: self.scan_http_smuggling(), []),
+            ("path_traversal", "Testing for path traversal", lambda: self.scan_path_traversal(), ["forms", "crawl"]),
+            ("file_upload",    "Testing for file upload vulnerabilities", lambda: self.scan_file_upload(), ["forms", "crawl"]),
+        ]
+
+    def _run_phases(self, emit_progress):
         self.log(f"\n{'='*70}", Fore.GREEN)
         self.log(f"  TupiSec Scanner v1.0.0 - Starting Full Scan", Fore.GREEN)
         self.log(f"  Target: {self.target_url}", Fore.GREEN)
         self.log(f"  Time:   {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", Fore.GREEN)
         self.log(f"{'='*70}\n", Fore.GREEN)
 
-        phases = [
-            ("headers", "Analyzing HTTP headers", lambda: self.scan_headers()),
-            ("ssl", "Analyzing SSL/TLS", lambda: self.scan_ssl()),
-            ("tech", "Fingerprinting technology", lambda: self.scan_tech()),
-            ("dns", "Collecting DNS & WHOIS", lambda: self.scan_dns_whois()),
-            ("cves", "Looking up CVEs", lambda: self.scan_cves()),
-            ("methods", "Testing HTTP methods", lambda: self.scan_methods()),
-            ("forms", "Analyzing forms", lambda: None),  # handled specially
-            ("crawl", "Crawling site", lambda: self.crawl()),
-            ("sqli", "Testing SQL injection", lambda: self.scan_sqli()),
-            ("xss", "Testing XSS", lambda: self.scan_xss()),
-            ("directories", "Enumerating directories", lambda: self.scan_directories()),
-            ("ports", "Scanning ports", lambda: self.scan_ports()),
-            ("open_redirect", "Testing for open redirects", lambda: self.scan_open_redirect()),
-            ("ssrf", "Testing for SSRF", lambda: self.scan_ssrf()),
-            ("ssti", "Testing for template injection", lambda: self.scan_ssti()),
-            ("cors", "Advanced CORS testing", lambda: self.scan_cors_advanced()),
-            ("subdomains", "Enumerating subdomains", lambda: self.scan_subdomains()),
-            ("param_fuzz",       "Fuzzing for hidden parameters",   lambda: self.scan_param_fuzz()),
-            ("sensitive_data",   "Scanning for sensitive data",     lambda: self.scan_sensitive_data()),
-            ("jwt",              "Testing JWT security",            lambda: self.scan_jwt()),
-            ("rate_limit",       "Testing rate limiting",           lambda: self.scan_rate_limit()),
-            ("mixed_content",    "Checking for mixed content",      lambda: self.scan_mixed_content()),
-            ("graphql",          "Testing GraphQL endpoints",       lambda: self.scan_graphql()),
-            ("xxe",              "Testing for XXE",                 lambda: self.scan_xxe()),
-            ("broken_links",     "Checking broken external links",  lambda: self.scan_broken_links()),
-            ("nosql",            "Testing for NoSQL injection",       lambda: self.scan_nosql_injection()),
-            ("cmd_injection",    "Testing for command injection",     lambda: self.scan_cmd_injection()),
-            ("default_creds",    "Testing for default credentials",   lambda: self.scan_default_creds()),
-            ("crlf",             "Testing for CRLF injection",        lambda: self.scan_crlf_injection()),
-            ("prototype",        "Testing for prototype pollution",   lambda: self.scan_prototype_pollution()),
-            ("s3_buckets",       "Testing for S3 misconfiguration",  lambda: self.scan_s3_buckets()),
-            ("smuggling",        "Testing for HTTP request smuggling", lambda: self.scan_http_smuggling()),
-            ("path_traversal", "Testing for path traversal", lambda: self.scan_path_traversal()),
-            ("file_upload",    "Testing for file upload vulnerabilities", lambda: self.scan_file_upload()),
-        ]
+        phases = self._phase_graph()
 
-        # Build set of modules to skip
-        skip_set = set()
-        if getattr(self, '_quick_mode', False):
-            skip_set = {"subdomains", "ports", "cmd_injection", "ssrf", "ssti",
-                        "nosql", "broken_links", "param_fuzz", "file_upload",
-                        "path_traversal", "smuggling", "prototype", "s3_buckets",
-                        "default_creds", "xxe"}
-        if getattr(self, '_skip_modules', ''):
-            for m in self._skip_modules.split(","):
-                skip_set.add(m.strip())
+        skip_set = {m.strip() for m in self._skip_modules.split(",") if m.strip()}
         if skip_set:
-            phases = [(name, desc, fn) for name, desc, fn in phases if name not in skip_set]
-
-        total = len(phases)
-        resp = None
-        for i, (phase_id, phase_msg, phase_fn) in enumerate(phases):
-            if emit_progress:
-                progress = json.dumps({"phase": phase_id, "step": i + 1, "total": total, "message": phase_msg})
-                print(f"PROGRESS:{progress}", flush=True)
-
-            if phase_id == "headers":
-                resp = phase_fn()
-            elif phase_id == "forms":
-                self.scan_forms(resp.text if resp else None)
+            phases = [p for p in phases if p[0] not in skip_set]
+        if self.checkpoint is not None and self.checkpoint.completed:
+            # Completed phases drop out of the graph; their dependents count them as satisfied
+            resumed = [p[0] for p in phases if p[0] in self.checkpoint.completed]
+            phases = [p for p in phases if p[0] not in self.checkpoint.completed]
+            self.log(f"  Resuming from checkpoint: skipping {', '.join(resumed) or 'nothing'}", Fore.CYAN)
+            self.phase_status.update(dict.fromkeys(resumed, "resumed"))
+
+        # Each phase is charged only the breaker rejections made on its behalf
+        phases = [(pid, msg, self._track_short_circuits(pid, fn), deps) for pid, msg, fn, deps in phases]
+        self._emit_progress = emit_progress
+        self._progress_total = len(phases)
+        self._started = time.monotonic()
+
+        started = {}
+        schedulers = []
+        offset = [0]  # phases finished by earlier schedulers (discovery, when planning)
+
+        def on_event(phase_id, phase_msg, status, finished, total):
+            errors = schedulers[-1].errors
+            step = offset[0] + (finished + 1 if status == "started" else finished)
+            self._progress_step = min(step, self._progress_total)
+            self.emit_progress(phase_id, phase_msg, status)
+            if status == "started":
+                started[phase_id] = time.monotonic()
+                self.phase_status[phase_id] = "running"
+                return
+            if phase_id in errors:
+                outcome = "failed"
             else:
-                phase_fn()
-
-        if emit_progress:
-            progress = json.dumps({"phase": "done", "step": total, "total": total, "message": "Scan complete"})
-            print(f"PROGRESS:{progress}", flush=True)
+                outcome = "partial" if self.cancelled.is_set() else "completed"
+            self.phase_status[phase_id] = outcome
+            result = {"phase": phase_id, "status": outcome,
+                      "elapsed": round(time.monotonic() - started.pop(phase_id), 3)}
+            if phase_id in errors:
+                result["error"] = errors[phase_id]
+            elif phase_id != "ports":  # nmap keeps running in the background; see below
+                self._complete_phase(phase_id)
+            self.emit_event("phase", result)
+
+        def run_graph(graph):
+            scheduler = PhaseScheduler(graph, workers=self._workers, on_event=on_event, cancelled=self.cancelled)
+            schedulers.append(scheduler)
+            scheduler.run()
+            offset[0] += len(graph)
+
+        max_requests = self._max_requests
+        max_seconds = self._time_budget
+        if self._quick_mode:
+            max_seconds = min(max_seconds or QUICK_TIME_BUDGET, QUICK_TIME_BUDGET)
+        if self._plan_only or max_requests is not None or max_seconds is not None:
+            # Discovery runs for real; the rest is estimated from what it found
+            run_graph([p for p in phases if p[0] in PLAN_DISCOVERY])
+            phases = [p for p in phases if p[0] not in PLAN_DISCOVERY]
+            if not self.cancelled.is_set():
+                phases = self._apply_plan(phases, max_requests, max_seconds)
+                self._progress_total = offset[0] + len(phases)
+        run_graph(phases)
+        total = self._progress_total
+
+        self.wait_port_scan()
+        errors = {pid: err for sch in schedulers for pid, err in sch.errors.items()}
+        skipped = [pid for sch in schedulers for pid in sch.skipped]
+        if any("ports" in sch.results for sch in schedulers):
+            self._complete_phase("ports")
+        if skipped:
+            self.phase_status.update(dict.fromkeys(skipped, "skipped"))
+            self.log(f"  [!] Scan stopped ({self.stop_reason}); skipped: {', '.join(skipped)}",
+                     Fore.YELLOW)
+        for phase_id, err in errors.items():
+            self.log(f"  [!] Phase '{phase_id}' failed: {err}", Fore.RED)
+        if self.short_circuited:
+            self.log(f"  [!] Modules cut short by unreachable hosts: "
+                     f"{', '.join(sorted(self.short_circuited))}", Fore.YELLOW)
+
+        if self._plan_only:
+            message = "Plan complete"
+        elif self.cancelled.is_set():
+            message = f"Scan stopped: {self.stop_reason}"
+        else:
+            message = "Scan complete"
+        if self.on_event is not None:
+            self.on_event("progress", {"phase": "done", "step": total, "total": total, "message": message})
+        elif emit_progress:
+            progress = json.dumps({"phase": "done", "step": total, "total": total, "message": message})
+            print(f"PROGRESS:{progress}", file=self._progress_out, flush=True)
 
         return self.generate_report()
 
 
-def main():
-    import argparse
+class NDJSONWriter:
+    """``--ndjson`` output: each scan event as one ``{"type": kind, "data": data}`` line.
+
+    Used as a scanner's ``on_event`` hook, so findings, crawled URLs,
+    subdomains and phase results are written as they happen (state loaded
+    from --baseline or --resume is replayed when the scan starts). Progress
+    events go to ``progress_out`` when given, to ``out`` when ``progress``
+    is set, and are dropped otherwise. ``summary`` closes the stream with
+    the report minus the lists already streamed.
+    """
+
+    STREAMED = ("findings", "discovered_urls", "subdomains")
+
+    def __init__(self, out, progress_out=None, progress=False):
+        self.out = out
+        self.progress_out = progress_out
+        self.progress = progress
+        self._lock = threading.Lock()
+
+    def __call__(self, kind, data):
+        out = self.out
+        if kind == "progress":
+            out = self.progress_out or (self.out if self.progress else None)
+            if out is None:
+                return
+        line = json.dumps({"type": kind, "data": data}, default=str)
+        with self._lock:
+            out.write(line + "\n")
+            out.flush()
+
+    def summary(self, report):
+        self("summary", {k: v for k, v in report.items() if k not in self.STREAMED})
+
+
+class RequestArgumentParser(argparse.ArgumentParser):
+    """Parser for --serve / --targets requests, built on the command-line parser via ``parents``.
+
+    Errors and --help raise ValueError carrying the text instead of writing
+    it to stdout (the reply stream) and exiting the worker.
+    """
+
+    def exit(self, status=0, message=None):
+        raise ValueError((message or "").strip() or f"{self.prog}: exited with status {status}")
+
+    def error(self, message):
+        raise ValueError(message)
+
+    def print_help(self, file=None):
+        raise ValueError(self.format_help())
+
+    def print_usage(self, file=None):
+        raise ValueError(self.format_usage())
+
+
+class ScanServer:
+    """``--serve`` worker: runs scan jobs received as JSON lines, several at once.
+
+    Requests, one JSON object per line::
+
+        {"op": "scan", "id": "job-1", "url": "https://example.com", "args": ["--quick"]}
+        {"op": "cancel", "id": "job-1"}
+        {"op": "status"}
+        {"op": "shutdown"}
+
+    ``args`` are the usual command-line options, on top of the ones the worker
+    was started with. Replies are JSON lines ``{"id", "type", "data"}`` where
+    ``type`` is ``queued``, ``started``, then the scan's events (``progress``,
+    ``finding``, ``url``, ``subdomain``, ``phase``, ``plan``) and finally
+    ``report`` (the --json-stdout document), ``cancelled`` (partial report)
+    or ``error``. Jobs share one event loop, the HTTP connection pools and
+    the lookup cache, so only the first scan pays for cold connections.
+    """
+
+    def __init__(self, parser, defaults=None, max_jobs=SERVE_MAX_JOBS):
+        self.parser = RequestArgumentParser(prog=parser.prog, description=parser.description,
+                                            parents=[parser], add_help=False)
+        self.defaults = defaults
+        self.max_jobs = max(1, max_jobs)
+        cache_dir = getattr(defaults, "cache_dir", None) or CACHE_DIR
+        self.lookup_cache = LookupCache(None if getattr(defaults, "no_cache", False) else cache_dir)
+        self.adapter = requests.adapters.HTTPAdapter(pool_connections=SERVE_POOL_SIZE, pool_maxsize=SERVE_POOL_SIZE)
+        self.jobs = {}  # id -> TupiSecScanner, queued or running
+        self._tasks = set()
+        self._slots = None
+        self._connector = None
+        self._stopping = None
+
+    async def _start(self):
+        self._slots = asyncio.Semaphore(self.max_jobs)
+        self._stopping = asyncio.Event()
+        try:
+            import aiohttp
+            self._connector = aiohttp.TCPConnector(limit=ASYNC_MAX_CONNECTIONS * self.max_jobs,
+                                                   limit_per_host=ASYNC_MAX_PER_HOST, ssl=False)
+        except ImportError:
+            self._connector = None
+
+    async def _stop(self, cancel=True):
+        if cancel:
+            for scanner in list(self.jobs.values()):
+                scanner.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._connector is not None:
+            await self._connector.close()
+        self.adapter.close()
+
+    def _parse(self, msg):
+        """Request options on top of the worker's; raises ValueError with argparse's message."""
+        argv = [str(a) for a in msg.get("args", [])]
+        if msg.get("url"):
+            argv.insert(0, str(msg["url"]))
+        namespace = argparse.Namespace(**vars(self.defaults)) if self.defaults is not None else None
+        return self.parser.parse_args(argv, namespace=namespace)
+
+    def handle(self, line, send):
+        """Process one request line; ``send(message)`` may be called from any thread."""
+        line = line.strip()
+        if not line:
+            return
+        try:
+            msg = json.loads(line)
+            op, job_id = msg.get("op"), msg.get("id")
+        except (ValueError, AttributeError):
+            send({"id": None, "type": "error", "data": "Invalid JSON request"})
+            return
+        if op == "scan":
+            self.submit(job_id, msg, send)
+        elif op == "cancel":
+            scanner = self.jobs.get(job_id)
+            if scanner is None:
+                send({"id": job_id, "type": "error", "data": "Unknown job"})
+            else:
+                scanner.cancel()
+        elif op == "status":
+            send({"id": job_id, "type": "status",
+                  "data": {"jobs": sorted(self.jobs), "max_jobs": self.max_jobs,
+                           "lookup_cache": self.lookup_cache.stats()}})
+        elif op == "shutdown":
+            self._stopping.set()
+        else:
+            send({"id": job_id, "type": "error", "data": f"Unknown op: {op!r}"})
+
+    def submit(self, job_id, msg, send):
+        if not job_id or job_id in self.jobs:
+            send({"id": job_id, "type": "error", "data": "Missing or duplicate job id"})
+            return
+        try:
+            args = self._parse(msg)
+            if not args.url:
+                raise ValueError("the following arguments are required: url")
+            scanner = self._make_scanner(args)
+        except ValueError as e:
+            send({"id": job_id, "type": "error", "data": str(e)})
+            return
+        scanner.on_event = lambda kind, data: send({"id": job_id, "type": kind, "data": data})
+        self.jobs[job_id] = scanner
+        task = asyncio.get_running_loop().create_task(self._run(job_id, scanner, send))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        send({"id": job_id, "type": "queued", "data": {"url": args.url}})
+
+    def _make_scanner(self, args):
+        """Scanner for one job, wired to the shared pools and lookup cache."""
+        scanner = configure_scanner(args, verbose=False, lookup_cache=self.lookup_cache)
+        scanner.session.mount("http://", self.adapter)
+        scanner.session.mount("https://", self.adapter)
+        scanner._connector = self._connector
+        return scanner
+
+    async def _run(self, job_id, scanner, send):
+        try:
+            async with self._slots:
+                if not scanner.cancelled.is_set():
+                    send({"id": job_id, "type": "started", "data": {"url": scanner.target_url}})
+                    await scanner.run_full_scan_async()
+            kind = "cancelled" if scanner.cancelled.is_set() else "report"
+            send({"id": job_id, "type": kind, "data": scanner.report_data()})
+        except Exception as e:
+            send({"id": job_id, "type": "error", "data": str(e)})
+        finally:
+            self.jobs.pop(job_id, None)
+
+    async def serve_stdio(self):
+        """Serve requests from stdin until EOF (running jobs finish) or a shutdown request."""
+        await self._start()
+        loop = asyncio.get_running_loop()
+
+        def write(message):
+            sys.stdout.write(json.dumps(message, default=str) + "\n")
+            sys.stdout.flush()
+
+        def send(message):
+            loop.call_soon_threadsafe(write, message)
+
+        while not self._stopping.is_set():
+            line = await asyncio.to_thread(sys.stdin.readline)
+            if not line:
+                break
+            self.handle(line, send)
+        await self._stop(cancel=self._stopping.is_set())
+
+    async def serve_unix(self, path):
+        """Serve requests on a Unix socket (owner-only) until a shutdown request."""
+        await self._start()
+        if os.path.exists(path):
+            os.unlink(path)
+        server = await asyncio.start_unix_server(self._serve_connection, path)
+        os.chmod(path, 0o600)
+        try:
+            async with server:
+                await self._stopping.wait()
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
+            await self._stop()
+
+    async def _serve_connection(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        own = set()
+
+        def write(message):
+            if not writer.is_closing():
+                writer.write((json.dumps(message, default=str) + "\n").encode())
+
+        def send(message):
+            if message.get("type") == "queued":
+                own.add(message["id"])
+            loop.call_soon_threadsafe(write, message)
+
+        try:
+            while not self._stopping.is_set():
+                line = await reader.readline()
+                if not line:
+                    break
+                self.handle(line.decode("utf-8", errors="replace"), send)
+                await writer.drain()
+        finally:
+            # Nobody is left to read these jobs' results
+            for job_id in own:
+                if job_id in self.jobs:
+                    self.jobs[job_id].cancel()
+            writer.close()
+
+
+class BatchRunner(ScanServer):
+    """``--targets`` mode: many scans in one process, one NDJSON report line each.
+
+    Up to ``max_jobs`` targets run at once, never two on the same host.
+    Besides the pools and lookup cache every ScanServer job shares, all
+    targets share one RateGovernor and LatencyTracker, so per-host request
+    limits hold across targets.
+    """
+
+    def __init__(self, parser, defaults, max_jobs=SERVE_MAX_JOBS):
+        super().__init__(parser, defaults=defaults, max_jobs=max_jobs)
+        self.governor = RateGovernor(defaults.max_rps, max(1, defaults.max_in_flight), not defaults.no_adaptive)
+        self.latency = LatencyTracker()
+
+    def _make_scanner(self, args):
+        scanner = super()._make_scanner(args)
+        scanner.governor = scanner.session.governor = self.governor
+        scanner.latency = scanner.session.latency = self.latency
+        return scanner
+
+    async def _scan(self, url):
+        try:
+            scanner = self._make_scanner(self._parse({"url": url}))  # may raise, e.g. on another target's --baseline
+            await scanner.run_full_scan_async()
+        except Exception as e:
+            return {"target": url, "error": str(e)}
+        return scanner.report_data()
+
+    async def run(self, targets, write):
+        """Scan every target, calling ``write(report)`` as each one finishes."""
+        await self._start()
+        pending = deque(targets)
+        running = {}  # task -> host
+        try:
+            while pending or running:
+                busy = set(running.values())
+                for _ in range(len(pending)):
+                    if len(running) >= self.max_jobs:
+                        break
+                    url = pending.popleft()
+                    host = urllib.parse.urlsplit(url).netloc.lower()
+                    if host in busy:
+                        pending.append(url)  # same host already being scanned; try it later
+                        continue
+                    busy.add(host)
+                    running[asyncio.ensure_future(self._scan(url))] = host
+                if not running:
+                    break
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    del running[task]
+                    write(task.result())
+        finally:
+            await self._stop()
+
+
+def build_parser():
     parser = argparse.ArgumentParser(description="TupiSec - Web Security Scanner")
-    parser.add_argument("url", help="Target URL to scan")
+    parser.add_argument("url", nargs="?", help="Target URL to scan")
     parser.add_argument("--full", action="store_true", help="Run full scan (default)")
     parser.add_argument("--output", "-o", help="Output report file", default=None)
     parser.add_argument("--quiet", "-q", action="store_true", help="Quiet mode")
     parser.add_argument("--json-stdout", action="store_true", help="Output JSON report to stdout")
     parser.add_argument("--progress", action="store_true", help="Emit progress lines to stdout")
+    parser.add_argument("--ndjson", action="store_true",
+                        help="Stream findings, URLs, subdomains and phase results to stdout as JSON lines, "
+                             "ending with a summary line")
+    parser.add_argument("--progress-fd", type=int, metavar="FD",
+                        help="Write progress lines to this file descriptor instead of stdout (implies --progress)")
     parser.add_argument("--cookies", help="Cookie header string (e.g. 'session=abc; token=xyz')")
-    parser.add_argument("--quick", action="store_true", help="Quick scan (skip slow modules)")
+    parser.add_argument("--quick", action="store_true",
+                        help=f"Quick scan: run the modules estimated to fit in {QUICK_TIME_BUDGET}s")
     parser.add_argument("--skip-modules", default="", help="Comma-separated list of modules to skip")
-    args = parser.parse_args()
-
-    scanner = TupiSecScanner(args.url, verbose=not args.quiet, cookies=args.cookies)
+    parser.add_argument("--html-parser", choices=["lxml", "html.parser"], default=HTML_PARSER,
+                        help=f"BeautifulSoup backend (default {HTML_PARSER}; lxml is used when installed)")
+    parser.add_argument("--crawl-depth", type=int, default=CRAWL_DEPTH,
+                        help=f"Link levels to follow while crawling (default {CRAWL_DEPTH})")
+    parser.add_argument("--max-pages", type=int, default=CRAWL_MAX_PAGES,
+                        help=f"Maximum pages fetched by the crawler (default {CRAWL_MAX_PAGES})")
+    parser.add_argument("--crawl-workers", type=int, default=CRAWL_WORKERS,
+                        help=f"Concurrent crawler fetches (default {CRAWL_WORKERS})")
+    parser.add_argument("--dir-wordlist", metavar="PATH",
+                        help="Extra paths for directory enumeration, one per line (streamed)")
+    parser.add_argument("--dir-extensions", default="",
+                        help="Extensions tried for each wordlist entry without one, e.g. 'php,bak,zip'")
+    parser.add_argument("--dir-workers", type=int, default=DIR_WORKERS,
+                        help=f"Concurrent directory probes (default {DIR_WORKERS})")
+    parser.add_argument("--dir-max-bytes", type=int, default=DIR_MAX_BYTES,
+                        help=f"Body bytes read per directory probe (default {DIR_MAX_BYTES})")
+    parser.add_argument("--subdomain-wordlist", metavar="PATH",
+                        help="Extra subdomain labels, one per line (streamed, large lists are fine)")
+    parser.add_argument("--dns-workers", type=int, default=DNS_WORKERS,
+                        help=f"Concurrent DNS lookups for subdomain enumeration (default {DNS_WORKERS})")
+    parser.add_argument("--nameservers", default="",
+                        help="Comma-separated resolver IPs to use instead of the system resolvers")
+    parser.add_argument("--ports", type=parse_ports, default=None,
+                        help="Ports to scan, e.g. '22,80,8000-8100' (default: common ports / nmap top 100)")
+    parser.add_argument("--port-concurrency", type=int, default=PORT_SCAN_CONCURRENCY,
+                        help=f"Simultaneous TCP connects in the native port scanner (default {PORT_SCAN_CONCURRENCY})")
+    parser.add_argument("--cve-db", default=CVE_DB_PATH,
+                        help=f"Offline NVD index used by the CVE lookup (default {CVE_DB_PATH})")
+    parser.add_argument("--import-nvd", nargs="+", metavar="FEED",
+                        help="Build/update the offline CVE index from NVD JSON feed files (.json or .json.gz) and exit")
+    parser.add_argument("--cache-dir", default=CACHE_DIR,
+                        help=f"Directory of the persistent CVE/WHOIS/DNS lookup cache (default {CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Don't read or write the persistent lookup cache")
+    parser.add_argument("--injection-budget", type=int, default=INJECTION_REQUEST_BUDGET,
+                        help=f"Max payload requests shared by all injection modules (default {INJECTION_REQUEST_BUDGET})")
+    parser.add_argument("--max-rps", type=float, default=GOVERNOR_MAX_RPS,
+                        help=f"Per-host request rate ceiling, adapted down on 429/503/latency (default {GOVERNOR_MAX_RPS}, 0 = unlimited)")
+    parser.add_argument("--max-in-flight", type=int, default=GOVERNOR_MAX_IN_FLIGHT,
+                        help=f"Per-host concurrent request ceiling (default {GOVERNOR_MAX_IN_FLIGHT})")
+    parser.add_argument("--no-adaptive", action="store_true",
+                        help="Keep --max-rps/--max-in-flight fixed instead of backing off on throttling")
+    parser.add_argument("--fixed-timeouts", action="store_true",
+                        help="Use each module's fixed timeouts instead of ones derived from measured latency")
+    parser.add_argument("--breaker-threshold", type=int, default=BREAKER_THRESHOLD,
+                        help=f"Consecutive connection errors/timeouts before a host's requests fail fast "
+                             f"(default {BREAKER_THRESHOLD}, 0 = never)")
+    parser.add_argument("--breaker-cooldown", type=float, default=BREAKER_COOLDOWN,
+                        help=f"Seconds before an unreachable host is probed again (default {BREAKER_COOLDOWN:g})")
+    parser.add_argument("--serve", action="store_true",
+                        help="Run as a persistent worker taking JSON-line scan jobs on stdin (or --socket)")
+    parser.add_argument("--socket", metavar="PATH",
+                        help="With --serve, listen on this Unix socket instead of stdin/stdout")
+    parser.add_argument("--time-budget", type=float, metavar="SECONDS",
+                        help="Run the modules estimated to fit in SECONDS; stop the scan when they run out "
+                             "and report whatever it found (marked partial)")
+    parser.add_argument("--max-requests", type=int, metavar="N",
+                        help="Run the modules (and payloads) estimated to fit in N requests to the target")
+    parser.add_argument("--plan", action="store_true",
+                        help="Crawl the target, print the estimated requests and time of every other "
+                             "module, and exit without running them")
+    parser.add_argument("--grace", type=float, default=CANCEL_GRACE, metavar="SECONDS",
+                        help=f"After a stop (time budget, SIGTERM/SIGINT), wait this long for in-flight "
+                             f"requests before reporting (default {CANCEL_GRACE})")
+    parser.add_argument("--baseline", metavar="REPORT",
+                        help="Delta scan: reuse a previous JSON report of this target and only probe "
+                             "new or changed pages")
+    parser.add_argument("--checkpoint", metavar="PATH",
+                        help=f"Save scan state to PATH after each phase and every {CHECKPOINT_EVERY} requests")
+    parser.add_argument("--resume", metavar="PATH",
+                        help="Resume the scan saved in checkpoint PATH (and keep checkpointing to it)")
+    parser.add_argument("--targets", metavar="FILE",
+                        help="Scan every URL in FILE ('-' = stdin) and print one JSON report line per target")
+    parser.add_argument("--max-jobs", type=int, default=SERVE_MAX_JOBS,
+                        help=f"With --serve/--targets, scans run at once (default {SERVE_MAX_JOBS})")
+    parser.add_argument("--workers", type=int, default=PHASE_WORKERS,
+                        help=f"Scan phases to run concurrently (default {PHASE_WORKERS}, 1 = sequential)")
+    return parser
+
+
+def configure_scanner(args, verbose=None, lookup_cache=None):
+    """Build a TupiSecScanner from parsed command-line options."""
+    scanner = TupiSecScanner(args.url, verbose=not args.quiet if verbose is None else verbose,
+                             cookies=args.cookies)
     scanner._quick_mode = args.quick
     scanner._skip_modules = args.skip_modules
+    scanner._workers = args.workers
+    scanner._html_parser = args.html_parser
+    scanner._crawl_depth = args.crawl_depth
+    scanner._max_pages = args.max_pages
+    scanner._crawl_workers = args.crawl_workers
+    scanner.dispatcher.budget = args.injection_budget
+    scanner.governor.max_rps = args.max_rps
+    scanner.governor.max_in_flight = max(1, args.max_in_flight)
+    scanner.governor.adaptive = not args.no_adaptive
+    scanner.breaker.threshold = max(0, args.breaker_threshold)
+    scanner.breaker.cooldown = args.breaker_cooldown
+    scanner.session.adaptive_timeouts = not args.fixed_timeouts
+    scanner._subdomain_wordlist = args.subdomain_wordlist
+    scanner._dir_wordlist = args.dir_wordlist
+    scanner._dir_extensions = [e.strip().lstrip(".") for e in args.dir_extensions.split(",") if e.strip()]
+    scanner._dir_workers = args.dir_workers
+    scanner._dir_max_bytes = args.dir_max_bytes
+    scanner._ports = args.ports
+    scanner._port_concurrency = args.port_concurrency
+    scanner._cve_db = args.cve_db
+    if args.no_cache:
+        scanner.lookup_cache = LookupCache(None)
+    else:
+        scanner.lookup_cache = lookup_cache if lookup_cache is not None else LookupCache(args.cache_dir)
+    scanner._dns_workers = args.dns_workers
+    scanner._nameservers = [ns.strip() for ns in args.nameservers.split(",") if ns.strip()]
+    scanner._time_budget = args.time_budget
+    scanner._grace = args.grace
+    scanner._plan_only = args.plan
+    scanner._max_requests = args.max_requests
+    if args.baseline:
+        try:
+            with open(args.baseline, encoding="utf-8") as fh:
+                scanner.load_baseline(json.load(fh))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Cannot use baseline {args.baseline}: {e}")
+    if args.checkpoint or args.resume:
+        scanner.checkpoint = ScanCheckpoint(args.checkpoint or args.resume)
+    if args.resume:
+        scanner.restore_checkpoint(ScanCheckpoint.load(args.resume))
+    return scanner
 
-    scanner.run_full_scan(emit_progress=args.progress)
 
-    if args.json_stdout:
-        severity_order = {"CRITICAL": 0, "HIGH": 1, "MEDIUM": 2, "LOW": 3, "INFO": 4}
-        sorted_findings = sorted(scanner.findings, key=lambda f: severity_order.get(f.severity, 5))
-        counts = defaultdict(int)
-        for f in scanner.findings:
-            counts[f.severity] += 1
-        report_data = {
-            "target": scanner.target_url,
-            "base_url": scanner.base_url,
-            "scan_date": datetime.now().isoformat(),
-            "summary": dict(counts),
-            "tech_stack": scanner.tech_stack,
-            "discovered_urls": list(scanner.discovered_urls),
-            "findings": [f.to_dict() for f in sorted_findings],
-            "dns_records": scanner.dns_records,
-            "whois_info": scanner.whois_info,
-            "cve_data": scanner.cve_data,
-            "subdomains": getattr(scanner, "subdomains", []),
-            "fuzz_results":      getattr(scanner, "fuzz_results", []),
-            "sensitive_findings": getattr(scanner, "sensitive_findings", []),
-            "broken_links":      getattr(scanner, "broken_links", []),
-        }
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+
+    if args.import_nvd:
+        print(f"Importing NVD feeds into {args.cve_db}")
+        totals = CVEIndex(args.cve_db).import_feeds(args.import_nvd)
+        print(f"Done: {totals['cves']} CVEs, {totals['cpe_matches']} CPE matches")
+        return
+    if (args.targets or args.serve) and (args.checkpoint or args.resume):
+        parser.error("--checkpoint/--resume apply to a single target, not --targets or --serve")
+    if args.targets:
+        runner = BatchRunner(parser, defaults=args, max_jobs=args.max_jobs)
+        asyncio.run(runner.run(read_targets(args.targets),
+                               lambda report: print(json.dumps(report, default=str), flush=True)))
+        return
+    if args.serve:
+        server = ScanServer(parser, defaults=args, max_jobs=args.max_jobs)
+        asyncio.run(server.serve_unix(args.socket) if args.socket else server.serve_stdio())
+        return
+    if not args.url:
+        parser.error("the following arguments are required: url")
+
+    progress_out = os.fdopen(args.progress_fd, "w", buffering=1) if args.progress_fd is not None else None
+    # Nothing but events may reach stdout in --ndjson mode
+    try:
+        scanner = configure_scanner(args, verbose=False if args.ndjson else None)
+    except ValueError as e:
+        parser.error(str(e))
+    scanner._progress_out = progress_out
+    writer = None
+    if args.ndjson:
+        writer = scanner.on_event = NDJSONWriter(sys.stdout, progress_out=progress_out, progress=args.progress)
+
+    def on_signal(signum, frame):
+        if scanner.cancelled.is_set():
+            os._exit(128 + signum)  # second signal: give up on the partial report
+        scanner.cancel(f"received {signal.Signals(signum).name}")
+
+    signal.signal(signal.SIGTERM, on_signal)
+    signal.signal(signal.SIGINT, on_signal)
+    scanner.run_full_scan(emit_progress=args.progress or progress_out is not None)
+
+    if writer is not None:
+        writer.summary(scanner.report_data())
+    elif args.plan and not args.json_stdout:
+        if scanner.plan is not None:
+            print(scanner.plan.format())
+    elif args.json_stdout:
+        report_data = scanner.report_data()
         print(json.dumps(report_data))
     else:
         output = args.output
@@ -2685,6 +6037,10 @@ def main():
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output = f"reports/{domain}_{timestamp}.txt"
         scanner.generate_report(output)
+    if scanner.abandoned:
+        # Phase threads that outlived the grace period would otherwise keep the process alive
+        sys.stdout.flush()
+        os._exit(0)
 
 
 if __name__ == "__main__":
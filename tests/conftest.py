@@ -25,3 +25,26 @@ def sample_finding():
 def scanner():
     """Create a TupiSecScanner instance without making network calls."""
     return TupiSecScanner("https://example.com", verbose=False)
+
+
+ALL_PHASES = ["headers", "ssl", "tech", "dns", "cves", "methods", "forms", "crawl", "sqli", "xss",
+              "directories", "ports", "open_redirect", "ssrf", "ssti", "cors", "subdomains", "param_fuzz",
+              "sensitive_data", "jwt", "rate_limit", "mixed_content", "graphql", "xxe", "broken_links",
+              "nosql", "cmd_injection", "default_creds", "crlf", "prototype", "s3_buckets", "smuggling",
+              "path_traversal", "file_upload"]
+
+
+@pytest.fixture
+def only_phases():
+    """Restrict a scanner's run_full_scan() to the given phase ids."""
+    def restrict(s, *keep):
+        s._skip_modules = ",".join(p for p in ALL_PHASES if p not in keep)
+        return s
+    return restrict
+
+
+@pytest.fixture(autouse=True)
+def isolated_lookup_cache(tmp_path, monkeypatch):
+    """Keep the persistent lookup cache out of the user's home directory."""
+    import scanner as scanner_module
+    monkeypatch.setattr(scanner_module, "CACHE_DIR", str(tmp_path / "cache"))
@@ -0,0 +1,143 @@
+"""Tests for the asyncio request layer, against a local HTTP server."""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from scanner import AsyncHTTPEngine, FetchResponse, TupiSecScanner
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith("/big"):
+            body = b"x" * (2 * 1024 * 1024)
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except OSError:
+                pass  # client stopped reading at its byte cap
+            return
+        if self.path.startswith("/exact") or self.path.startswith("/nul"):
+            # 1000 bytes; /nul adds a tail of NUL bytes, as in binary files
+            body = b"x" * 1000 + (b"\0" * 16 if self.path.startswith("/nul") else b"")
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if self.path.startswith("/slow"):
+            time.sleep(0.2)
+        body = json.dumps({"path": self.path, "cookie": self.headers.get("Cookie", "")}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server_url():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+@pytest.fixture(params=["aiohttp", "threads"])
+def backend(request):
+    if request.param == "aiohttp":
+        pytest.importorskip("aiohttp")
+    return request.param
+
+
+class TestFetchResponse:
+    def test_text_and_json(self):
+        r = FetchResponse("https://x", 200, {"Content-Type": "application/json"}, b'{"a": 1}')
+        assert r.text == '{"a": 1}'
+        assert r.json() == {"a": 1}
+        assert r.headers["content-type"] == "application/json"
+
+
+class TestAsyncEngine:
+    def test_fetch_sends_session_cookies(self, server_url, backend):
+        s = TupiSecScanner(server_url, verbose=False, cookies="sid=abc")
+
+        async def go():
+            async with AsyncHTTPEngine(s.session, use_aiohttp=(backend == "aiohttp")) as engine:
+                return await engine.request("GET", f"{server_url}/p", params={"q": "1"})
+
+        resp = asyncio.run(go())
+        assert resp.status_code == 200
+        assert resp.json()["path"] == "/p?q=1"
+        assert "sid=abc" in resp.json()["cookie"]
+
+    def test_requests_run_concurrently(self, server_url, backend):
+        s = TupiSecScanner(server_url, verbose=False)
+
+        async def go():
+            async with AsyncHTTPEngine(s.session, use_aiohttp=(backend == "aiohttp")) as engine:
+                return await asyncio.gather(*(engine.request("GET", f"{server_url}/slow/{i}") for i in range(10)))
+
+        start = time.time()
+        results = asyncio.run(go())
+        assert all(r.status_code == 200 for r in results)
+        assert time.time() - start < 1.5  # 10 × 0.2 s serially would take 2 s
+
+
+    def test_max_bytes_caps_body(self, server_url, backend):
+        s = TupiSecScanner(server_url, verbose=False)
+
+        async def go():
+            async with AsyncHTTPEngine(s.session, use_aiohttp=(backend == "aiohttp")) as engine:
+                big = await engine.request("GET", f"{server_url}/big", max_bytes=1000)
+                small = await engine.request("GET", f"{server_url}/p", max_bytes=100000)
+                return big, small
+
+        big, small = asyncio.run(go())
+        assert len(big.content) == 1000 and big.truncated
+        assert big.headers["Content-Length"] == str(2 * 1024 * 1024)
+        assert small.json()["path"] == "/p" and not small.truncated
+
+    def test_truncation_checks_for_remaining_bytes(self, server_url, backend):
+        s = TupiSecScanner(server_url, verbose=False)
+
+        async def go():
+            async with AsyncHTTPEngine(s.session, use_aiohttp=(backend == "aiohttp")) as engine:
+                exact = await engine.request("GET", f"{server_url}/exact", max_bytes=1000)
+                nul = await engine.request("GET", f"{server_url}/nul", max_bytes=1000)
+                return exact, nul
+
+        exact, nul = asyncio.run(go())
+        assert len(exact.content) == 1000 and not exact.truncated
+        assert nul.content == b"x" * 1000 and nul.truncated
+
+
+class TestScannerFetch:
+    def test_fetch_many_without_running_loop(self, server_url):
+        s = TupiSecScanner(server_url, verbose=False)
+        results = s.fetch_many([{"url": f"{server_url}/a"}, {"url": "http://127.0.0.1:1/nothing", "timeout": 1}])
+        assert results[0].json()["path"] == "/a"
+        assert isinstance(results[1], Exception)
+
+    def test_await_fetch_and_fetch_many_from_thread(self, server_url):
+        s = TupiSecScanner(server_url, verbose=False)
+
+        async def go():
+            first = await s.fetch(f"{server_url}/one")
+            # Module code in a worker thread reuses the loop-bound engine
+            rest = await asyncio.to_thread(s.fetch_many, [{"url": f"{server_url}/two"}])
+            await s.aclose()
+            return first, rest
+
+        first, rest = asyncio.run(go())
+        assert first.json()["path"] == "/one"
+        assert rest[0].json()["path"] == "/two"
@@ -0,0 +1,114 @@
+"""Tests for --baseline delta scans."""
+import pytest
+
+from scanner import TupiSecScanner, page_validators
+
+
+class FakeResponse:
+    def __init__(self, status, text="", headers=None):
+        self.status_code = status
+        self.text = text
+        self.content = text.encode()
+        self.headers = headers or {}
+
+
+PAGES = {"https://example.com/same": "same body", "https://example.com/etag": "etag body",
+         "https://example.com/edited": "old body"}
+
+
+def baseline_report():
+    return {
+        "target": "https://example.com",
+        "discovered_urls": list(PAGES) + ["https://example.com/search?q=1"],
+        "discovered_forms": [{"action": "/login", "method": "POST", "fields": {"user": {}},
+                              "url": "https://example.com/same"},
+                             {"action": "/comment", "method": "POST", "fields": {"text": {}},
+                              "url": "https://example.com/edited"}],
+        "tech_stack": {"Server": "nginx"},
+        "page_validators": {url: dict(page_validators(FakeResponse(200, body)),
+                                      etag='"v1"' if url.endswith("etag") else None)
+                            for url, body in PAGES.items()},
+        "findings": [
+            {"severity": "LOW", "category": "Info", "title": "Comment", "detail": "In https://example.com/same."},
+            {"severity": "HIGH", "category": "XSS", "title": "XSS", "detail": "https://example.com/edited"},
+            {"severity": "LOW", "category": "Headers", "title": "No CSP", "detail": "Missing header"},
+        ],
+    }
+
+
+@pytest.fixture
+def delta(monkeypatch):
+    s = TupiSecScanner("https://example.com", verbose=False)
+    s.load_baseline(baseline_report())
+    sent = {}
+
+    def fake_get(url, headers=None, **kwargs):
+        sent[url] = headers
+        if headers.get("If-None-Match") == '"v1"':
+            return FakeResponse(304)
+        return FakeResponse(200, "new body" if url.endswith("edited") else PAGES[url])
+
+    monkeypatch.setattr(s.session, "get", fake_get)
+    return s, sent
+
+
+class TestBaseline:
+    def test_seeds_urls_forms_and_tech(self):
+        s = TupiSecScanner("https://example.com", verbose=False)
+        s.load_baseline(baseline_report())
+        assert "https://example.com/search?q=1" in s.discovered_urls
+        assert len(s.discovered_forms) == 2
+        assert s.tech_stack == {"Server": "nginx"}
+
+    def test_other_target_rejected(self):
+        with pytest.raises(ValueError):
+            TupiSecScanner("https://other.com", verbose=False).load_baseline(baseline_report())
+
+    def test_revalidation_classifies_pages(self, delta):
+        s, sent = delta
+        assert s._revalidate_baseline() == ["https://example.com/edited"]
+        assert s._unchanged_pages == {"https://example.com/same", "https://example.com/etag"}
+        assert sent["https://example.com/etag"] == {"If-None-Match": '"v1"'}
+
+    def test_active_modules_skip_unchanged_pages(self, delta):
+        s, _ = delta
+        s._revalidate_baseline()
+        assert s.test_urls() == {"https://example.com/edited", "https://example.com/search?q=1"}
+        sources = {p.source for p in s.injection_points()}
+        assert sources == {"https://example.com/edited", "https://example.com/search?q=1"}
+
+    def test_findings_on_unchanged_pages_carried_over(self, delta):
+        s, _ = delta
+        s._revalidate_baseline()
+        assert [f.title for f in s.findings] == ["Comment"]
+        s.add_finding("LOW", "Info", "Comment", "In https://example.com/same.")
+        assert len(s.findings) == 1
+        assert s.report_data()["baseline"] == {"unchanged_pages": 2, "changed_pages": 1, "carried_findings": 1}
+
+    def test_findings_carried_by_injection_page(self, monkeypatch):
+        report = baseline_report()
+        report["findings"] = [
+            {"severity": "CRITICAL", "category": "SQL Injection", "title": "Possible SQLi in field 'user'",
+             "detail": "Payload: '\nSQL error pattern found: 'sql syntax'", "page": "https://example.com/same"},
+            {"severity": "HIGH", "category": "XSS", "title": "Reflected XSS in field 'text'",
+             "detail": "Payload reflected without encoding: <b>", "page": "https://example.com/edited"},
+        ]
+        s = TupiSecScanner("https://example.com", verbose=False)
+        s.load_baseline(report)
+        monkeypatch.setattr(s.session, "get", lambda url, headers=None, **kw: FakeResponse(
+            200, "new body" if url.endswith("edited") else PAGES[url]))
+        s._revalidate_baseline()
+        assert [f.to_dict()["page"] for f in s.findings] == ["https://example.com/same"]
+        assert [f["url"] for f in s.test_forms()] == ["https://example.com/edited"]
+
+    def test_crawl_refetches_only_changed_pages(self, delta, monkeypatch):
+        s, _ = delta
+        crawled = []
+
+        def fake_cached_get(url, **kwargs):
+            crawled.append(url)
+            return FakeResponse(200, "", {"Content-Type": "text/html"})
+
+        monkeypatch.setattr(s, "cached_get", fake_cached_get)
+        s.crawl()
+        assert sorted(crawled) == ["https://example.com", "https://example.com/edited"]
@@ -0,0 +1,100 @@
+"""Tests for --targets batch scanning."""
+import asyncio
+import io
+import threading
+
+import pytest
+
+import scanner
+from scanner import BatchRunner, LookupCache, TupiSecScanner, build_parser, read_targets
+
+active = {}
+
+
+async def fake_scan(self, emit_progress=False):
+    host = self.parsed.netloc
+    active[host] = active.get(host, 0) + 1
+    assert active[host] == 1, f"two scans of {host} at once"
+    await asyncio.sleep(0.02)
+    active[host] -= 1
+    if "broken" in host:
+        raise RuntimeError("boom")
+    self.add_finding("LOW", "Information Disclosure", "Server header exposed", "Server: test")
+
+
+@pytest.fixture
+def runner(monkeypatch):
+    active.clear()
+    monkeypatch.setattr(TupiSecScanner, "run_full_scan_async", fake_scan)
+    parser = build_parser()
+    return BatchRunner(parser, defaults=parser.parse_args(["--targets", "-"]), max_jobs=3)
+
+
+def run_batch(runner, targets):
+    reports = []
+    asyncio.run(runner.run(targets, reports.append))
+    return reports
+
+
+class TestBatchRunner:
+    def test_one_report_per_target(self, runner):
+        targets = ["https://a.example.com", "https://b.example.com", "https://c.example.com"]
+        reports = run_batch(runner, targets)
+        assert sorted(r["target"] for r in reports) == targets
+        assert all(r["findings"][0]["title"] == "Server header exposed" for r in reports)
+
+    def test_same_host_never_scanned_concurrently(self, runner):
+        targets = ["https://a.example.com/x", "https://a.example.com/y", "https://b.example.com"]
+        reports = run_batch(runner, targets)
+        assert len(reports) == 3 and not any("error" in r for r in reports)
+
+    def test_failed_target_reported_as_error(self, runner):
+        reports = run_batch(runner, ["https://broken.example.com", "https://a.example.com"])
+        assert {"target": "https://broken.example.com", "error": "boom"} in reports
+
+    def test_scanner_setup_error_reported_per_target(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(TupiSecScanner, "run_full_scan_async", fake_scan)
+        baseline = tmp_path / "baseline.json"
+        baseline.write_text('{"target": "https://a.example.com"}')
+        parser = build_parser()
+        runner = BatchRunner(parser, defaults=parser.parse_args(["--targets", "-", "--baseline", str(baseline)]))
+        reports = run_batch(runner, ["https://a.example.com", "https://b.example.com"])
+        errors = {r["target"]: r.get("error") for r in reports}
+        assert errors["https://a.example.com"] is None
+        assert "Baseline report is not for https://b.example.com" in errors["https://b.example.com"]
+
+    def test_scanners_share_governor_and_latency(self, runner):
+        a, b = (runner._make_scanner(runner._parse({"url": u})) for u in ("https://a.test", "https://b.test"))
+        assert a.governor is b.governor is a.session.governor is runner.governor
+        assert a.latency is b.latency is b.session.latency
+        assert a.lookup_cache is b.lookup_cache
+
+
+class TestReadTargets:
+    def test_file_scheme_and_duplicates(self, tmp_path):
+        path = tmp_path / "targets.txt"
+        path.write_text("# hosts\nexample.com\nhttp://test.local\n\nexample.com\n")
+        assert read_targets(str(path)) == ["https://example.com", "http://test.local"]
+
+    def test_stdin(self, monkeypatch):
+        monkeypatch.setattr(scanner.sys, "stdin", io.StringIO("a.example.com\n"))
+        assert read_targets("-") == ["https://a.example.com"]
+
+
+class TestSingleFlight:
+    def test_concurrent_lookups_compute_once(self, tmp_path):
+        cache = LookupCache(str(tmp_path / "cache"))
+        calls = []
+
+        def lookup():
+            with cache.single_flight("whois", "example.com"):
+                if cache.get("whois", "example.com") is None:
+                    calls.append(1)
+                    cache.set("whois", "example.com", {"registrar": "x"})
+
+        threads = [threading.Thread(target=lookup) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(calls) == 1
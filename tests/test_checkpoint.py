@@ -0,0 +1,83 @@
+"""Tests for scan checkpoints and --resume."""
+import pytest
+
+from scanner import DIR_BATCH, FetchResponse, ScanCheckpoint, TupiSecScanner
+
+
+def make_scanner(tmp_path, path="ck.json.gz"):
+    s = TupiSecScanner("https://example.com", verbose=False)
+    s.checkpoint = ScanCheckpoint(str(tmp_path / path))
+    return s
+
+
+class TestScanCheckpoint:
+    def test_round_trip(self, tmp_path):
+        s = make_scanner(tmp_path)
+        s.discovered_urls = {"https://example.com/a"}
+        s._add_form({"action": "/login", "method": "POST", "fields": ["user"]}, "https://example.com/a")
+        s.tech_stack = {"Server": "nginx"}
+        s.add_finding("HIGH", "XSS", "Reflected XSS", "param q")
+        s._complete_phase("crawl")
+
+        r = TupiSecScanner("https://example.com", verbose=False)
+        r.restore_checkpoint(ScanCheckpoint.load(s.checkpoint.path))
+        assert r.discovered_urls == s.discovered_urls
+        assert r.discovered_forms == s.discovered_forms
+        assert r.tech_stack == {"Server": "nginx"}
+        assert [f.to_dict() for f in r.findings] == [f.to_dict() for f in s.findings]
+        assert r.report_data()["resumed_phases"] == ["crawl"]
+        assert not r._add_form({"action": "/login", "method": "POST", "fields": ["user"]}, "https://example.com/a")
+
+    def test_rerun_phase_does_not_duplicate_findings(self, tmp_path):
+        s = make_scanner(tmp_path)
+        s.add_finding("HIGH", "XSS", "Reflected XSS", "param q")
+        s.save_checkpoint()
+        r = TupiSecScanner("https://example.com", verbose=False)
+        r.restore_checkpoint(ScanCheckpoint.load(s.checkpoint.path))
+        r.add_finding("HIGH", "XSS", "Reflected XSS", "param q")
+        r.add_finding("HIGH", "XSS", "Reflected XSS", "param id")
+        assert [f.detail for f in r.findings] == ["param q", "param id"]
+
+    def test_wrong_target_rejected(self, tmp_path):
+        s = make_scanner(tmp_path)
+        s.save_checkpoint()
+        with pytest.raises(ValueError):
+            TupiSecScanner("https://other.com", verbose=False).restore_checkpoint(
+                ScanCheckpoint.load(s.checkpoint.path))
+
+    def test_unreadable_file(self, tmp_path):
+        bad = tmp_path / "bad.gz"
+        bad.write_text("not gzip")
+        with pytest.raises(ValueError):
+            ScanCheckpoint.load(str(bad))
+
+    def test_cancelled_phase_not_marked_complete(self, tmp_path):
+        s = make_scanner(tmp_path)
+        s.cancel()
+        s._complete_phase("sqli")
+        assert s.checkpoint.completed == set()
+
+
+class TestCursors:
+    def test_directory_probe_resumes_after_last_batch(self, tmp_path, monkeypatch):
+        s = make_scanner(tmp_path)
+        s.checkpoint.cursors["directories"] = DIR_BATCH
+        probed = []
+
+        def fake_fetch_many(jobs, limit=None):
+            jobs = list(jobs)
+            probed.extend(job["url"] for job in jobs)
+            return [FetchResponse(job["url"], 404, {}, b"") for job in jobs]
+
+        monkeypatch.setattr(s, "fetch_many", fake_fetch_many)
+        paths = [f"p{i}" for i in range(DIR_BATCH + 3)]
+        list(s._probe_paths(paths, cursor="directories"))
+        assert probed == [f"https://example.com/p{i}" for i in range(DIR_BATCH, DIR_BATCH + 3)]
+        assert s.checkpoint.cursors["directories"] == DIR_BATCH + 3
+
+    def test_periodic_save_within_phase(self, tmp_path, monkeypatch):
+        s = make_scanner(tmp_path)
+        s.checkpoint.every = 10
+        monkeypatch.setattr(s.governor, "total_requests", lambda: 10)
+        s.set_cursor("directories", 40)
+        assert ScanCheckpoint.load(s.checkpoint.path)["cursors"] == {"directories": 40}
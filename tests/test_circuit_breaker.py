@@ -0,0 +1,135 @@
+"""Tests for the per-host circuit breaker."""
+import socket
+import threading
+
+import pytest
+
+import scanner
+from scanner import CircuitBreaker, CircuitOpenError, ContextThreadPool, GovernedSession, TupiSecScanner
+
+HOST = "example.com"
+
+
+def dead_url():
+    s = socket.socket()
+    s.bind(("127.0.0.1", 0))
+    port = s.getsockname()[1]
+    s.close()
+    return f"http://127.0.0.1:{port}/"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(scanner.time, "monotonic", lambda: now[0])
+    return now
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self):
+        cb = CircuitBreaker(threshold=3)
+        for _ in range(2):
+            cb.record_failure(HOST)
+        cb.before(HOST)
+        cb.record_failure(HOST)
+        with pytest.raises(CircuitOpenError):
+            cb.before(HOST)
+        assert cb.stats()["hosts"][HOST] == {"state": "open", "trips": 1, "rejected": 1}
+
+    def test_success_resets_the_count(self):
+        cb = CircuitBreaker(threshold=2)
+        cb.record_failure(HOST)
+        cb.record_success(HOST)
+        cb.record_failure(HOST)
+        cb.before(HOST)
+
+    def test_half_open_lets_one_probe_through(self, clock):
+        events = []
+        cb = CircuitBreaker(threshold=1, cooldown=10, on_change=lambda h, s: events.append(s))
+        cb.record_failure(HOST)
+        clock[0] += 10
+        cb.before(HOST)  # the probe
+        with pytest.raises(CircuitOpenError):
+            cb.before(HOST)
+        cb.record_success(HOST)
+        cb.before(HOST)
+        assert events == ["open", "closed"]
+
+    def test_failed_probe_doubles_cooldown(self, clock):
+        cb = CircuitBreaker(threshold=1, cooldown=10)
+        cb.record_failure(HOST)
+        clock[0] += 10
+        cb.before(HOST)
+        cb.record_failure(HOST)
+        clock[0] += 10
+        with pytest.raises(CircuitOpenError):
+            cb.before(HOST)
+        clock[0] += 10
+        cb.before(HOST)
+        assert cb.stats()["hosts"][HOST]["trips"] == 2
+
+    def test_disabled(self):
+        cb = CircuitBreaker(threshold=0)
+        for _ in range(10):
+            cb.record_failure(HOST)
+        cb.before(HOST)
+
+
+class TestGovernedSession:
+    def test_dead_host_fails_fast(self):
+        session = GovernedSession(breaker=CircuitBreaker(threshold=2))
+        url = dead_url()
+        for _ in range(2):
+            with pytest.raises(scanner.requests.ConnectionError):
+                session.get(url, timeout=2)
+        with pytest.raises(CircuitOpenError):
+            session.get(url, timeout=2)
+        host = url.split("/")[2]
+        assert session.governor.stats()["hosts"][host]["requests"] == 2  # rejected before sending
+
+
+class TestScannerReport:
+    def test_short_circuited_phases_reported(self):
+        s = TupiSecScanner(dead_url(), verbose=False)
+        s.breaker.threshold = 1
+
+        def module():
+            for _ in range(3):
+                try:
+                    s.session.get(s.target_url, timeout=2)
+                except Exception:
+                    pass
+
+        s._track_short_circuits("headers", module)()
+        report = s.report_data()["circuit_breaker"]
+        assert report["short_circuited"] == {"headers": 2}
+        assert "headers: 2 requests skipped" in s.generate_report()
+
+    def test_rejections_charged_to_the_phase_that_made_them(self):
+        s = TupiSecScanner(dead_url(), verbose=False)
+        s.breaker.threshold = 1
+        headers_running, dead_done = threading.Event(), threading.Event()
+
+        def get():
+            try:
+                s.session.get(s.target_url, timeout=2)
+            except Exception:
+                pass
+
+        def dead_module():
+            headers_running.wait(5)
+            with ContextThreadPool(max_workers=1) as pool:  # rejections from a module's own pool
+                list(pool.map(lambda _: get(), range(3)))
+            dead_done.set()
+
+        def idle_module():  # overlaps the other phase without sending anything
+            headers_running.set()
+            dead_done.wait(5)
+
+        threads = [threading.Thread(target=s._track_short_circuits(pid, fn))
+                   for pid, fn in (("directories", dead_module), ("headers", idle_module))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert s.short_circuited == {"directories": 2}
@@ -0,0 +1,59 @@
+"""Tests for the concurrent crawler, using an in-memory site instead of the network."""
+from scanner import TupiSecScanner
+
+SITE = {
+    "https://example.com": '<a href="/a">a</a><a href="/b">b</a><a href="/logo.png">img</a>'
+                           '<form action="/login" method="post"><input name="user"></form>',
+    "https://example.com/a": '<a href="/c">c</a><form action="/search"><input name="q"></form>',
+    "https://example.com/b": '<a href="https://other.org/x">x</a>'
+                             '<form action="/login" method="post"><input name="user"></form>',
+    "https://example.com/c": '<a href="/d">d</a>',
+}
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+        self.content = text.encode()
+        self.status_code = 200
+        self.headers = {"Content-Type": "text/html"}
+
+
+def make_scanner(monkeypatch):
+    s = TupiSecScanner("https://example.com", verbose=False)
+    fetched = []
+
+    def fake_get(url, **kwargs):
+        fetched.append(url)
+        return FakeResponse(SITE.get(url, ""))
+
+    monkeypatch.setattr(s, "cached_get", fake_get)
+    return s, fetched
+
+
+class TestCrawler:
+    def test_depth_limits_fetch_levels(self, monkeypatch):
+        s, fetched = make_scanner(monkeypatch)
+        s.crawl(depth=2)
+        assert "https://example.com/c" in s.discovered_urls  # seen on level 1
+        assert "https://example.com/c" not in fetched        # but not fetched
+        assert not any("other.org" in u for u in s.discovered_urls)
+
+    def test_static_assets_recorded_but_not_fetched(self, monkeypatch):
+        s, fetched = make_scanner(monkeypatch)
+        s.crawl(depth=2)
+        assert "https://example.com/logo.png" in s.discovered_urls
+        assert "https://example.com/logo.png" not in fetched
+
+    def test_max_pages_budget(self, monkeypatch):
+        s, fetched = make_scanner(monkeypatch)
+        s.crawl(depth=5, max_pages=2)
+        assert len(fetched) == 2
+
+    def test_forms_collected_from_every_page_once(self, monkeypatch):
+        s, _ = make_scanner(monkeypatch)
+        s.crawl(depth=2)
+        actions = sorted(f["action"] for f in s.discovered_forms)
+        assert actions == ["/login", "https://example.com/search"]
+        search = next(f for f in s.discovered_forms if "search" in f["action"])
+        assert search["url"] == "https://example.com/a"
@@ -0,0 +1,100 @@
+"""Tests for the offline NVD index used by scan_cves."""
+import gzip
+import json
+
+import pytest
+
+import scanner
+from scanner import CVEIndex, TupiSecScanner
+
+FEED_V2 = {
+    "vulnerabilities": [
+        {"cve": {
+            "id": "CVE-2021-23017",
+            "descriptions": [{"lang": "en", "value": "nginx resolver off-by-one"}],
+            "metrics": {"cvssMetricV31": [{"cvssData": {"baseScore": 9.8}}]},
+            "configurations": [{"nodes": [{"cpeMatch": [{
+                "vulnerable": True, "criteria": "cpe:2.3:a:f5:nginx:*:*:*:*:*:*:*:*",
+                "versionStartIncluding": "0.6.18", "versionEndExcluding": "1.20.1"}]}]}],
+        }},
+        {"cve": {
+            "id": "CVE-2099-0001",
+            "descriptions": [{"lang": "en", "value": "low severity"}],
+            "metrics": {"cvssMetricV31": [{"cvssData": {"baseScore": 4.0}}]},
+            "configurations": [{"nodes": [{"cpeMatch": [{
+                "vulnerable": True, "criteria": "cpe:2.3:a:f5:nginx:1.18.0:*:*:*:*:*:*:*"}]}]}],
+        }},
+        {"cve": {
+            "id": "CVE-2021-41773",
+            "descriptions": [{"lang": "en", "value": "Apache httpd path traversal"}],
+            "metrics": {"cvssMetricV31": [{"cvssData": {"baseScore": 7.5}}]},
+            "configurations": [{"nodes": [{"cpeMatch": [{
+                "vulnerable": True, "criteria": "cpe:2.3:a:apache:http_server:2.4.49:*:*:*:*:*:*:*"}]}]}],
+        }},
+        {"cve": {
+            "id": "CVE-2099-0002",
+            "descriptions": [{"lang": "en", "value": "IBM HTTP Server flaw"}],
+            "metrics": {"cvssMetricV31": [{"cvssData": {"baseScore": 9.1}}]},
+            "configurations": [{"nodes": [{"cpeMatch": [{
+                "vulnerable": True, "criteria": "cpe:2.3:a:ibm:http_server:2.4.49:*:*:*:*:*:*:*"}]}]}],
+        }},
+    ]
+}
+
+FEED_V11 = {
+    "CVE_Items": [{
+        "cve": {"CVE_data_meta": {"ID": "CVE-2019-11043"},
+                "description": {"description_data": [{"lang": "en", "value": "php-fpm RCE"}]}},
+        "impact": {"baseMetricV3": {"cvssV3": {"baseScore": 9.8}}},
+        "configurations": {"nodes": [{"operator": "AND", "children": [{"cpe_match": [{
+            "vulnerable": True, "cpe23Uri": "cpe:2.3:a:php:php:7.1.0:*:*:*:*:*:*:*"}]}]}]},
+    }]
+}
+
+
+@pytest.fixture
+def index(tmp_path):
+    v2 = tmp_path / "nvd-2.json"
+    v2.write_text(json.dumps(FEED_V2))
+    v11 = tmp_path / "nvdcve-1.1-2019.json.gz"
+    with gzip.open(v11, "wt") as fh:
+        json.dump(FEED_V11, fh)
+    idx = CVEIndex(str(tmp_path / "db" / "nvd.sqlite"))
+    totals = idx.import_feeds([str(v2), str(v11)], log=lambda msg: None)
+    assert totals == {"cves": 5, "cpe_matches": 5}
+    return idx
+
+
+class TestCVEIndex:
+    def test_version_range_match(self, index):
+        assert [c["cve_id"] for c in index.lookup("nginx", "1.18.0")] == ["CVE-2021-23017"]
+        assert index.lookup("nginx", "1.20.1") == []
+
+    def test_low_scores_filtered(self, index):
+        ids = {c["cve_id"] for c in index.lookup("nginx", "1.18.0", min_score=0)}
+        assert ids == {"CVE-2021-23017", "CVE-2099-0001"}
+
+    def test_alias_matches_vendor_of_shared_product_name(self, index):
+        assert [c["cve_id"] for c in index.lookup("Apache", "2.4.49")] == ["CVE-2021-41773"]
+
+    def test_legacy_feed_nested_nodes(self, index):
+        assert [c["cve_id"] for c in index.lookup("PHP", "7.1.0")] == ["CVE-2019-11043"]
+        assert index.lookup("PHP", "7.1.1") == []
+
+    def test_reimport_replaces_matches(self, index, tmp_path):
+        again = tmp_path / "again.json"
+        again.write_text(json.dumps(FEED_V2))
+        index.import_feeds([str(again)], log=lambda msg: None)
+        assert len(index.lookup("nginx", "1.18.0")) == 1
+
+    def test_scan_cves_uses_index_without_network(self, index, monkeypatch):
+        def no_network(*args, **kwargs):
+            raise AssertionError("live NVD API must not be used")
+
+        monkeypatch.setattr(scanner.requests, "get", no_network)
+        s = TupiSecScanner("https://example.com", verbose=False)
+        s._cve_db = index.path
+        s.tech_stack = {"Server": "nginx/1.18.0", "X-Powered-By": "PHP/7.1.0"}
+        s.scan_cves()
+        assert sorted(c["cve_id"] for c in s.cve_data) == ["CVE-2019-11043", "CVE-2021-23017"]
+        assert {f.severity for f in s.findings} == {"CRITICAL"}
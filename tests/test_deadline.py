@@ -0,0 +1,65 @@
+"""Tests for --time-budget, cancellation and partial reports."""
+import time
+
+import pytest
+
+from scanner import ScanCancelled, TupiSecScanner
+
+
+@pytest.fixture
+def two_phase_scanner(monkeypatch, only_phases):
+    """Scanner running only ``headers`` (given) then ``jwt`` (a no-op), one phase at a time."""
+    def make(headers):
+        s = only_phases(TupiSecScanner("http://127.0.0.1", verbose=False), "headers", "jwt")
+        s._workers = 1
+        monkeypatch.setattr(s, "scan_headers", headers)
+        monkeypatch.setattr(s, "scan_jwt", lambda: None)
+        return s
+    return make
+
+
+class TestTimeBudget:
+    def test_budget_stops_scan_with_partial_report(self, two_phase_scanner):
+        def headers():
+            s.add_finding("LOW", "Headers", "Missing CSP", "")
+            s.cancelled.wait(5)
+
+        s = two_phase_scanner(headers)
+        s._time_budget = 0.2
+        s.run_full_scan()
+        report = s.report_data()
+        assert report["partial"] and report["stop_reason"] == "time budget exceeded"
+        assert report["modules"] == {"headers": "partial", "jwt": "skipped"}
+        assert [f["title"] for f in report["findings"]] == ["Missing CSP"]
+
+    def test_unfinished_phase_abandoned_after_grace(self, two_phase_scanner):
+        s = two_phase_scanner(lambda: time.sleep(1))
+        s._time_budget = 0.1
+        s._grace = 0.1
+        started = time.monotonic()
+        s.run_full_scan()
+        assert time.monotonic() - started < 0.9
+        assert s.abandoned
+        assert s.report_data()["modules"]["headers"] == "partial"
+
+    def test_complete_scan_not_partial(self, two_phase_scanner):
+        s = two_phase_scanner(lambda: None)
+        s.run_full_scan()
+        report = s.report_data()
+        assert not report["partial"] and report["stop_reason"] is None
+        assert report["modules"] == {"headers": "completed", "jwt": "completed"}
+
+
+class TestCancel:
+    def test_first_reason_kept(self):
+        s = TupiSecScanner("http://127.0.0.1", verbose=False)
+        s.cancel("received SIGTERM")
+        s.cancel("time budget exceeded")
+        assert s.stop_reason == "received SIGTERM"
+
+    def test_no_requests_after_cancel(self):
+        s = TupiSecScanner("http://127.0.0.1", verbose=False)
+        s.cancel()
+        results = s.fetch_many([{"url": "http://127.0.0.1/a"}, {"url": "http://127.0.0.1/b"}])
+        assert all(isinstance(r, ScanCancelled) for r in results)
+        assert s.governor.total_requests() == 0
@@ -0,0 +1,71 @@
+"""Tests for concurrent directory enumeration."""
+from scanner import COMMON_PATHS, FetchResponse, TupiSecScanner
+
+
+def make_scanner(monkeypatch, pages):
+    s = TupiSecScanner("https://example.com", verbose=False)
+    calls = []
+
+    def fake_fetch_many(jobs, limit=None):
+        jobs = list(jobs)
+        calls.append((jobs, limit))
+        out = []
+        for job in jobs:
+            status, body, headers = pages.get(job["url"], (404, b"", {}))
+            out.append(FetchResponse(job["url"], status, headers, body))
+        return out
+
+    monkeypatch.setattr(s, "fetch_many", fake_fetch_many)
+    return s, calls
+
+
+class TestDirectoryCandidates:
+    def test_wordlist_with_extension_permutations(self, tmp_path, monkeypatch):
+        wordlist = tmp_path / "dirs.txt"
+        wordlist.write_text("backup\nprivate/\nold.zip\n.env\n")
+        s, _ = make_scanner(monkeypatch, {})
+        s._dir_wordlist = str(wordlist)
+        s._dir_extensions = ["php", "bak"]
+        extra = list(s._directory_candidates())[len(COMMON_PATHS):]
+        assert extra == ["backup", "backup.php", "backup.bak", "private/", "old.zip"]  # .env is built in
+
+
+class TestScanDirectories:
+    def test_probes_are_capped_and_limited(self, monkeypatch):
+        s, calls = make_scanner(monkeypatch, {})
+        s._dir_workers = 7
+        s._dir_max_bytes = 512
+        s.scan_directories()
+        profile_jobs, _ = calls[0]  # the soft-404 profile is capped like the probes it judges
+        jobs, limit = calls[1]
+        assert limit == 7
+        assert all(job["max_bytes"] == 512 for job in profile_jobs + jobs)
+
+    def test_reports_declared_size_of_capped_hit(self, monkeypatch):
+        pages = {"https://example.com/dump.sql": (200, b"x" * 10, {"Content-Length": "734003200"})}
+        s, _ = make_scanner(monkeypatch, pages)
+        s.scan_directories()
+        finding = next(f for f in s.findings if f.title == "Accessible: dump.sql")
+        assert "Size: 734003200 bytes" in finding.detail
+
+    def test_body_size_without_content_length(self):
+        resp = FetchResponse("https://x", 200, {}, b"abc")
+        assert TupiSecScanner._body_size(resp) == (3, False)
+        resp.truncated = True
+        assert TupiSecScanner._body_size(resp) == (3, True)
+
+    def test_capped_size_marked_in_finding(self, monkeypatch):
+        pages = {"https://example.com/dump.sql": (200, b"x" * 10, {})}
+        s, _ = make_scanner(monkeypatch, pages)
+        real_fetch_many = s.fetch_many
+
+        def capped_fetch_many(jobs, limit=None):
+            out = real_fetch_many(jobs, limit)
+            for resp in out:
+                resp.truncated = resp.url.endswith("dump.sql")
+            return out
+
+        monkeypatch.setattr(s, "fetch_many", capped_fetch_many)
+        s.scan_directories()
+        finding = next(f for f in s.findings if f.title == "Accessible: dump.sql")
+        assert "Size: 10+ bytes" in finding.detail
@@ -0,0 +1,98 @@
+"""Tests for the concurrent subdomain resolver, using fake lookups instead of real DNS."""
+import itertools
+
+import pytest
+
+import scanner
+from scanner import DNSResolverPool, TupiSecScanner, iter_wordlist
+
+pytest.importorskip("dns.resolver")
+
+ZONE = {
+    "www.example.com": {"A": ["93.184.216.34"], "AAAA": [], "CNAME": None},
+    "api.example.com": {"A": ["10.0.0.5"], "AAAA": [], "CNAME": None},
+    "v6only.example.com": {"A": [], "AAAA": ["2001:db8::1"], "CNAME": None},
+}
+EMPTY = {"A": [], "AAAA": [], "CNAME": None}
+
+
+def fake_lookup(self, fqdn):
+    return ZONE.get(fqdn, EMPTY)
+
+
+class TestResolverPool:
+    def test_resolve_many_returns_every_name(self, monkeypatch):
+        monkeypatch.setattr(DNSResolverPool, "lookup", fake_lookup)
+        pool = DNSResolverPool(workers=4)
+        results = dict(pool.resolve_many(["www.example.com", "nope.example.com"]))
+        assert results == {"www.example.com": ZONE["www.example.com"], "nope.example.com": EMPTY}
+
+    def test_input_consumed_lazily(self, monkeypatch):
+        monkeypatch.setattr(DNSResolverPool, "lookup", fake_lookup)
+        pool = DNSResolverPool(workers=2)
+        pulled = []
+
+        def names():
+            for i in itertools.count():
+                pulled.append(i)
+                yield f"h{i}.example.com"
+
+        first = list(itertools.islice(pool.resolve_many(names()), 3))
+        assert len(first) == 3
+        assert len(pulled) < 50  # bounded window, not the whole (infinite) input
+
+    def test_custom_nameservers(self):
+        pool = DNSResolverPool(nameservers=["192.0.2.53"])
+        assert pool._resolver().nameservers == ["192.0.2.53"]
+
+
+class TestWordlist:
+    def test_skips_blank_and_comment_lines(self, tmp_path):
+        path = tmp_path / "subs.txt"
+        path.write_text("# comment\nwww\n\n  api  \n")
+        assert list(iter_wordlist(str(path))) == ["www", "api"]
+
+
+class TestScanSubdomains:
+    def test_external_wordlist_and_aaaa_only_hosts(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(DNSResolverPool, "lookup", fake_lookup)
+        path = tmp_path / "subs.txt"
+        path.write_text("www\nv6only\n")
+        s = TupiSecScanner("https://example.com", verbose=False)
+        s._subdomain_wordlist = str(path)
+
+        def fake_get(url, **kwargs):
+            raise scanner.requests.ConnectionError()
+
+        monkeypatch.setattr(s.session, "get", fake_get)
+        s.scan_subdomains()
+        found = [d["subdomain"] for d in s.subdomains]
+        assert found == ["api.example.com", "v6only.example.com", "www.example.com"]
+
+    def test_cancel_stops_feeding_candidates(self, monkeypatch):
+        looked_up = []
+
+        def lookup(self, fqdn):
+            looked_up.append(fqdn)
+            return EMPTY
+
+        monkeypatch.setattr(DNSResolverPool, "lookup", lookup)
+        monkeypatch.setattr(TupiSecScanner, "_detect_wildcard", lambda self, resolver, apex: set())
+        s = TupiSecScanner("https://example.com", verbose=False)
+        s.cancel()
+        s.scan_subdomains()
+        assert looked_up == []
+
+    def test_wildcard_detected_once_per_apex(self, monkeypatch):
+        calls = []
+
+        def wildcard_lookup(self, fqdn):
+            calls.append(fqdn)
+            return {"A": ["1.2.3.4"], "AAAA": [], "CNAME": None}
+
+        monkeypatch.setattr(DNSResolverPool, "lookup", wildcard_lookup)
+        s = TupiSecScanner("https://example.com", verbose=False)
+        pool = DNSResolverPool()
+        assert s._detect_wildcard(pool, "example.com") == {"1.2.3.4"}
+        s._detect_wildcard(pool, "example.com")
+        assert len(calls) == 2
@@ -0,0 +1,124 @@
+"""Tests for injection-point enumeration and the batched payload dispatcher."""
+from scanner import InjectionPoint, PayloadDispatcher, TupiSecScanner
+
+
+class FakeResponse:
+    def __init__(self, text="", status_code=200, headers=None):
+        self.text = text
+        self.content = text.encode()
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class FakeFetcher:
+    """Stands in for fetch_many(); reflects the sent values into the body."""
+
+    def __init__(self):
+        self.jobs = []
+
+    def __call__(self, jobs):
+        out = []
+        for job in jobs:
+            self.jobs.append(job)
+            values = job.get("params") or job.get("data") or job.get("json_body") or {}
+            out.append(FakeResponse(" ".join(str(v) for v in values.values())))
+        return out
+
+
+def make_scanner():
+    s = TupiSecScanner("https://example.com", verbose=False)
+    s.discovered_forms = [
+        {"action": "/login", "method": "POST", "url": "https://example.com",
+         "fields": {"user": {"type": "text", "value": ""},
+                    "csrf": {"type": "hidden", "value": "tok"}}},
+        {"action": "https://example.com/search", "method": "GET", "url": "https://example.com/a",
+         "fields": {"q": {"type": "text", "value": ""}}},
+    ]
+    s.discovered_urls = {"https://example.com/item?id=1&view=full", "https://example.com/about"}
+    return s
+
+
+class TestInjectionPoints:
+    def test_forms_and_query_params_enumerated(self):
+        points = make_scanner().injection_points()
+        found = {(p.kind, p.method, p.url, p.param) for p in points}
+        assert ("form", "POST", "https://example.com/login", "user") in found
+        assert ("form", "GET", "https://example.com/search", "q") in found
+        assert ("query", "GET", "https://example.com/item", "id") in found
+        assert ("query", "GET", "https://example.com/item", "view") in found
+
+    def test_form_points_skip_hidden_fields(self):
+        params = {p.param for p in make_scanner()._form_points()}
+        assert params == {"user", "q"}
+
+    def test_request_keeps_baseline_values(self):
+        p = InjectionPoint("form", "POST", "https://example.com/login", "user", {"user": "", "csrf": "tok"})
+        job = p.request("PAYLOAD")
+        assert job["data"] == {"user": "PAYLOAD", "csrf": "tok"}
+        assert p.request("x", encoding="json")["json_body"] == {"user": "x", "csrf": "tok"}
+
+    def test_derive_adds_param(self):
+        p = InjectionPoint("query", "GET", "https://example.com/item", "id", {"id": "1"})
+        job = p.derive("id[$ne]").request("1")
+        assert job["params"] == {"id": "1", "id[$ne]": "1"}
+
+    def test_limit_groups(self):
+        s = make_scanner()
+        assert {p.url for p in s._form_points(limit=1)} == {"https://example.com/login"}
+
+
+class TestPayloadDispatcher:
+    def test_stops_point_at_first_hit(self):
+        fetch = FakeFetcher()
+        d = PayloadDispatcher(fetch)
+        p = InjectionPoint("query", "GET", "https://example.com/item", "id", {"id": "1"})
+        hits = d.run([(p, pl, lambda r, pl: pl in r.text) for pl in ("a", "b", "c")])
+        assert [h[1] for h in hits] == ["a"]
+        assert len(fetch.jobs) == 1
+
+    def test_identical_requests_sent_once(self):
+        fetch = FakeFetcher()
+        d = PayloadDispatcher(fetch)
+        p = InjectionPoint("query", "GET", "https://example.com/item", "id", {"id": "1"})
+        never = lambda r, pl: None
+        d.run([(p, "x", never)])
+        d.run([(p, "x", never)])  # a second module probing with the same payload
+        assert len(fetch.jobs) == 1
+        assert d.stats()["deduped"] == 1
+
+    def test_per_group_stops_sibling_fields(self):
+        fetch = FakeFetcher()
+        d = PayloadDispatcher(fetch)
+        params = {"a": "", "b": ""}
+        pa = InjectionPoint("form", "POST", "https://example.com/f", "a", params)
+        pb = InjectionPoint("form", "POST", "https://example.com/f", "b", params)
+        detect = lambda r, pl: pl == "hit"
+        jobs = [(pa, "hit", detect), (pa, "2", detect), (pb, "1", detect), (pb, "2", detect)]
+        hits = d.run(jobs, per_group=True)
+        assert len(hits) == 1
+        assert len(fetch.jobs) == 2  # wave 1 only
+
+    def test_budget_caps_requests(self):
+        fetch = FakeFetcher()
+        d = PayloadDispatcher(fetch, budget=3)
+        p = InjectionPoint("query", "GET", "https://example.com/item", "id", {"id": "1"})
+        d.run([(p, str(i), lambda r, pl: None) for i in range(10)])
+        assert len(fetch.jobs) == 3
+        assert d.stats()["budget_exhausted"] is True
+
+    def test_max_waves_caps_payloads_per_point(self):
+        fetch = FakeFetcher()
+        d = PayloadDispatcher(fetch, max_waves=2)
+        points = [InjectionPoint("query", "GET", "https://example.com/item", name, {"a": "", "b": ""})
+                  for name in ("a", "b")]
+        d.run([(p, str(i), lambda r, pl: None) for p in points for i in range(5)])
+        assert len(fetch.jobs) == 4
+        assert d.wave_sent == [2, 2]
+
+    def test_scan_xss_uses_dispatcher(self):
+        s = make_scanner()
+        fetch = FakeFetcher()
+        s.dispatcher = PayloadDispatcher(fetch)
+        s.scan_xss()
+        titles = sorted(f.title for f in s.findings)
+        assert titles == ["Reflected XSS in field 'q'", "Reflected XSS in field 'user'"]
@@ -0,0 +1,87 @@
+"""Tests for per-host latency tracking and derived timeouts."""
+import pytest
+
+import scanner
+from scanner import GovernedSession, LatencyTracker, TupiSecScanner
+
+HOST = "example.com"
+
+
+def tracker_with(samples):
+    t = LatencyTracker()
+    for s in samples:
+        t.record(HOST, s)
+    return t
+
+
+class TestLatencyTracker:
+    def test_percentiles(self):
+        t = tracker_with([i / 100 for i in range(1, 101)])
+        assert t.percentile(HOST, 0.5) == 0.51
+        assert t.distribution(HOST)["p99"] == 1.0
+        assert t.percentile("other.com", 0.5) is None
+
+    def test_fallback_until_enough_samples(self):
+        assert tracker_with([0.1] * 5).timeout(HOST, 8) == 8
+
+    def test_fast_host_gets_short_clamped_timeout(self):
+        assert tracker_with([0.05] * 50).timeout(HOST) == (2.0, 3.0)
+
+    def test_slow_host_gets_longer_timeout(self):
+        connect, read = tracker_with([5.0] * 50 + [9.0]).timeout(HOST)
+        assert read == 36.0 and connect == 20.0
+
+    def test_timeout_capped(self):
+        assert tracker_with([30.0] * 50).timeout(HOST) == (60.0, 60.0)
+
+    def test_window_drops_old_samples(self):
+        t = LatencyTracker(window=10)
+        for s in [10.0] * 10 + [0.1] * 10:
+            t.record(HOST, s)
+        assert t.distribution(HOST)["max"] == 0.1
+
+
+class TestSessionTimeouts:
+    @pytest.fixture
+    def sent(self, monkeypatch):
+        seen = []
+
+        def fake_request(self, method, url, *args, **kwargs):
+            seen.append(kwargs.get("timeout"))
+            return scanner.FetchResponse(url, 200, {}, b"")
+
+        monkeypatch.setattr(scanner.requests.Session, "request", fake_request)
+        return seen
+
+    def test_numeric_timeout_replaced_tuple_kept(self, sent):
+        session = GovernedSession(latency=tracker_with([0.05] * 50))
+        session.get(f"http://{HOST}/", timeout=15)
+        session.get(f"http://{HOST}/", timeout=(1, 12))
+        assert sent == [(2.0, 3.0), (1, 12)]
+
+    def test_delayed_probes_not_sampled(self, sent):
+        tracker = LatencyTracker()
+        session = GovernedSession(latency=tracker)
+        session.get(f"http://{HOST}/", timeout=scanner.DelayTimeout((3, 8)))
+        assert sent == [(3, 8)]
+        assert tracker.distribution(HOST) is None
+        session.get(f"http://{HOST}/", timeout=15)
+        assert tracker.distribution(HOST)["samples"] == 1
+
+    def test_fixed_timeouts(self, sent):
+        session = GovernedSession(latency=tracker_with([0.05] * 50))
+        session.adaptive_timeouts = False
+        session.get(f"http://{HOST}/", timeout=15)
+        assert sent == [15]
+
+
+class TestScannerHelpers:
+    def test_request_timeout_adds_expected_delay(self):
+        s = TupiSecScanner(f"https://{HOST}", verbose=False)
+        assert s.request_timeout(extra=5) == (scanner.TIMEOUT, scanner.TIMEOUT + 5)
+        for _ in range(50):
+            s.latency.record(HOST, 0.05)
+        assert s.request_timeout(extra=5) == (2.0, 8.0)
+        assert isinstance(s.request_timeout(extra=5), scanner.DelayTimeout)
+        assert not isinstance(s.request_timeout(), scanner.DelayTimeout)
+        assert s.latency_profile()["p50"] == 0.05
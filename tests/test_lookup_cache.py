@@ -0,0 +1,71 @@
+"""Tests for the persistent CVE/WHOIS/DNS lookup cache."""
+import sys
+import types
+
+import pytest
+
+from scanner import LookupCache, TupiSecScanner
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LookupCache(str(tmp_path / "c"))
+
+
+class TestLookupCache:
+    def test_round_trip_and_stats(self, cache):
+        assert cache.get("nvd", "nginx 1.18.0") is None
+        cache.set("nvd", "nginx 1.18.0", {"vulnerabilities": []})
+        assert cache.get("nvd", "nginx 1.18.0") == {"vulnerabilities": []}
+        stats = cache.stats()
+        assert stats["hits"] == 1 and stats["misses"] == 1
+        assert stats["sources"]["nvd"]["hit_rate"] == 0.5
+
+    def test_expired_entries_miss(self, cache):
+        cache.set("dns", "example.com:A", ["1.2.3.4"], ttl=-1)
+        assert cache.get("dns", "example.com:A") is None
+
+    def test_empty_values_are_cached(self, cache):
+        cache.set("dns", "example.com:MX", [])
+        assert cache.get("dns", "example.com:MX") == []
+
+    def test_shared_between_instances(self, cache):
+        cache.set("whois", "example.com", {"registrar": "X"})
+        other = LookupCache(cache.directory)
+        assert other.get("whois", "example.com") == {"registrar": "X"}
+
+    def test_eviction_keeps_newest(self, tmp_path):
+        cache = LookupCache(str(tmp_path / "c"), max_entries=2)
+        for i in range(4):
+            cache.set("dns", f"h{i}", [i])
+        cache.evict()
+        assert [cache.get("dns", f"h{i}") for i in range(4)] == [None, None, [2], [3]]
+
+    def test_disabled(self):
+        cache = LookupCache(None)
+        cache.set("nvd", "k", 1)
+        assert cache.get("nvd", "k") is None
+        assert cache.stats()["enabled"] is False
+
+
+class TestScannerUsesCache:
+    def test_dns_and_whois_served_from_cache(self, monkeypatch):
+        import dns.resolver
+
+        def no_dns(*args, **kwargs):
+            raise AssertionError("DNS must not be queried")
+
+        def no_whois(*args, **kwargs):
+            raise AssertionError("WHOIS must not be queried")
+
+        monkeypatch.setattr(dns.resolver, "resolve", no_dns)
+        monkeypatch.setitem(sys.modules, "whois", types.SimpleNamespace(whois=no_whois))
+
+        s = TupiSecScanner("https://www.example.com", verbose=False)
+        for rtype in ("A", "AAAA", "MX", "NS", "TXT"):
+            s.lookup_cache.set("dns", f"www.example.com:{rtype}", ["1.2.3.4"] if rtype == "A" else [])
+        s.lookup_cache.set("whois", "example.com", {"registrar": "Example Registrar"})
+        s.scan_dns_whois()
+        assert s.dns_records == [{"type": "A", "value": "1.2.3.4"}]
+        assert s.whois_info == {"registrar": "Example Registrar"}
+        assert s.report_data()["lookup_cache_stats"]["hits"] == 6
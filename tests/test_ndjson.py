@@ -0,0 +1,68 @@
+"""Tests for --ndjson event streaming."""
+import io
+import json
+
+from scanner import NDJSONWriter, TupiSecScanner
+
+
+def lines(buf):
+    return [json.loads(line) for line in buf.getvalue().splitlines()]
+
+
+class TestNDJSONWriter:
+    def test_events_are_typed_lines(self):
+        out = io.StringIO()
+        writer = NDJSONWriter(out)
+        writer("finding", {"title": "x"})
+        writer("progress", {"phase": "headers"})
+        assert lines(out) == [{"type": "finding", "data": {"title": "x"}}]
+
+    def test_progress_to_separate_stream(self):
+        out, progress = io.StringIO(), io.StringIO()
+        writer = NDJSONWriter(out, progress_out=progress)
+        writer("progress", {"phase": "headers"})
+        assert out.getvalue() == ""
+        assert lines(progress) == [{"type": "progress", "data": {"phase": "headers"}}]
+
+    def test_summary_omits_streamed_lists(self):
+        out = io.StringIO()
+        NDJSONWriter(out).summary({"target": "t", "findings": [1], "discovered_urls": [], "subdomains": []})
+        assert lines(out) == [{"type": "summary", "data": {"target": "t"}}]
+
+
+class TestScanEvents:
+    def test_findings_and_phase_results_streamed(self, monkeypatch, only_phases):
+        s = only_phases(TupiSecScanner("http://127.0.0.1", verbose=False), "headers", "jwt")
+        monkeypatch.setattr(s, "scan_headers", lambda: s.add_finding("LOW", "Headers", "Missing CSP", ""))
+
+        def broken():
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(s, "scan_jwt", broken)
+        events = []
+        s.on_event = lambda kind, data: events.append((kind, data))
+        s.run_full_scan()
+        kinds = [k for k, _ in events if k != "progress"]
+        assert kinds.count("finding") == 1 and kinds.count("phase") == 2
+        phases = {d["phase"]: d for k, d in events if k == "phase"}
+        assert phases["headers"]["status"] == "completed"
+        assert phases["jwt"] == {"phase": "jwt", "status": "failed", "elapsed": phases["jwt"]["elapsed"],
+                                 "error": "boom"}
+
+    def test_resumed_state_replayed_at_start(self, monkeypatch, only_phases):
+        s = only_phases(TupiSecScanner("http://127.0.0.1", verbose=False), "headers")
+        s.restore_checkpoint({
+            "target": "http://127.0.0.1", "completed": ["crawl"],
+            "discovered_urls": ["http://127.0.0.1/a"],
+            "subdomains": [{"subdomain": "www.127.0.0.1", "ip": "127.0.0.1"}],
+            "findings": [{"severity": "LOW", "category": "Info", "title": "Old", "detail": ""}],
+        })
+        monkeypatch.setattr(s, "scan_headers", lambda: None)
+        out = io.StringIO()
+        writer = s.on_event = NDJSONWriter(out)
+        s.run_full_scan()
+        writer.summary(s.report_data())
+        events = [(e["type"], e["data"]) for e in lines(out) if e["type"] in ("url", "subdomain", "finding")]
+        assert events == [("url", {"url": "http://127.0.0.1/a"}),
+                          ("subdomain", {"subdomain": "www.127.0.0.1", "ip": "127.0.0.1"}),
+                          ("finding", s.findings[0].to_dict())]
@@ -0,0 +1,84 @@
+"""Tests for single-pass HTML extraction and the per-response page cache."""
+from bs4 import BeautifulSoup
+
+from scanner import TupiSecScanner, extract_page
+
+HTML = """
+<html><head>
+  <meta name="Generator" content="WordPress 6.4">
+  <script src="/js/jquery.min.js"></script>
+  <script src="http://cdn.example.net/app.js"></script>
+  <link rel="stylesheet" href="/css/bootstrap.css">
+  <style>body { background: url(http://img.example.net/bg.png); }</style>
+</head><body>
+  <a href="/about">About</a>
+  <img src="http://img.example.net/logo.png">
+  <form action="/login" method="post" autocomplete="off">
+    <input type="hidden" name="csrf_token" value="abc">
+    <input name="username">
+    <input type="password" name="password">
+    <textarea id="comment"></textarea>
+  </form>
+</body></html>
+"""
+
+
+def parse(html=HTML):
+    return extract_page(BeautifulSoup(html, "html.parser"))
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class TestExtractPage:
+    def test_links_keep_tag_and_raw_ref(self):
+        links = parse()["links"]
+        assert ("a", "/about") in links
+        assert ("form", "/login") in links
+        assert ("link", "/css/bootstrap.css") in links
+
+    def test_scripts_and_generator(self):
+        info = parse()
+        assert info["scripts"] == ["/js/jquery.min.js", "http://cdn.example.net/app.js"]
+        assert info["generator"] == "WordPress 6.4"
+
+    def test_form_schema_matches_discovered_forms(self):
+        form = parse()["forms"][0]
+        assert form["action"] == "/login"
+        assert form["method"] == "POST"
+        assert form["autocomplete"] == "off"
+        assert form["fields"]["username"] == {"type": "text", "value": ""}
+        assert form["fields"]["csrf_token"] == {"type": "hidden", "value": "abc"}
+        assert "comment" in form["fields"]  # falls back to id
+
+    def test_mixed_content_candidates(self):
+        info = parse()
+        assert ("script", "http://cdn.example.net/app.js", "active") in info["mixed_content"]
+        assert ("img", "http://img.example.net/logo.png", "passive") in info["mixed_content"]
+        assert info["inline_style_http"] is True
+
+    def test_empty_page(self):
+        info = parse("<html></html>")
+        assert info["links"] == [] and info["forms"] == [] and info["generator"] is None
+
+
+class TestPageInfoCache:
+    def test_parses_each_response_once(self, monkeypatch):
+        s = TupiSecScanner("https://example.com", verbose=False)
+        calls = []
+        original = s.parse_html
+        monkeypatch.setattr(s, "parse_html", lambda html: calls.append(1) or original(html))
+        resp = FakeResponse(HTML)
+        first = s.page_info(resp)
+        second = s.page_info(resp)
+        assert first is second
+        assert len(calls) == 1
+
+    def test_unknown_parser_falls_back(self):
+        s = TupiSecScanner("https://example.com", verbose=False)
+        s._html_parser = "no-such-parser"
+        soup = s.parse_html("<p>hi</p>")
+        assert soup.p.text == "hi"
+        assert s._html_parser == "html.parser"
@@ -0,0 +1,39 @@
+"""Tests for the single-pass multi-pattern matcher."""
+from scanner import FetchResponse, PatternMatcher, fold_body
+
+
+class TestPatternMatcher:
+    def test_search_returns_earliest_pattern_and_offset(self):
+        m = PatternMatcher(["sqlstate", "ORA-"])
+        assert m.search("x ora-00933 then SQLSTATE") == ("ORA-", 2)
+
+    def test_case_sensitive_mode(self):
+        m = PatternMatcher(["uid="], ignore_case=False)
+        assert m.search("UID=0") is None
+        assert m.first("uid=0(root)") == "uid="
+
+    def test_find_all_reports_overlapping_and_nested(self):
+        m = PatternMatcher(["mysql_", "mysql_fetch", "fetch_array"])
+        hits = m.find_all("warning: mysql_fetch_array()")
+        assert hits == {"mysql_": 9, "mysql_fetch": 9, "fetch_array": 15}
+
+    def test_find_all_keeps_first_offset(self):
+        m = PatternMatcher(["ab", "abc"])
+        assert m.find_all("ab abc") == {"ab": 0, "abc": 3}
+
+    def test_special_characters_are_literal(self):
+        m = PatternMatcher(["$where", "c:\\inetpub", "a.b"])
+        assert m.first("axb") is None
+        assert m.first("C:\\Inetpub\\wwwroot") == "c:\\inetpub"
+        assert m.first("{$where: 1}") == "$where"
+
+    def test_no_match(self):
+        assert PatternMatcher(["foo"]).search("bar") is None
+
+
+class TestFoldBody:
+    def test_folded_text_cached_on_response(self):
+        resp = FetchResponse("http://x", 200, {}, b"Hello MongoDB")
+        assert fold_body(resp) == "hello mongodb"
+        assert resp._tupisec_folded == "hello mongodb"
+        assert PatternMatcher(["mongodb"]).first(resp) == "mongodb"
@@ -0,0 +1,92 @@
+"""Tests for the dependency-aware PhaseScheduler."""
+import threading
+import time
+
+import pytest
+
+from scanner import PhaseScheduler
+
+
+class TestPhaseScheduler:
+    def test_dependencies_run_first(self):
+        order = []
+        phases = [
+            ("sqli", "SQLi", lambda: order.append("sqli"), ["forms", "crawl"]),
+            ("forms", "Forms", lambda: order.append("forms"), []),
+            ("crawl", "Crawl", lambda: order.append("crawl"), []),
+        ]
+        PhaseScheduler(phases, workers=3).run()
+        assert order[-1] == "sqli"
+        assert set(order) == {"sqli", "forms", "crawl"}
+
+    def test_single_worker_keeps_declaration_order(self):
+        order = []
+        phases = [(name, name, (lambda n=name: order.append(n)), []) for name in "abcd"]
+        PhaseScheduler(phases, workers=1).run()
+        assert order == list("abcd")
+
+    def test_missing_dependency_counts_as_satisfied(self):
+        ran = []
+        phases = [("cves", "CVEs", lambda: ran.append("cves"), ["tech"])]
+        PhaseScheduler(phases, workers=2).run()
+        assert ran == ["cves"]
+
+    def test_independent_phases_overlap(self):
+        barrier = threading.Barrier(2, timeout=2)
+        phases = [
+            ("ssl", "SSL", barrier.wait, []),
+            ("ports", "Ports", barrier.wait, []),
+        ]
+        # Would raise BrokenBarrierError if the phases ran one after another
+        sched = PhaseScheduler(phases, workers=2)
+        sched.run()
+        assert sched.errors == {}
+
+    def test_cycle_rejected(self):
+        phases = [
+            ("a", "A", lambda: None, ["b"]),
+            ("b", "B", lambda: None, ["a"]),
+        ]
+        with pytest.raises(ValueError):
+            PhaseScheduler(phases)
+
+    def test_failing_phase_does_not_block_dependents(self):
+        ran = []
+
+        def boom():
+            raise RuntimeError("down")
+
+        phases = [
+            ("headers", "Headers", boom, []),
+            ("forms", "Forms", lambda: ran.append("forms"), ["headers"]),
+        ]
+        sched = PhaseScheduler(phases, workers=2)
+        sched.run()
+        assert "headers" in sched.errors
+        assert ran == ["forms"]
+
+    def test_events_report_start_and_finish(self):
+        events = []
+        phases = [
+            ("a", "A", lambda: time.sleep(0.01), []),
+            ("b", "B", lambda: None, ["a"]),
+        ]
+        PhaseScheduler(phases, workers=2,
+                       on_event=lambda pid, msg, status, finished, total: events.append((pid, status, finished, total))).run()
+        assert events == [
+            ("a", "started", 0, 2), ("a", "finished", 1, 2),
+            ("b", "started", 1, 2), ("b", "finished", 2, 2),
+        ]
+
+    def test_cancel_skips_pending_phases(self):
+        cancelled = threading.Event()
+        ran = []
+        phases = [
+            ("a", "A", lambda: (ran.append("a"), cancelled.set()), []),
+            ("b", "B", lambda: ran.append("b"), ["a"]),
+            ("c", "C", lambda: ran.append("c"), []),
+        ]
+        sched = PhaseScheduler(phases, workers=1, cancelled=cancelled)
+        sched.run()
+        assert ran == ["a"]
+        assert sched.skipped == ["b", "c"]
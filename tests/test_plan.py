@@ -0,0 +1,107 @@
+"""Tests for the --plan request estimator and budget-driven module selection."""
+import pytest
+
+from scanner import MODULE_PRIORITY, ScanPlan, TupiSecScanner
+
+
+SEARCH_FORM = {"action": "/search", "method": "GET", "url": "https://example.com",
+               "fields": {"q": {"type": "text", "value": ""}, "lang": {"type": "text", "value": "en"}}}
+
+
+def module(requests=0, rounds=0, seconds=0.0, waves=()):
+    return {"requests": requests, "rounds": rounds, "seconds": seconds, "waves": list(waves), "method": "dry-run"}
+
+
+@pytest.fixture
+def plan():
+    modules = {
+        "sqli": module(requests=2, rounds=1, waves=[(10, 1), (10, 1), (10, 1)]),
+        "xss": module(requests=2, rounds=1, waves=[(10, 1), (10, 1)]),
+        "ports": module(requests=20, seconds=4.0),
+    }
+    return ScanPlan(modules, {"sqli": [], "xss": [], "ports": []}, latency=1.0, workers=1)
+
+
+class TestScanPlan:
+    def test_cost_counts_waves_up_to_depth(self, plan):
+        assert plan.cost("sqli") == (32, 4.0)
+        assert plan.cost("sqli", depth=1) == (12, 2.0)
+        assert plan.cost("ports") == (20, 4.0)
+
+    def test_wall_time_follows_workers_and_deps(self, plan):
+        assert plan.wall_seconds(["sqli", "xss"]) == 7.0
+        plan.workers = 2
+        assert plan.wall_seconds(["sqli", "xss"]) == 4.0
+        plan.deps["xss"] = ["sqli"]
+        assert plan.wall_seconds(["sqli", "xss"]) == 7.0
+
+    def test_no_budget_keeps_everything(self, plan):
+        assert plan.select() == (["sqli", "xss", "ports"], None)
+
+    def test_payload_depth_lowered_before_modules_dropped(self, plan):
+        selected, depth = plan.select(max_requests=60)
+        assert selected == ["sqli", "xss", "ports"] and depth == 1
+        assert plan.to_dict()["estimated_requests"] == 44
+
+    def test_modules_dropped_in_priority_order(self, plan):
+        assert MODULE_PRIORITY.index("sqli") < MODULE_PRIORITY.index("ports")
+        selected, depth = plan.select(max_requests=30)
+        assert selected == ["sqli", "xss"] and depth == 1
+        assert plan.to_dict()["modules"]["ports"]["selected"] is False
+
+    def test_time_budget(self, plan):
+        selected, _ = plan.select(max_seconds=5.0)
+        assert selected == ["sqli", "xss"]
+
+    def test_rate_ceiling_bounds_time(self, plan):
+        plan.max_rps = 2
+        assert plan.cost("ports")[1] == 10.0
+
+
+class TestEstimate:
+    def test_dry_run_sends_nothing(self, monkeypatch):
+        def no_network(*args, **kwargs):
+            raise AssertionError("the dry run must not send requests")
+
+        s = TupiSecScanner("https://example.com", verbose=False)
+        s.discovered_forms = [SEARCH_FORM]
+        monkeypatch.setattr(s.session, "request", no_network)
+        monkeypatch.setattr(s, "fetch_many", no_network)
+        phases = [p for p in s._phase_graph() if p[0] in ("xss", "ports", "subdomains")]
+        plan = s.estimate_plan(phases)
+        xss = plan.modules["xss"]
+        assert xss["method"] == "dry-run" and "error" not in xss
+        assert [n for n, _ in xss["waves"]] == [2, 2, 2]  # three payloads for each field
+        assert plan.modules["ports"]["method"] == "static" and plan.modules["ports"]["requests"] > 0
+        assert plan.modules["subdomains"]["requests"] == 0 and plan.modules["subdomains"]["seconds"] > 0
+        assert s.findings == [] and s.dispatcher.stats()["requests"] == 0
+
+    def test_plan_only_runs_discovery(self, monkeypatch, only_phases):
+        s = only_phases(TupiSecScanner("https://example.com", verbose=False), "headers", "crawl", "ports")
+        s._plan_only = True
+        monkeypatch.setattr(s, "scan_headers", lambda: None)
+        monkeypatch.setattr(s, "crawl", lambda: None)
+        monkeypatch.setattr(s, "scan_ports", lambda: pytest.fail("--plan must not scan ports"))
+        s.run_full_scan()
+        report = s.report_data()
+        assert report["modules"] == {"headers": "completed", "crawl": "completed"}
+        assert list(report["plan"]["modules"]) == ["ports"]
+
+    def test_budget_limits_payload_waves(self, monkeypatch, only_phases):
+        s = only_phases(TupiSecScanner("https://example.com", verbose=False), "crawl", "xss")
+        s.discovered_forms = [SEARCH_FORM]
+        monkeypatch.setattr(s, "crawl", lambda: None)
+        sent = []
+
+        def fetch_many(jobs, limit=None):
+            jobs = list(jobs)
+            sent.extend(jobs)
+            return [Exception("unreachable")] * len(jobs)
+
+        monkeypatch.setattr(s, "fetch_many", fetch_many)
+        monkeypatch.setattr(s.dispatcher, "fetch_many", fetch_many)
+        s._max_requests = 3
+        s.run_full_scan()
+        assert s.dispatcher.max_waves == 1
+        assert len(sent) == 2
+        assert s.report_data()["plan"]["payload_depth"] == 1
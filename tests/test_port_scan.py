@@ -0,0 +1,100 @@
+"""Tests for the native async port scanner and the background nmap path."""
+import asyncio
+import socket
+import sys
+import threading
+import types
+
+import pytest
+
+from scanner import TupiSecScanner, format_ports, parse_ports, tcp_connect_scan
+
+
+@pytest.fixture
+def listening_port():
+    srv = socket.socket()
+    srv.bind(("127.0.0.1", 0))
+    srv.listen(16)
+    yield srv.getsockname()[1]
+    srv.close()
+
+
+def free_port():
+    s = socket.socket()
+    s.bind(("127.0.0.1", 0))
+    port = s.getsockname()[1]
+    s.close()
+    return port
+
+
+class TestParsePorts:
+    def test_lists_and_ranges(self):
+        assert parse_ports("443, 80,8000-8002,80") == [80, 443, 8000, 8001, 8002]
+
+    def test_format_compresses_runs(self):
+        assert format_ports([8002, 22, 80, 8000, 8001, 443]) == "22,80,443,8000-8002"
+        assert format_ports(parse_ports("1-65535")) == "1-65535"
+
+    @pytest.mark.parametrize("spec", ["", "0", "70000", "90-80", "http"])
+    def test_invalid(self, spec):
+        with pytest.raises(ValueError):
+            parse_ports(spec)
+
+
+class TestConnectScan:
+    def test_reports_open_ports_as_found(self, listening_port):
+        closed = free_port()
+        seen = []
+        result = asyncio.run(tcp_connect_scan("127.0.0.1", [closed, listening_port],
+                                              timeout=1, on_open=seen.append))
+        assert result == [listening_port]
+        assert seen == [listening_port]
+
+    def test_cancelled_scan_skips_pending_ports(self, listening_port):
+        cancelled = threading.Event()
+        cancelled.set()
+        assert asyncio.run(tcp_connect_scan("127.0.0.1", [listening_port], timeout=1,
+                                            cancelled=cancelled)) == []
+
+    def test_scanner_fallback_adds_findings(self, listening_port):
+        s = TupiSecScanner("http://127.0.0.1", verbose=False)
+        s._ports = [listening_port]
+        s._socket_port_scan()
+        assert [f.title for f in s.findings] == [f"Port {listening_port} is open"]
+
+
+class TestBackgroundNmap:
+    def test_scan_ports_returns_before_nmap_finishes(self, monkeypatch):
+        release = threading.Event()
+
+        class FakePortScanner:
+            def scan(self, host, arguments=""):
+                release.wait(5)
+
+            def all_hosts(self):
+                return []
+
+        monkeypatch.setitem(sys.modules, "nmap", types.SimpleNamespace(PortScanner=FakePortScanner))
+        s = TupiSecScanner("http://127.0.0.1", verbose=False)
+        s.scan_ports()
+        assert s._port_thread.is_alive()
+        release.set()
+        s.wait_port_scan()
+        assert s._port_thread is None
+
+    def test_port_list_passed_as_ranges(self, monkeypatch):
+        seen = []
+
+        class FakePortScanner:
+            def scan(self, host, arguments=""):
+                seen.append(arguments)
+
+            def all_hosts(self):
+                return []
+
+        monkeypatch.setitem(sys.modules, "nmap", types.SimpleNamespace(PortScanner=FakePortScanner))
+        s = TupiSecScanner("http://127.0.0.1", verbose=False)
+        s._ports = parse_ports("1-65535")
+        s.scan_ports()
+        s.wait_port_scan()
+        assert seen == ["-T4 -p 1-65535"]
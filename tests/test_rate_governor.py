@@ -0,0 +1,123 @@
+"""Tests for the per-host AIMD rate governor."""
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from scanner import AsyncHTTPEngine, GovernedSession, RateGovernor, TupiSecScanner
+
+HOST = "example.com"
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(429)
+        self.send_header("Retry-After", "2")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def throttling_url():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), ThrottlingHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+def send(gov, status, elapsed=0.01, headers=None):
+    assert gov.try_acquire(HOST) == 0
+    gov.release(HOST, status, elapsed, headers)
+
+
+class TestRateGovernor:
+    def test_in_flight_cap(self):
+        gov = RateGovernor(max_in_flight=2)
+        assert gov.try_acquire(HOST) == 0
+        assert gov.try_acquire(HOST) == 0
+        assert gov.try_acquire(HOST) > 0
+        gov.release(HOST, 200, 0.01)
+        assert gov.try_acquire(HOST) == 0
+
+    def test_token_bucket(self):
+        gov = RateGovernor(max_rps=2)
+        assert gov.try_acquire(HOST) == 0
+        assert gov.try_acquire(HOST) == 0
+        assert 0 < gov.try_acquire(HOST) <= 0.5
+
+    def test_throttling_halves_limits_once_per_interval(self):
+        gov = RateGovernor(max_rps=100, max_in_flight=32)
+        send(gov, 429)
+        send(gov, 503)
+        host = gov.stats()["hosts"][HOST]
+        assert host["max_in_flight"] == 16
+        assert host["rps"] == 50
+        assert host["throttled"] == 2 and host["backoffs"] == 1
+
+    def test_unmetered_host_gets_rate_from_observed_throughput(self):
+        gov = RateGovernor(max_in_flight=32)
+        for _ in range(10):
+            send(gov, 200)
+        assert gov.stats()["hosts"][HOST]["rps"] is None
+        send(gov, 429)
+        assert gov.stats()["hosts"][HOST]["rps"] >= 1
+
+    def test_additive_recovery_up_to_ceiling(self):
+        gov = RateGovernor(max_rps=1000, max_in_flight=8)
+        send(gov, 429)
+        assert gov.stats()["hosts"][HOST]["max_in_flight"] == 4
+        for _ in range(200):
+            send(gov, 200)
+        assert gov.stats()["hosts"][HOST]["max_in_flight"] == 8
+
+    def test_retry_after_pauses_host(self):
+        gov = RateGovernor()
+        send(gov, 429, headers={"Retry-After": "5"})
+        assert gov.try_acquire(HOST) > 4
+
+    def test_latency_spike_backs_off(self):
+        gov = RateGovernor(max_rps=1000, max_in_flight=8)
+        send(gov, 200, elapsed=0.1)
+        for _ in range(10):
+            send(gov, 200, elapsed=3.0)
+        assert gov.stats()["hosts"][HOST]["backoffs"] == 1
+
+    def test_fixed_limits_when_not_adaptive(self):
+        gov = RateGovernor(max_rps=100, max_in_flight=8, adaptive=False)
+        send(gov, 429)
+        host = gov.stats()["hosts"][HOST]
+        assert (host["rps"], host["max_in_flight"], host["throttled"]) == (100, 8, 1)
+
+    def test_hosts_are_independent(self):
+        gov = RateGovernor(max_in_flight=1)
+        assert gov.try_acquire("a.example.com") == 0
+        assert gov.try_acquire("b.example.com") == 0
+
+
+class TestGovernedRequests:
+    def test_session_feeds_governor(self, throttling_url):
+        session = GovernedSession(RateGovernor(max_in_flight=4))
+        assert session.get(throttling_url, timeout=5).status_code == 429
+        host = session.governor.stats()["hosts"][throttling_url.split("//")[1]]
+        assert host["throttled"] == 1 and host["max_in_flight"] == 2
+        assert session.governor.try_acquire(throttling_url.split("//")[1]) > 1  # Retry-After: 2
+
+    def test_aiohttp_engine_feeds_governor(self, throttling_url):
+        pytest.importorskip("aiohttp")
+        session = GovernedSession()
+
+        async def run():
+            async with AsyncHTTPEngine(session, use_aiohttp=True) as engine:
+                return await engine.request("GET", throttling_url, timeout=5)
+
+        assert asyncio.run(run()).status_code == 429
+        assert session.governor.stats()["hosts"][throttling_url.split("//")[1]]["throttled"] == 1
+
+    def test_scanner_reports_governor_stats(self):
+        s = TupiSecScanner("https://example.com", verbose=False)
+        assert s.session.governor is s.governor
+        assert s.report_data()["rate_governor"]["hosts"] == {}
@@ -0,0 +1,104 @@
+"""Tests for the per-scan ResponseCache."""
+import threading
+import time
+
+import pytest
+
+from scanner import ResponseCache
+
+
+class FakeResponse:
+    def __init__(self, body=b"x"):
+        self.content = body
+
+
+class TestCacheKey:
+    def test_normalizes_host_port_and_query_order(self):
+        a = ResponseCache.make_key("HTTPS://Example.com:443/p?b=2&a=1#frag")
+        b = ResponseCache.make_key("https://example.com/p?a=1&b=2")
+        assert a == b
+
+    def test_empty_path_is_root(self):
+        assert ResponseCache.make_key("https://example.com") == ResponseCache.make_key("https://example.com/")
+
+    def test_non_default_port_kept(self):
+        assert ResponseCache.make_key("https://example.com:8443/") != ResponseCache.make_key("https://example.com/")
+
+    def test_headers_and_redirects_are_part_of_key(self):
+        base = ResponseCache.make_key("https://example.com/")
+        assert ResponseCache.make_key("https://example.com/", {"Origin": "https://evil"}) != base
+        assert ResponseCache.make_key("https://example.com/", allow_redirects=False) != base
+
+
+class TestResponseCache:
+    def test_hit_and_miss_counters(self):
+        cache = ResponseCache()
+        calls = []
+        loader = lambda: calls.append(1) or FakeResponse()
+        first = cache.get_or_fetch("k", loader)
+        second = cache.get_or_fetch("k", loader)
+        assert first is second
+        assert len(calls) == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_evicts_least_recently_used_entry(self):
+        cache = ResponseCache(max_entries=2)
+        cache.get_or_fetch("a", FakeResponse)
+        cache.get_or_fetch("b", FakeResponse)
+        cache.get_or_fetch("a", FakeResponse)  # touch a
+        cache.get_or_fetch("c", FakeResponse)  # evicts b
+        assert cache.stats()["evictions"] == 1
+        misses = cache.misses
+        cache.get_or_fetch("a", FakeResponse)
+        assert cache.misses == misses
+        cache.get_or_fetch("b", FakeResponse)
+        assert cache.misses == misses + 1
+
+    def test_byte_budget_enforced(self):
+        cache = ResponseCache(max_bytes=10)
+        cache.get_or_fetch("a", lambda: FakeResponse(b"123456"))
+        cache.get_or_fetch("b", lambda: FakeResponse(b"123456"))
+        stats = cache.stats()
+        assert stats["entries"] == 1
+        assert stats["bytes"] == 6
+
+    def test_storing_existing_key_replaces_its_size(self):
+        cache = ResponseCache(max_bytes=10)
+        cache.store("a", FakeResponse(b"123456"))
+        cache.store("a", FakeResponse(b"1234"))
+        stats = cache.stats()
+        assert stats["entries"] == 1 and stats["bytes"] == 4
+        assert cache.lookup("a").content == b"1234"
+
+    def test_oversized_response_not_stored(self):
+        cache = ResponseCache(max_bytes=4)
+        cache.get_or_fetch("a", lambda: FakeResponse(b"123456"))
+        assert cache.stats()["entries"] == 0
+
+    def test_failed_fetch_is_not_cached(self):
+        cache = ResponseCache()
+
+        def boom():
+            raise ConnectionError("down")
+
+        with pytest.raises(ConnectionError):
+            cache.get_or_fetch("a", boom)
+        assert cache.get_or_fetch("a", FakeResponse).content == b"x"
+
+    def test_concurrent_requests_are_coalesced(self):
+        cache = ResponseCache()
+        calls = []
+
+        def slow_loader():
+            calls.append(1)
+            time.sleep(0.05)
+            return FakeResponse()
+
+        threads = [threading.Thread(target=cache.get_or_fetch, args=("k", slow_loader)) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(calls) == 1
+        assert cache.stats()["hits"] == 4
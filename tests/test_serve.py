@@ -0,0 +1,122 @@
+"""Tests for the --serve worker and its JSON-line job protocol."""
+import asyncio
+import json
+
+import pytest
+
+from scanner import ScanServer, TupiSecScanner, build_parser
+
+
+async def fake_scan(self, emit_progress=False):
+    self.emit_progress("headers", "Analyzing HTTP headers", "started")
+    self.add_finding("LOW", "Information Disclosure", "Server header exposed", "Server: test")
+    if "slow" in self.target_url:
+        while not self.cancelled.is_set():
+            await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(TupiSecScanner, "run_full_scan_async", fake_scan)
+    parser = build_parser()
+    return ScanServer(parser, defaults=parser.parse_args(["--serve", "--max-rps", "20"]), max_jobs=2)
+
+
+def run_session(server, lines, until):
+    """Feed request lines to the server and collect replies until ``until(messages)``."""
+    messages = []
+
+    async def main():
+        await server._start()
+        for line in lines:
+            server.handle(json.dumps(line), messages.append)
+            await asyncio.sleep(0)
+        for _ in range(500):
+            if until(messages):
+                break
+            await asyncio.sleep(0.01)
+        await server._stop()
+    asyncio.run(main())
+    return messages
+
+
+def types(messages, job_id):
+    return [m["type"] for m in messages if m["id"] == job_id]
+
+
+class TestScanServer:
+    def test_job_events_tagged_by_id(self, server):
+        msgs = run_session(server, [{"op": "scan", "id": "j1", "url": "https://example.com"}],
+                           lambda m: "report" in types(m, "j1"))
+        assert types(msgs, "j1") == ["queued", "started", "progress", "finding", "report"]
+        report = msgs[-1]["data"]
+        assert report["target"] == "https://example.com"
+        assert [f["title"] for f in report["findings"]] == ["Server header exposed"]
+
+    def test_cancel_by_id(self, server):
+        msgs = run_session(server, [{"op": "scan", "id": "j1", "url": "https://slow.example.com"},
+                                    {"op": "scan", "id": "j2", "url": "https://example.com"},
+                                    {"op": "cancel", "id": "j1"}],
+                           lambda m: "cancelled" in types(m, "j1") and "report" in types(m, "j2"))
+        assert types(msgs, "j1")[-1] == "cancelled"
+        assert types(msgs, "j2")[-1] == "report"
+
+    def test_worker_options_are_job_defaults(self, server):
+        async def main():
+            await server._start()
+            server.handle(json.dumps({"op": "scan", "id": "j1", "url": "https://example.com",
+                                      "args": ["--quick"]}), lambda m: None)
+            scanner = server.jobs["j1"]
+            await server._stop()
+            return scanner
+        scanner = asyncio.run(main())
+        assert scanner._quick_mode and scanner.governor.max_rps == 20
+        assert scanner.lookup_cache is server.lookup_cache
+        assert scanner.session.get_adapter("https://example.com") is server.adapter
+
+    @pytest.mark.parametrize("line", [
+        {"op": "scan", "id": "j1"},
+        {"op": "scan", "url": "https://example.com"},
+        {"op": "scan", "id": "j1", "url": "https://example.com", "args": ["--no-such-flag"]},
+        {"op": "cancel", "id": "nope"},
+        {"op": "reboot"},
+    ])
+    def test_bad_requests_get_errors(self, server, line):
+        msgs = run_session(server, [line], lambda m: bool(m))
+        assert msgs[0]["type"] == "error"
+
+    def test_help_returned_as_error_not_printed(self, server, capsys):
+        msgs = run_session(server, [{"op": "scan", "id": "j1", "url": "https://example.com", "args": ["--help"]}],
+                           lambda m: bool(m))
+        assert capsys.readouterr().out == ""
+        assert msgs[0]["type"] == "error" and "--ndjson" in msgs[0]["data"]
+
+    def test_unix_socket(self, server, tmp_path):
+        path = str(tmp_path / "tupisec.sock")
+
+        async def main():
+            serving = asyncio.create_task(server.serve_unix(path))
+            while not (tmp_path / "tupisec.sock").exists():
+                await asyncio.sleep(0.01)
+            reader, writer = await asyncio.open_unix_connection(path)
+            writer.write(b'{"op": "scan", "id": "j1", "url": "https://example.com"}\n')
+            replies = []
+            while not replies or replies[-1]["type"] != "report":
+                replies.append(json.loads(await reader.readline()))
+            writer.write(b'{"op": "shutdown"}\n')
+            await writer.drain()
+            await serving
+            writer.close()
+            return replies
+        replies = asyncio.run(main())
+        assert [r["type"] for r in replies] == ["queued", "started", "progress", "finding", "report"]
+        assert not (tmp_path / "tupisec.sock").exists()
+
+
+class TestCancellation:
+    def test_requests_fail_fast_after_cancel(self):
+        s = TupiSecScanner("https://example.com", verbose=False)
+        s.cancel()
+        with pytest.raises(Exception, match="cancelled"):
+            s.session.get("https://example.com", timeout=5)
+        assert s.report_data()["cancelled"] is True
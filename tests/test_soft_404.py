@@ -0,0 +1,82 @@
+"""Tests for soft-404 fingerprinting of catch-all hosts."""
+from scanner import FetchResponse, SoftNotFoundProfile, TupiSecScanner, simhash
+
+ERROR_PAGE = "<html><h1>Page not found</h1><p>The page /{path} could not be found on this server.</p></html>"
+
+
+def page(path, status=200, body=ERROR_PAGE, headers=None):
+    return FetchResponse(f"https://example.com/{path}", status, headers or {},
+                         body.format(path=path).encode())
+
+
+def profile_for(status=200, **kwargs):
+    tokens = ["tupisec-aa11", "tupisec-aa11.php", "tupisec-aa11/"]
+    return SoftNotFoundProfile([(t, page(t, status, **kwargs)) for t in tokens])
+
+
+class TestSimhash:
+    def test_similar_text_close_distinct_text_far(self):
+        a = simhash("the quick brown fox jumps over the lazy dog again and again")
+        b = simhash("the quick brown fox jumps over the lazy cat again and again")
+        c = simhash("SELECT password FROM users WHERE admin = 1 LIMIT 5")
+        assert bin(a ^ b).count("1") < bin(a ^ c).count("1")
+
+
+class TestSoftNotFoundProfile:
+    def test_catch_all_error_page_echoing_path(self):
+        profile = profile_for()
+        assert profile.catch_all
+        assert profile.is_soft_404(page("admin/"), "admin/")
+
+    def test_real_page_is_not_soft_404(self):
+        profile = profile_for()
+        real = page("backup.sql", body="-- MySQL dump 10.13\n" + "INSERT INTO users VALUES (1);\n" * 40)
+        assert not profile.is_soft_404(real, "backup.sql")
+
+    def test_small_real_file_on_catch_all_host_with_short_body(self):
+        for not_found in ("", "Not Found"):
+            profile = profile_for(body=not_found)
+            assert profile.is_soft_404(page("admin", body=not_found), "admin")
+            assert not profile.is_soft_404(page(".env", body="DB_PASSWORD=hunter2\n"), ".env")
+            assert not profile.is_soft_404(page(".git/config", body="[core]\n\tbare = false\n"), ".git/config")
+
+    def test_redirect_to_same_target(self):
+        profile = profile_for(302, body="", headers={"Location": "/login"})
+        assert profile.is_soft_404(page("admin", 302, "", {"Location": "/login"}), "admin")
+        assert not profile.is_soft_404(page("admin", 302, "", {"Location": "/admin/"}), "admin")
+
+    def test_well_behaved_host(self):
+        profile = profile_for(404)
+        assert not profile.catch_all
+        assert profile.is_soft_404(page("nope", 404), "nope")
+        assert not profile.is_soft_404(page(".git/HEAD", 200, "ref: refs/heads/main"), ".git/HEAD")
+
+
+class TestScannerIntegration:
+    def test_catch_all_host_yields_no_directory_findings(self, monkeypatch):
+        s = TupiSecScanner("https://example.com", verbose=False)
+        s._dir_wordlist = "/nonexistent/wordlist.txt"  # never opened on a catch-all host
+
+        def fake_fetch_many(jobs, limit=None):
+            out = []
+            for job in jobs:
+                path = job["url"].split("example.com/", 1)[1]
+                out.append(page(path))
+            return out
+
+        monkeypatch.setattr(s, "fetch_many", fake_fetch_many)
+        s.scan_directories()
+        assert s.findings == []
+
+    def test_profile_built_once(self, monkeypatch):
+        s = TupiSecScanner("https://example.com", verbose=False)
+        calls = []
+
+        def fake_fetch_many(jobs, limit=None):
+            calls.append(jobs)
+            return [page("x", 404) for _ in jobs]
+
+        monkeypatch.setattr(s, "fetch_many", fake_fetch_many)
+        assert s.soft_404_profile() is s.soft_404_profile()
+        assert len(calls) == 1
+        assert all(not job["allow_redirects"] for job in calls[0])
@@ -0,0 +1,126 @@
+"""Tests for the statistical timing oracle used by blind time-based checks."""
+import itertools
+import re
+import socketserver
+import threading
+import time
+
+import pytest
+
+from scanner import FetchResponse, InjectionPoint, TimingOracle, TupiSecScanner
+
+
+def vulnerable(payload, delay):
+    return 0.05 + delay
+
+
+def safe(payload, delay):
+    return 0.05
+
+
+class TestTimingOracle:
+    def test_confirms_consistent_delay(self):
+        [(key, payload, evidence)] = TimingOracle().run([("field", "; sleep {}", vulnerable)])
+        assert (key, payload) == ("field", "; sleep {}")
+        assert evidence["delays"] == [1, 2, 1]
+        assert evidence["extra"] == [1.0, 2.0, 1.0]
+
+    def test_rejects_after_one_round_without_delay(self):
+        oracle = TimingOracle()
+        assert oracle.run([("field", "x", safe)]) == []
+        assert oracle.measurements == 6 + 2  # baseline + a single control/delayed pair
+
+    def test_single_slow_response_is_not_enough(self):
+        slow = iter([0.05] * 6 + [0.05, 5.0] + [0.05] * 10)
+        assert TimingOracle().run([("field", "x", lambda p, d: next(slow))]) == []
+
+    def test_inconsistent_delays_fail_significance(self):
+        noisy = itertools.cycle([0.05, 1.0, 0.05, 2.3, 0.05, 0.7])  # ratios 0.95, 1.125, 0.65
+        assert TimingOracle().run([("field", "x", lambda p, d: next(noisy))]) == []
+
+    def test_siblings_stop_after_confirmation(self):
+        oracle = TimingOracle(workers=1)
+        hits = oracle.run([("field", "a", vulnerable), ("field", "b", vulnerable), ("other", "c", safe)])
+        assert [(k, p) for k, p, _ in hits] == [("field", "a")]
+        assert oracle.measurements == 6 + 6 + 2
+
+    def test_delay_unit_grows_with_jitter(self):
+        oracle = TimingOracle()
+        assert oracle.delay_unit([0.05, 0.06, 0.05]) == 1
+        assert oracle.delay_unit([0.5, 1.5, 0.4, 1.2]) == 4
+        assert oracle.delay_unit([20.0, 30.0]) == 5
+
+
+class TestBlindCommandInjection:
+    def test_time_based_finding_without_sleeping(self, monkeypatch):
+        s = TupiSecScanner("https://example.com", verbose=False)
+        point = InjectionPoint("form", "POST", "https://example.com/ping", "host", {"host": "x", "name": "y"})
+        monkeypatch.setattr(s, "_form_points", lambda **kw: [point, point.derive("name")])
+
+        def fake_fetch_many(jobs, limit=None):
+            return [FetchResponse(job["url"], 200, {}, b"ok", elapsed=0.05) for job in jobs]
+
+        class TimingSession:
+            def request(self, method, url, data=None, **kwargs):
+                m = re.fullmatch(r"; sleep (\d+)", data["host"])
+                return FetchResponse(url, 200, {}, b"ok", elapsed=0.05 + (int(m.group(1)) if m else 0))
+
+        monkeypatch.setattr(s, "fetch_many", fake_fetch_many)
+        monkeypatch.setattr(s.dispatcher, "fetch_many", fake_fetch_many)
+        monkeypatch.setattr(s, "timing_session", TimingSession)
+        s.scan_cmd_injection()
+        titles = [f.title for f in s.findings]
+        assert titles == ["Blind command injection (time-based) in field 'host'"]
+
+
+class KeepAliveHandler(socketserver.StreamRequestHandler):
+    """Spec-compliant HTTP/1.1 server: chunked bodies win over Content-Length, connections stay open."""
+
+    def handle(self):
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            headers = {}
+            for header in iter(self.rfile.readline, b"\r\n"):
+                name, _, value = header.decode().partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if headers.get("transfer-encoding") == "chunked":
+                while True:
+                    size = int(self.rfile.readline().strip() or b"0", 16)
+                    self.rfile.read(size + 2)
+                    if size == 0:
+                        break
+            else:
+                self.rfile.read(int(headers.get("content-length", 0)))
+            self.wfile.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nConnection: keep-alive\r\n\r\nok")
+            self.wfile.flush()
+
+
+@pytest.fixture
+def keep_alive_server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), KeepAliveHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestTimingSession:
+    def test_own_pool_shared_governor(self):
+        s = TupiSecScanner("https://example.com", verbose=False, cookies="sid=abc")
+        session = s.timing_session()
+        assert session is s.timing_session()
+        assert session.get_adapter("https://example.com") is not s.session.get_adapter("https://example.com")
+        assert session.governor is s.governor and session.latency is s.latency
+        assert session.cookies.get("sid") == "abc"
+
+
+class TestHTTPSmuggling:
+    def test_keep_alive_server_not_reported(self, keep_alive_server):
+        s = TupiSecScanner(keep_alive_server, verbose=False)
+        started = time.monotonic()
+        s.scan_http_smuggling()
+        assert s.findings == []
+        assert time.monotonic() - started < 5